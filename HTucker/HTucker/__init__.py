@@ -1,4 +1,7 @@
-import torch
+from copy import deepcopy
+from . import _validation
+from . import _lazy
+from .dimtree import dimtree
 
 
 class HTTensor:
@@ -7,12 +10,15 @@ class HTTensor:
     from ._get_shape import get_shape
     from ._nbytes import nbytes
     from ._get_item import get
+    from ._get_entries import get_entries
+    from ._estimate_error import estimate_error
     from ._get_order import get_order
     from ._squeeze import squeeze
     from ._scalar_mul import scalar_mul
     from ._mode_mul import mode_mul
-    from ._orthogonalize import orthogonalize
-    from ._get_gramians import _get_gramians
+    from ._orthogonalize import orthogonalize, _get_orthogonal
+    from ._get_gramians import _get_gramians, gramians
+    from ._norm import norm
     from ._truncate_htt import truncate_htt
     from ._get_rank import get_rank
     from ._plus import plus
@@ -21,32 +27,76 @@ class HTTensor:
     from ._tensordot import tensordot
     from ._change_root import _change_root
     from ._minus import minus
+    from ._reroot import reroot
+    from ._to_dimtree import to_dimtree
+    from ._to_tt import to_tt
+    from ._to_cp import to_cp
+    from ._save import save
+    from ._pack import pack, is_packed
+    from ._clone import clone
+    from ._share_memory import share_memory
 
     # Importierte Klassenmethoden
     from ._truncate import truncate
-    from ._get_truncation_rank import _get_truncation_rank
+    from ._get_truncation_rank import _get_truncation_rank, _get_truncation_ranks_global, _fit_ranks_to_budget
+    from ._left_svd_gramian import _truncated_left_svd_gramian
     from ._truncate_sum import truncate_sum
     from ._get_gramians_sum import _get_gramians_sum
     from ._randn import randn
+    from ._ones import ones
+    from ._outer import outer
+    from ._sum_of_univariate import sum_of_univariate
+    from ._diag import diag
+    from ._from_tt import from_tt
+    from ._from_cp import from_cp
+    from ._complete import complete
+    from ._save import load
+    from ._share_memory import attach
     truncate = classmethod(truncate)
     _get_truncation_rank = classmethod(_get_truncation_rank)
+    _get_truncation_ranks_global = classmethod(_get_truncation_ranks_global)
+    _fit_ranks_to_budget = classmethod(_fit_ranks_to_budget)
+    _truncated_left_svd_gramian = classmethod(_truncated_left_svd_gramian)
     truncate_sum = classmethod(truncate_sum)
     _get_gramians_sum = classmethod(_get_gramians_sum)
     randn = classmethod(randn)
+    ones = classmethod(ones)
+    outer = classmethod(outer)
+    sum_of_univariate = classmethod(sum_of_univariate)
+    diag = classmethod(diag)
+    from_tt = classmethod(from_tt)
+    from_cp = classmethod(from_cp)
+    complete = classmethod(complete)
+    load = classmethod(load)
+    attach = classmethod(attach)
 
     # Importierte statische Methoden
-    from ._checks import _check_U, _check_B, _check_opts, _check_compatibility
+    from ._checks import _check_U, _check_B, _check_opts, _check_compatibility, _check_light
+    from ._validation import set_validation_level, get_validation_level
+    from ._lazy import set_lazy_mode, get_lazy_mode
+    from ._share_memory import release_shared_memory
+    from ._truncation_stats import get_truncation_stats, reset_truncation_stats
     from ._matricise import matricise, dematricise
     from ._left_svd_gramian import left_svd_gramian
     from ._left_svd_qr import left_svd_qr
+    from ._tall_qr import tall_qr
     _check_U = staticmethod(_check_U)
     _check_B = staticmethod(_check_B)
     _check_opts = staticmethod(_check_opts)
     _check_compatibility = staticmethod(_check_compatibility)
+    _check_light = staticmethod(_check_light)
+    set_validation_level = staticmethod(set_validation_level)
+    get_validation_level = staticmethod(get_validation_level)
+    set_lazy_mode = staticmethod(set_lazy_mode)
+    get_lazy_mode = staticmethod(get_lazy_mode)
+    release_shared_memory = staticmethod(release_shared_memory)
+    get_truncation_stats = staticmethod(get_truncation_stats)
+    reset_truncation_stats = staticmethod(reset_truncation_stats)
     matricise = staticmethod(matricise)
     dematricise = staticmethod(dematricise)
     left_svd_gramian = staticmethod(left_svd_gramian)
     left_svd_qr = staticmethod(left_svd_qr)
+    tall_qr = staticmethod(tall_qr)
 
     def __init__(self, U, B, dtree, is_orthog=False):
         """
@@ -54,47 +104,107 @@ class HTTensor:
         Erzeugt aus dem Blattmatrixdict U und Transfertensordict B einen hierarchischen Tuckertensor, dessen Dimensions-
         hierarchie durch dtree vorgegeben ist. Der Parameter is_orthog zeigt hierbei an, ob der zu erzeugende hierarch-
         ische Tuckertensor orthogonal sein wird.
+        Der Umfang der Argumentchecks haengt von der globalen Validierungsstufe ab (siehe set_validation_level).
         :param U: dict: tuple:integer -> torch.Tensor
         :param B: dict: tuple:integer -> torch.Tensor
         :param dtree: dt.dimtree
         :param is_orthog: bool
         """
-        # Argumentchecks: U
-        HTTensor._check_U(U)
-        # Argumentchecks: B
-        HTTensor._check_B(B)
-        # Argumentchecks: Kompatibilitaet
-        HTTensor._check_compatibility(U, B, dtree)
+        level = _validation.get_validation_level()
+        if level == "full":
+            # Argumentchecks: U
+            HTTensor._check_U(U)
+            # Argumentchecks: B
+            HTTensor._check_B(B)
+            # Argumentchecks: Kompatibilitaet
+            HTTensor._check_compatibility(U, B, dtree)
+        elif level == "light":
+            # Argumentchecks: Struktur
+            HTTensor._check_light(U, B, dtree)
         # Setzen der Instanzvariablen
         self.U = U
         self.B = B
         self.dtree = dtree
         self.is_orthog = is_orthog
+        # Arena und Offsettabelle, sofern die Kerne gepackt sind (siehe HTTensor.pack)
+        self._arena = None
+        self._arena_offsets = None
+        # Zwischenspeicher abgeleiteter Groessen (siehe _cache.py)
+        self._cache = {}
+
+    @classmethod
+    def _new(cls, U, B, dtree, is_orthog=False):
+        """
+        Hinweis: Dies ist eine interne Funktion.
+        Vertrauenswuerdiger Konstruktor, der unabhaengig von der Validierungsstufe keinerlei Argumentchecks durchfuehrt.
+        Er ist fuer intern erzeugte Blattmatrixdicts, Transfertensordicts und Dimensionsbaeume gedacht, die per
+        Konstruktion gueltig sind.
+        :param U: dict: tuple:integer -> torch.Tensor
+        :param B: dict: tuple:integer -> torch.Tensor
+        :param dtree: dt.dimtree
+        :param is_orthog: bool
+        """
+        x = cls.__new__(cls)
+        x.U = U
+        x.B = B
+        x.dtree = dtree
+        x.is_orthog = is_orthog
+        x._arena = None
+        x._arena_offsets = None
+        x._cache = {}
+        return x
+
+    @property
+    def is_orthog(self):
+        # Ein hierarchischer Tuckertensor ist orthogonal, wenn kein Knoten als nicht-orthonormal markiert ist
+        return not self._dirty
+
+    @is_orthog.setter
+    def is_orthog(self, flag):
+        # Setzt die Orthogonalitaetsflags aller Knoten ausser der Wurzel, deren Transfertensor nicht orthonormal
+        # sein muss. Lokale Operationen (z.B. mode_mul) markieren stattdessen nur die betroffenen Knoten in _dirty,
+        # sodass orthogonalize lediglich diese samt ihrer Pfade zur Wurzel neu orthogonalisiert
+        self._dirty = set() if flag else {node for node in self.dtree.nodes if not self.dtree.is_root(node)}
+
+    def __reduce__(self):
+        # Pickle ohne erneute Validierung beim Entpickeln
+        # Hinweis: Sichten auf eine gemeinsame Arena bleiben erhalten, da torch geteilte Speicher nur einmal pickelt
+        return _rebuild, (type(self), self.U, self.B, self.dtree.nodes, self.is_orthog, self._arena,
+                          self._arena_offsets)
+
+    def __deepcopy__(self, memo):
+        # Tiefe Kopie ohne erneute Validierung
+        # Hinweis: Durch das gemeinsame memo bleiben Sichten auf eine gemeinsame Arena auch in der Kopie erhalten
+        x = type(self)._new(U={node: deepcopy(mat, memo) for node, mat in self.U.items()},
+                            B={node: deepcopy(tens, memo) for node, tens in self.B.items()},
+                            dtree=type(self.dtree)._new({node: list(children)
+                                                         for node, children in self.dtree.nodes.items()}),
+                            is_orthog=self.is_orthog)
+        x._dirty = set(self._dirty)
+        if self._arena is not None:
+            x._arena = deepcopy(self._arena, memo)
+            x._arena_offsets = dict(self._arena_offsets)
+        memo[id(self)] = x
+        return x
 
     def __getitem__(self, key):
         return self.get(key)
 
     def __add__(self, y):
+        if _lazy.get_lazy_mode() or isinstance(y, HTExpression):
+            return HTExpression([(1.0, self)]) + y
         return self.plus(y)
 
     def __sub__(self, y):
+        if _lazy.get_lazy_mode() or isinstance(y, HTExpression):
+            return HTExpression([(1.0, self)]) - y
         return self.minus(y)
 
     def __mul__(self, y):
-        if isinstance(y, int):
-            return self.scalar_mul(float(y))
-        elif isinstance(y, torch.Tensor):
-            squeezed = y.squeeze()
-            if len(squeezed.shape) == 0:
-                return self.scalar_mul(float(squeezed))
-            else:
-                raise ValueError("Argument 'y': type(y)={} | y mit shape {} repraesentiert"
-                                 " keinen Skalar.".format(type(y), y.shape))
-        elif isinstance(y, float):
-            return self.scalar_mul(y)
-        else:
-            raise TypeError("Argument 'y': type(y)={} | y muss vom Type float, int"
-                            " oder torch.Tensor sein.".format(type(y)))
+        c = _to_scalar(y)
+        if _lazy.get_lazy_mode():
+            return HTExpression([(c, self)])
+        return self.scalar_mul(c)
 
     def __imod__(self, opts):
         self._check_opts(opts)
@@ -102,4 +212,19 @@ class HTTensor:
 
     def __mod__(self, opts):
         self._check_opts(opts)
-        return self.truncate_htt(opts)
\ No newline at end of file
+        return self.truncate_htt(opts)
+
+
+def _rebuild(cls, U, B, nodes, is_orthog, arena, arena_offsets):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion HTTensor.__reduce__.
+    Erzeugt einen entpickelten hierarchischen Tuckertensor ohne erneute Validierung.
+    """
+    x = cls._new(U=U, B=B, dtree=dimtree._new(nodes), is_orthog=is_orthog)
+    x._arena, x._arena_offsets = arena, arena_offsets
+    return x
+
+
+from .batch import HTTensorBatch
+from .family import HTTensorFamily
+from .expression import HTExpression, _to_scalar
@@ -0,0 +1,65 @@
+import weakref
+
+# Zwischenspeicher abgeleiteter Groessen (Gram'sche Matrizen, Norm, optional die orthogonale Form) eines HTTensors
+# Jeder Eintrag wird zusammen mit einem Fingerabdruck der Kerne abgelegt. Dieser besteht aus den ids der Kerne samt
+# ihrer torch Versionszaehler, den Orthogonalitaetsflags der Knoten und der Struktur des Dimensionsbaums. Ersetzt eine
+# Operation einen Kern (x.U[t] = ...), aendert ihn in-place (x.B[t] *= c) oder veraendert den Dimensionsbaum, so passt
+# der Fingerabdruck nicht mehr und der Eintrag gilt als ungueltig. Eine explizite Invalidierung ist daher nicht noetig.
+# Hinweis: Der Eintrag referenziert die Kerne nur schwach und haelt ersetzte Kerne somit nicht am Leben. Wird einer der
+#          Kerne freigegeben, so wird der Eintrag sofort verworfen. Ein solcher Eintrag koennte ansonsten durch eine
+#          erneut vergebene id faelschlich als gueltig gelten.
+
+
+def _fingerprint(x):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Berechnet den Fingerabdruck des hierarchischen Tuckertensors 'x'.
+    """
+    cores = tuple((node, id(core), core._version) for node, core in list(x.U.items()) + list(x.B.items()))
+    nodes = tuple((node, tuple(children)) for node, children in x.dtree.nodes.items())
+    return cores, nodes, frozenset(x._dirty)
+
+
+def _get_cached(x, key):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Gibt den unter 'key' zwischengespeicherten Wert von 'x' zurueck, sofern dieser noch gueltig ist. Ansonsten None.
+    """
+    entry = x._cache.get(key)
+    if entry is None:
+        return None
+    fingerprint, refs, value = entry
+    if any(ref() is None for ref in refs) or fingerprint != _fingerprint(x):
+        del x._cache[key]
+        return None
+    return value
+
+
+def _set_cached(x, key, value):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Legt 'value' unter 'key' im Zwischenspeicher von 'x' ab. Der Eintrag wird verworfen, sobald einer der aktuellen
+    Kerne von 'x' freigegeben wird.
+    """
+    cache = x._cache
+    refs = []
+
+    def evict(_):
+        # Verwirf den Eintrag nur, falls er nicht bereits durch einen neueren ersetzt wurde
+        entry = cache.get(key)
+        if entry is not None and entry[1] is refs:
+            del cache[key]
+
+    refs.extend(weakref.ref(core, evict) for core in list(x.U.values()) + list(x.B.values()))
+    cache[key] = (_fingerprint(x), refs, value)
+    return value
+
+
+def _evict_stale(x):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Verwirft alle ungueltigen Eintraege des Zwischenspeichers von 'x', z.B. nachdem Kerne von 'x' ersetzt wurden, die
+    anderweitig noch referenziert werden.
+    """
+    for key in list(x._cache):
+        _get_cached(x, key)
@@ -82,6 +82,8 @@ def _make_node_to_child_of_root(x, node: tuple, lr: str = "right"):
             # Passe Transfertensor der Wurzel entsprechend an
             x.B[new_root] = torch.transpose(x.B[root], 0, 1)
             del x.B[root]
+            # Die Wurzel wird in _dirty nicht gefuehrt, ein veralteter Eintrag darf die Umbenennung nicht ueberdauern
+            x._dirty.discard(root)
     else:
         # Fall 2)
         # node ist noch kein Kind der Wurzel
@@ -96,9 +98,11 @@ def _make_node_to_child_of_root(x, node: tuple, lr: str = "right"):
             x.B[child] = torch.tensordot(x.B[child], x.B[root], dims=[[2], [1]])
         # 1.3) Ersetze nun den Transfertensor der Wurzel durch eine auf 3D geshapte Identitaetsmatrix
         if node in x.B:
-            x.B[root] = torch.unsqueeze(torch.eye(x.B[node].shape[2]), dim=2)
+            x.B[root] = torch.unsqueeze(torch.eye(x.B[node].shape[2], dtype=x.B[node].dtype, device=x.B[node].device),
+                                        dim=2)
         else:
-            x.B[root] = torch.unsqueeze(torch.eye(x.U[node].shape[1]), dim=2)
+            x.B[root] = torch.unsqueeze(torch.eye(x.U[node].shape[1], dtype=x.U[node].dtype, device=x.U[node].device),
+                                        dim=2)
         # 2) Setze die neuen Kinder der Wurzel
         new_nodes = dict(dtx.nodes)
         if lr == "left":
@@ -140,7 +144,9 @@ def _make_node_to_child_of_root(x, node: tuple, lr: str = "right"):
         x.U = {old2new[k]: v for k, v in x.U.items()}
         x.B = {old2new[k]: v for k, v in x.B.items()}
         # Passe die Instanzvariablen des hierarchischen Tuckertensors an
-        x.dtree = type(dtx)(new_nodes)
+        x.dtree = type(dtx)._new(new_nodes)
+        # Die transponierten Transfertensoren entlang des invertierten Pfades sind i.A. nicht mehr orthonormal
+        x.is_orthog = False
 
 
 def _make_root_to_child_of_new_root(x, lr: str = "right"):
@@ -170,14 +176,16 @@ def _make_root_to_child_of_new_root(x, lr: str = "right"):
         adapted_nodes[new_left_child_of_new_root] = []
         # Ersetze den Dimensionsbaum von x durch einen neuen Dimensionsbaum basierend auf der aktualisierten
         # Knotenhierarchie enthalten in adapted_nodes
-        x.dtree = type(dtx)(nodes=adapted_nodes)
+        x.dtree = type(dtx)._new(nodes=adapted_nodes)
         # Aktualisiere das Blattmatrixdict und Transfertensordict
         # 1) Aktualisiere die Keys
         x.U = {old2new[node]: mat for node, mat in x.U.items()}
         x.B = {old2new[node]: tens for node, tens in x.B.items()}
         # 2) Fuege fuer die neue Wurzel und die neue Singleton Dimension entsprechende Eintraege hinzu
-        x.U[new_left_child_of_new_root] = torch.ones(1, 1)
-        x.B[new_root] = torch.ones(1, 1, 1)
+        # Die neuen Eintraege uebernehmen dtype und device der alten Wurzel
+        ref = x.B[adapted_old_root]
+        x.U[new_left_child_of_new_root] = torch.ones(1, 1, dtype=ref.dtype, device=ref.device)
+        x.B[new_root] = torch.ones(1, 1, 1, dtype=ref.dtype, device=ref.device)
     else:
         # Alte Wurzel wird zum linken Kind einer neuen Wurzel
         adapted_nodes = dtx.nodes
@@ -187,11 +195,15 @@ def _make_root_to_child_of_new_root(x, lr: str = "right"):
         adapted_nodes[new_right_child_of_new_root] = []
         # Ersetze den Dimensionsbaum von x durch einen neuen Dimensionsbaum basierend auf der aktualisierten
         # Knotenhierarchie enthalten in adapted_nodes
-        x.dtree = type(dtx)(nodes=adapted_nodes)
+        x.dtree = type(dtx)._new(nodes=adapted_nodes)
         # Aktualisiere das Blattmatrixdict und Transfertensordict
         # Fuege fuer die neue Wurzel und die neue Singleton Dimension entsprechende Eintraege hinzu
-        x.U[new_right_child_of_new_root] = torch.ones(1, 1)
-        x.B[new_root] = torch.ones(1, 1, 1)
+        # Die neuen Eintraege uebernehmen dtype und device der alten Wurzel
+        ref = x.B[old_root]
+        x.U[new_right_child_of_new_root] = torch.ones(1, 1, dtype=ref.dtype, device=ref.device)
+        x.B[new_root] = torch.ones(1, 1, 1, dtype=ref.dtype, device=ref.device)
+    # Der Transfertensor der alten Wurzel ist nicht orthonormal
+    x.is_orthog = False
 
 
 def _get_dimensions_for_each_node(nodes):
@@ -179,6 +179,52 @@ def _check_compatibility(U, B, dtree):
                                  " {} mit {}.".format(key, B[key].shape, right, B[right].shape))
 
 
+def _check_light(U, B, dtree):
+    """
+        Hinweis: Dies ist eine interne Funktion.
+        ______________________________________________________________________
+        Prueft strukturell, ob das Blattmatrix-dict 'U', das Transfertensor-dict 'B' und der Dimensionsbaum 'dtree'
+        einen hierarchischen Tuckertensor beschreiben. Dabei wird lediglich geprueft, ob jeder Knoten genau einen Kern
+        passender Ordnung besitzt und ob die Raenge benachbarter Kerne zueinander passen. Der Aufwand ist linear in
+        der Anzahl der Knoten. Ist eine der Bedingungen verletzt, wird eine entsprechende Exception erzeugt.
+        ______________________________________________________________________
+        Parameter
+        - U dict mit (int,...):torch.Tensor Eintraegen: Das zu ueberpruefende Blattmatrix-dict
+        - B dict mit (int,...):torch.Tensor Eintraegen: Das zu ueberpruefende Transfertensor-dict
+        - dtree dimtree: Der zu ueberpruefende Dimensionsbaum
+        ______________________________________________________________________
+        Output:
+        None
+        """
+    if not isinstance(U, dict):
+        raise TypeError("Argument 'U': type(U)={} | U ist kein dict.".format(type(U)))
+    if not isinstance(B, dict):
+        raise TypeError("Argument 'B': type(B)={} | B ist kein dict.".format(type(B)))
+    if not isinstance(dtree, dimtree):
+        raise TypeError("Argument 'dtree': type(dtree)={} |"
+                        " dtree ist nicht vom Typ ht.dimtree.".format(type(dtree)))
+    if len(U) + len(B) != len(dtree.nodes):
+        raise ValueError("Argument 'U', 'B', 'dtree': U, B und dtree sind nicht kompatibel.")
+    for node, children in dtree.nodes.items():
+        core = B.get(node) if children else U.get(node)
+        if not isinstance(core, torch.Tensor) or core.dim() != (3 if children else 2):
+            raise ValueError("Argument 'U', 'B', 'dtree': Fuer den Knoten {} existiert kein passender"
+                             " Kern.".format(node))
+        if children:
+            for i, child in enumerate(children):
+                if child in U:
+                    rank = U[child].shape[1]
+                elif child in B:
+                    rank = B[child].shape[2]
+                else:
+                    raise ValueError("Argument 'U', 'B', 'dtree': Fuer das Kind {} des Knotens {} existiert kein"
+                                     " Kern.".format(child, node))
+                if rank != core.shape[i]:
+                    raise ValueError("Argument 'B', 'U', 'dtree': Die shape des Transfertensors des Knotens {}"
+                                     " lautet {} und ist damit nicht kompatibel zum Rang {} des Kindes"
+                                     " {}.".format(node, core.shape, rank, child))
+
+
 def _check_opts(opts):
     """
         Hinweis: Dies ist eine interne Funktion.
@@ -188,6 +234,12 @@ def _check_opts(opts):
             - Der Value zu 'max_rank' muss ein positiver integer sein
             - Der Value zu 'err_tol_abs' muss ein positiver float sein
             - Der Value zu 'err_tol_abs' muss ein positiver float sein
+            - Der optionale Value zu 'mixed_precision' muss ein bool sein
+            - Der optionale Value zu 'error_allocation' muss "uniform" oder "global" sein
+            - Die optionalen Values zu 'max_nbytes' und 'max_params' muessen positive integer sein
+            - Der optionale Value zu 'report' muss ein bool sein
+            - Der optionale Value zu 'rounding' muss "gramian" oder "randomized" sein
+            - Der optionale Value zu 'seed' muss ein nicht-negativer integer sein und erfordert 'rounding'="randomized"
         ______________________________________________________________________
         Parameter:
         - opts dict mit str:float|int Eintraegen: Das zu ueberpruefende Options-dict.
@@ -200,11 +252,37 @@ def _check_opts(opts):
     for k, v in opts.items():
         if not isinstance(k, str):
             raise TypeError("Argument 'opts': opts enthaelt einen ungueltigen key. type({})={}.".format(k, type(k)))
-        if k not in {'max_rank', 'err_tol_abs', 'err_tol_rel'}:
+        if k not in {'max_rank', 'err_tol_abs', 'err_tol_rel', 'mixed_precision', 'error_allocation', 'max_nbytes',
+                     'max_params', 'report', 'rounding', 'seed'}:
             raise ValueError("Argument 'opts': der key {} in opts"
                              " ist nicht erlaubt. Erlaubt sind: {}.".format(k, {'max_rank', 'err_tol_abs',
-                                                                                'err_tol_rel'}))
-        if k == "max_rank":
+                                                                                'err_tol_rel', 'mixed_precision',
+                                                                                'error_allocation', 'max_nbytes',
+                                                                                'max_params', 'report', 'rounding',
+                                                                                'seed'}))
+        if k == "error_allocation":
+            if v not in ("uniform", "global"):
+                raise ValueError("Argument 'opts': Der value {} des keys {} ist weder \"uniform\""
+                                 " noch \"global\".".format(v, k))
+        elif k == "rounding":
+            if v not in ("gramian", "randomized"):
+                raise ValueError("Argument 'opts': Der value {} des keys {} ist weder \"gramian\""
+                                 " noch \"randomized\".".format(v, k))
+        elif k == "seed":
+            if not isinstance(v, int):
+                raise TypeError("Argument 'opts': Der value des keys {}"
+                                " ist kein integer. type(value)={}.".format(k, type(v)))
+            if v < 0:
+                raise ValueError("Argument 'opts': Der value {} des keys {}"
+                                 " ist kein nicht-negativer integer.".format(v, k))
+            if "rounding" not in opts or opts["rounding"] != "randomized":
+                raise ValueError("Argument 'opts': Der key {} wird nur von der randomisierten Rundung"
+                                 " (opts[\"rounding\"]=\"randomized\") unterstuetzt.".format(k))
+        elif k in ["mixed_precision", "report"]:
+            if not isinstance(v, bool):
+                raise TypeError("Argument 'opts': Der value des keys {}"
+                                " ist kein bool. type(value)={}.".format(k, type(v)))
+        elif k in ["max_rank", "max_nbytes", "max_params"]:
             if not isinstance(v, int):
                 raise TypeError("Argument 'opts': Der value des keys {}"
                                 " ist kein integer. type(value)={}.".format(k, type(v)))
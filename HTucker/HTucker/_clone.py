@@ -0,0 +1,26 @@
+from copy import deepcopy
+
+
+def clone(self):
+    """
+    Erzeugt eine tiefe Kopie des hierarchischen Tuckertensors 'self'. Ist 'self' gepackt (siehe HTTensor.pack), so wird
+    lediglich die Arena mit einer einzigen Operation kopiert und die Kerne der Kopie als Sichten darauf erzeugt.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Die Kopie.
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6)).pack()
+    y = x.clone()
+    y.is_packed()    # is True
+    """
+    if not self.is_packed():
+        return deepcopy(self)
+    arena = self._arena.clone()
+    offsets = dict(self._arena_offsets)
+    U = {node: arena[offsets[node]:offsets[node] + mat.numel()].view(mat.shape) for node, mat in self.U.items()}
+    B = {node: arena[offsets[node]:offsets[node] + tens.numel()].view(tens.shape) for node, tens in self.B.items()}
+    z = type(self)._new(U=U, B=B, dtree=type(self.dtree)._new(dict(self.dtree.nodes)), is_orthog=self.is_orthog)
+    z._arena, z._arena_offsets = arena, offsets
+    z._dirty = set(self._dirty)
+    return z
@@ -0,0 +1,216 @@
+import torch
+from .dimtree import dimtree
+
+
+def complete(cls, indices: torch.Tensor, values: torch.Tensor, shape: tuple, rank, opts: dict = None,
+             n_iter: int = 20, tol: float = 1e-6, reg: float = 1e-8, batch_size: int = 65536):
+    """
+    Bestimmt einen hierarchischen Tuckertensor mit den Raengen 'rank', der an den beobachteten Multiindizes 'indices'
+    moeglichst gut mit den Werten 'values' uebereinstimmt (Tensorvervollstaendigung), ohne je einen vollen Tensor zu
+    berechnen. Dazu werden die Blattmatrizen und Transfertensoren mittels alternierender kleinster Quadrate (ALS)
+    nacheinander aktualisiert:
+    - Fuer jede Beobachtung werden die Zeilen der Blattmatrizen gesammelt und bottom-up kontrahiert (V, vgl.
+      get_entries) sowie entlang des Pfades von der Wurzel die Kontraktion des Komplements des zu aktualisierenden
+      Knotens berechnet (W). Der beobachtete Eintrag ist dann linear im Kern des Knotens.
+    - Blattmatrizen: Die Zeilen entkoppeln. Die Normalgleichungen aller Zeilen werden per index_add_ akkumuliert und
+      gemeinsam geloest. Zeilen ohne Beobachtung werden zu 0.
+    - Transfertensoren: Die Normalgleichungen der Groesse (r_l r_r r_t)^2 werden blockweise ueber die Beobachtungen
+      akkumuliert.
+    - Nach jeder Aktualisierung eines Nicht-Wurzel-Knotens wird dessen Basis per QR orthonormalisiert und R in den
+      Elternknoten multipliziert. Anschliessend werden nur die Kontraktionen auf dem Pfad zur Wurzel erneuert.
+    Ein Sweep kostet damit O(Knotenanzahl * Tiefe * M * r^3) fuer M Beobachtungen. Die Normalgleichungen werden mit
+    reg * (mittlere Diagonale) regularisiert.
+    ______________________________________________________________________
+    Parameter:
+    - indices 2D torch.Tensor: Die beobachteten Multiindizes zeilenweise, also mit shape (M, d) und ganzzahligem dtype.
+    - values 1D torch.Tensor: Die M beobachteten Werte. Ihr dtype bestimmt den dtype des Ergebnisses.
+    - shape (int,...): Die Dimensionsgroessen des Tensors.
+    - rank int | dict: Der hierarchische Rang aller Nicht-Wurzel-Knoten bzw. ein dict mit den Raengen einzelner
+                       Knoten (siehe HTTensor.randn).
+    - opts dict | None: Ist opts gegeben, so wird das Ergebnis im Anschluss mittels truncate_htt gekuerzt.
+    - n_iter int: Die maximale Anzahl an Sweeps.
+    - tol float: Die Iteration endet, sobald sich der relative Fehler auf den Beobachtungen um weniger als tol aendert.
+    - reg float: Die relative Tikhonov Regularisierung der Normalgleichungen.
+    - batch_size int: Die Anzahl der Beobachtungen, die gleichzeitig zu Normalgleichungen akkumuliert werden.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der vervollstaendigte hierarchische Tuckertensor. Ist opts["report"] True, so wird das Tupel
+                         (hierarchischer Tuckertensor, Kuerzungsbericht) zurueckgegeben.
+    ______________________________________________________________________
+    Beispiel:
+    y = HTTensor.randn((20,20,20,20), rank={node: 3 for node in [(0,), (1,), (2,), (3,), (0, 1), (2, 3)]})
+    indices = torch.stack([torch.randint(20, (20000,)) for _ in range(4)], dim=1)
+    x = HTTensor.complete(indices, y.get_entries(indices), (20,20,20,20), rank=3)
+    x.estimate_error(y.full())["relative"]    # klein
+    """
+    # Argumentchecks
+    if not isinstance(shape, (tuple, list)) or not all(isinstance(n, int) and n > 0 for n in shape):
+        raise TypeError("Argument 'shape': shape={} | shape ist kein Tupel positiver integer.".format(shape))
+    if len(shape) < 2:
+        raise ValueError("Argument 'shape': len(shape)={} | Ein HTucker Tensor ist stets von Ordnung"
+                         " >= 2.".format(len(shape)))
+    if not isinstance(indices, torch.Tensor):
+        raise TypeError("Argument 'indices': type(indices)={} | indices ist kein torch.Tensor.".format(type(indices)))
+    if indices.dim() != 2 or indices.shape[1] != len(shape):
+        raise ValueError("Argument 'indices': indices.shape={} | indices ist kein 2D-torch.Tensor mit {}"
+                         " Spalten.".format(tuple(indices.shape), len(shape)))
+    if indices.dtype.is_floating_point or indices.dtype.is_complex:
+        raise TypeError("Argument 'indices': indices.dtype={} | indices besitzt keinen ganzzahligen"
+                        " dtype.".format(indices.dtype))
+    if len(indices) == 0:
+        raise ValueError("Argument 'indices': indices enthaelt keine Beobachtungen.")
+    if bool((indices < 0).any()) or bool((indices >= torch.tensor(shape, device=indices.device)).any()):
+        raise ValueError("Argument 'indices': indices enthaelt Multiindizes ausserhalb der shape {}.".format(shape))
+    if not isinstance(values, torch.Tensor):
+        raise TypeError("Argument 'values': type(values)={} | values ist kein torch.Tensor.".format(type(values)))
+    if values.shape != (len(indices),):
+        raise ValueError("Argument 'values': values.shape={} | values muss shape ({},) haben.".format(
+            tuple(values.shape), len(indices)))
+    if isinstance(rank, int):
+        if rank < 1:
+            raise ValueError("Argument 'rank': rank={} | rank ist kein positiver int.".format(rank))
+    elif not isinstance(rank, dict):
+        raise TypeError("Argument 'rank': type(rank)={} | rank ist weder ein int noch ein dict.".format(type(rank)))
+    if opts is not None:
+        cls._check_opts(opts)
+    if not isinstance(n_iter, int) or n_iter < 1:
+        raise ValueError("Argument 'n_iter': n_iter={} | n_iter ist kein positiver int.".format(n_iter))
+    if not isinstance(tol, float) or tol < 0.0:
+        raise ValueError("Argument 'tol': tol={} | tol ist kein nicht-negativer float.".format(tol))
+    if not isinstance(reg, float) or reg < 0.0:
+        raise ValueError("Argument 'reg': reg={} | reg ist kein nicht-negativer float.".format(reg))
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("Argument 'batch_size': batch_size={} | batch_size ist kein positiver int.".format(batch_size))
+
+    # Zufaellige orthogonale Initialisierung auf dem kanonischen Dimensionsbaum
+    dtype, device = values.dtype, values.device
+    if isinstance(rank, int):
+        rank = {node: rank for node in dimtree.get_canonic_dimtree(len(shape)).get_nodes()}
+    rank = {node: (min(k, shape[node[0]]) if len(node) == 1 else k) for node, k in rank.items()}
+    x = cls.randn(tuple(shape), rank=rank, is_orthog=True, dtype=dtype)
+    x.U = {leaf: U.to(device) for leaf, U in x.U.items()}
+    x.B = {node: B.to(device) for node, B in x.B.items()}
+
+    nodes = x.dtree.nodes
+    root = x.dtree.get_root()
+    parent = {child: node for node, children in nodes.items() for child in children}
+    bottom_up = [node for level in range(x.dtree.get_depth(), -1, -1) for node in x.dtree.get_nodes_of_lvl(level)]
+    indices = indices.to(device=device, dtype=torch.long)
+    norm_values = float(torch.linalg.norm(values))
+
+    # V[t]: Kontraktion des Frames von t an den beobachteten Multiindizes (M x r_t)
+    V = {}
+    for node in bottom_up:
+        _update_rows(x, V, indices, node)
+
+    err_old = None
+    for _ in range(n_iter):
+        for node in bottom_up:
+            # Pfad von der Wurzel zu node
+            path = [node]
+            while path[-1] in parent:
+                path.append(parent[path[-1]])
+            path = path[::-1]
+            # Kontraktion des Komplements von node an den beobachteten Multiindizes (M x r_node)
+            W = torch.ones(len(values), 1, dtype=dtype, device=device)
+            for t, child in zip(path[:-1], path[1:]):
+                l, r = nodes[t]
+                if child == l:
+                    W = torch.einsum("abk,mb,mk->ma", x.B[t], V[r], W)
+                else:
+                    W = torch.einsum("abk,ma,mk->mb", x.B[t], V[l], W)
+
+            if not nodes[node]:
+                x.U[node] = _solve_leaf(W, indices[:, node[0]], x.U[node].shape[0], values, reg, batch_size)
+            else:
+                l, r = nodes[node]
+                x.B[node] = _solve_transfer(V[l], V[r], W, values, reg, batch_size)
+            if node != root:
+                _orthonormalize(x, node, parent[node])
+            for t in path[::-1]:
+                _update_rows(x, V, indices, t)
+
+        # Relativer Fehler auf den Beobachtungen
+        err = float(torch.linalg.norm(V[root][:, 0] - values)) / max(norm_values, torch.finfo(dtype).tiny)
+        if err_old is not None and abs(err_old - err) < tol:
+            break
+        err_old = err
+
+    x.is_orthog = False
+    if opts is not None:
+        report = x.truncate_htt(opts)
+        if report is not None:
+            return x, report
+    return x
+
+
+def _update_rows(x, V: dict, indices: torch.Tensor, node: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion complete.
+    Berechnet die Kontraktion V[node] des Frames von 'node' an den beobachteten Multiindizes aus den Kontraktionen der
+    Kinder neu.
+    """
+    children = x.dtree.nodes[node]
+    if not children:
+        V[node] = x.U[node][indices[:, node[0]], :]
+    else:
+        l, r = children
+        V[node] = torch.einsum("ma,mb,abk->mk", V[l], V[r], x.B[node])
+
+
+def _solve_leaf(W: torch.Tensor, rows: torch.Tensor, n: int, values: torch.Tensor, reg: float, batch_size: int):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion complete.
+    Loest die entkoppelten Kleinste-Quadrate-Probleme fuer die n Zeilen einer Blattmatrix. Die Beobachtung m traegt
+    zur Zeile rows[m] mit dem Regressor W[m] bei.
+    """
+    r = W.shape[1]
+    A = torch.zeros(n, r, r, dtype=W.dtype, device=W.device)
+    b = torch.zeros(n, r, dtype=W.dtype, device=W.device)
+    for start in range(0, len(values), batch_size):
+        W_batch, rows_batch = W[start:start + batch_size], rows[start:start + batch_size]
+        A.index_add_(0, rows_batch, W_batch[:, :, None] * W_batch[:, None, :])
+        b.index_add_(0, rows_batch, W_batch * values[start:start + batch_size, None])
+    lam = reg * torch.diagonal(A, dim1=1, dim2=2).mean().clamp(min=torch.finfo(W.dtype).tiny)
+    A = A + lam * torch.eye(r, dtype=W.dtype, device=W.device)
+    return torch.linalg.solve(A, b)
+
+
+def _solve_transfer(V_l: torch.Tensor, V_r: torch.Tensor, W: torch.Tensor, values: torch.Tensor, reg: float,
+                    batch_size: int):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion complete.
+    Loest das Kleinste-Quadrate-Problem fuer einen Transfertensor. Der Regressor der Beobachtung m ist das
+    Kroneckerprodukt V_l[m] x V_r[m] x W[m].
+    """
+    shape = (V_l.shape[1], V_r.shape[1], W.shape[1])
+    P = shape[0] * shape[1] * shape[2]
+    A = torch.zeros(P, P, dtype=W.dtype, device=W.device)
+    b = torch.zeros(P, dtype=W.dtype, device=W.device)
+    for start in range(0, len(values), batch_size):
+        stop = start + batch_size
+        phi = torch.einsum("ma,mb,mk->mabk", V_l[start:stop], V_r[start:stop], W[start:stop]).reshape(-1, P)
+        A += phi.T @ phi
+        b += phi.T @ values[start:stop]
+    lam = reg * torch.diagonal(A).mean().clamp(min=torch.finfo(W.dtype).tiny)
+    A = A + lam * torch.eye(P, dtype=W.dtype, device=W.device)
+    return torch.linalg.solve(A, b).reshape(shape)
+
+
+def _orthonormalize(x, node: tuple, par: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion complete.
+    Orthonormalisiert die Basis von 'node' per QR Zerlegung und multipliziert R in den Transfertensor des Elternknotens
+    'par', sodass der dargestellte Tensor unveraendert bleibt.
+    """
+    if x.dtree.is_leaf(node):
+        x.U[node], R = torch.linalg.qr(x.U[node], mode="reduced")
+    else:
+        shape = x.B[node].shape
+        Q, R = torch.linalg.qr(x.matricise(x.B[node], t=(0, 1)), mode="reduced")
+        x.B[node] = x.dematricise(Q, shape=(shape[0], shape[1], Q.shape[1]), t=(0, 1))
+    if x.dtree.is_left(node):
+        x.B[par] = torch.tensordot(R, x.B[par], dims=([1], [0]))
+    else:
+        x.B[par] = torch.tensordot(R, x.B[par], dims=([1], [1]))
+        x.B[par] = torch.movedim(x.B[par], source=0, destination=1)
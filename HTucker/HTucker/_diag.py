@@ -0,0 +1,44 @@
+import torch
+from .dimtree import dimtree
+
+
+def diag(cls, vector: torch.Tensor, order: int):
+    """
+    Erzeugt den diagonalen Tensor der Ordnung 'order' mit x[i,i,...,i] = vector[i] und 0 sonst exakt auf dem
+    kanonischen Dimensionsbaum, ohne den vollen Tensor zu berechnen. Die Blattmatrizen sind Einheitsmatrizen und die
+    Transfertensoren die Einheitstensoren delta_abc, der Rang jedes Knotens ist also len(vector). Das Ergebnis ist
+    orthogonal.
+    Hinweis: Indikatortensoren einzelner Eintraege sind aeussere Produkte von Einheitsvektoren (siehe HTTensor.outer).
+    ______________________________________________________________________
+    Parameter:
+    - vector 1D torch.Tensor: Die Diagonaleintraege.
+    - order int: Die Ordnung des Tensors (>= 2).
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der diagonale Tensor mit shape (n,...,n), n = len(vector).
+    ______________________________________________________________________
+    Beispiel:
+                      HTucker.HTTensor         <~~~>          torch.Tensor
+    v = torch.randn(4)
+    x = HTTensor.diag(v, 2)                    |           x = torch.diag(v)
+    """
+    if not isinstance(vector, torch.Tensor):
+        raise TypeError("Argument 'vector': type(vector)={} | vector ist kein torch.Tensor.".format(type(vector)))
+    if vector.dim() != 1 or vector.shape[0] == 0:
+        raise ValueError("Argument 'vector': vector.shape={} | vector ist kein nicht-leerer 1D"
+                         " torch.Tensor.".format(vector.shape))
+    if not isinstance(order, int):
+        raise TypeError("Argument 'order': type(order)={} | order ist kein int.".format(type(order)))
+    if order < 2:
+        raise ValueError("Argument 'order': order={} | Ein HTucker Tensor ist stets von Ordnung >= 2.".format(order))
+
+    n, dtype, device = vector.shape[0], vector.dtype, vector.device
+    dtree = dimtree.get_canonic_dimtree(order)
+    U = {leaf: torch.eye(n, dtype=dtype, device=device) for leaf in dtree.get_leaves()}
+    # Einheitstensor delta_abc
+    delta = torch.zeros(n, n, n, dtype=dtype, device=device)
+    idx = torch.arange(n, device=device)
+    delta[idx, idx, idx] = 1.0
+    B = {node: delta.clone() for node in dtree.get_nodes() if not dtree.is_leaf(node)}
+    B[dtree.get_root()] = torch.diag(vector).reshape(n, n, 1)
+    return cls._new(U=U, B=B, dtree=dtree, is_orthog=True)
@@ -44,6 +44,6 @@ def ele_mode_mul(self, v: torch.Tensor, dim: int):
     # Multipliziere A elementweise mit der Blattmatrix des Knotens, der die Dimension dim repraesentiert
     node = (dim,)
     x.U[node] = x.U[node] * v[:, None]
-    # Setze is_orthog Flag auf False
-    x.is_orthog = False
+    # Lediglich die Blattmatrix des Knotens ist nicht mehr orthonormal
+    x._dirty.add(node)
     return x
@@ -1,6 +1,6 @@
 import torch
-import numpy as np
-from copy import deepcopy
+from ._tensordot import _shallow_copy
+from ._report import _pop_report, _record, _finish_report
 from math import sqrt
 
 
@@ -22,9 +22,20 @@ def ele_mul(self, y, opts: dict=None):
                                                      Fehlertoleranz fest
                                     - "err_tol_rel": positiver float | Left die einzuhaltende relative
                                                      Fehlertoleranz fest
+                                    - "mixed_precision": bool | Berechnet die reduzierten Gram'schen Matrizen
+                                                     samt Spektralzerlegungen in torch.float64, waehrend die
+                                                     Blattmatrizen und Transfertensoren ihren dtype (z.B.
+                                                     torch.float32) behalten
+                                    - "report": bool | Gibt zusaetzlich einen Kuerzungsbericht zurueck (siehe
+                                                     HTTensor.truncate_htt). Als Norm dient dabei, wie fuer die
+                                                     relative Fehlertoleranz, das Produkt der Normen von 'self'
+                                                     und 'y'
+                                    Die keys "error_allocation", "max_nbytes", "max_params" und "rounding" werden
+                                    nicht unterstuetzt.
     ______________________________________________________________________
     Output:
-    (HTucker.HTTensor,): Das elementweise Produkt.
+    (HTucker.HTTensor,): Das elementweise Produkt. Ist opts["report"] True, so wird das Tupel (Produkt,
+                         Kuerzungsbericht) zurueckgegeben.
     ______________________________________________________________________
     Beispiel:
                   HTucker.HTTensor                   <~~~>          torch.Tensor
@@ -55,26 +66,35 @@ def ele_mul(self, y, opts: dict=None):
                          "self={}.".format(y.get_shape(), self.get_shape()))
     if opts is not None:
         self._check_opts(opts)
-
-    # Erzeuge Kopien
-    x = deepcopy(self)
-    y = deepcopy(y)
-
+        unsupported = [k for k in ("error_allocation", "max_nbytes", "max_params", "rounding") if k in opts]
+        if unsupported:
+            raise ValueError("Argument 'opts': Die keys {} werden von ele_mul nicht unterstuetzt.".format(unsupported))
+    # Kuerzungsbericht, sofern angefordert
+    opts, report = _pop_report(opts)
+    requested_opts = opts
 
     # Anpassen der Fehlertoleranzen in opts
     # Soll global der Fehler e eingehalten werden, muss der Kuerzungsfehler pro Knoten
     # kleiner gleich e / sqrt((Tensorordnung * 2 - 2)) bleiben
     if opts is not None:
-        opts = {k: (v / sqrt(len(x.get_shape()) * 2 - 2) if k in ["err_tol_abs", "err_tol_rel"]
+        opts = {k: (v / sqrt(len(self.get_shape()) * 2 - 2) if k in ["err_tol_abs", "err_tol_rel"]
                     else v) for k, v in opts.items()}
 
-    # Orthogonalisiere x und y
-    x.orthogonalize()
-    y.orthogonalize()
-
-    # Berechne reduzierten Gram'schen Matrizen
-    Gx = x._get_gramians()
-    Gy = y._get_gramians()
+    # Berechne reduzierten Gram'schen Matrizen der orthogonalen Formen von self und y
+    # Ist ein Faktor bereits orthogonal, so werden seine Gram'schen Matrizen an ihm zwischengespeichert, sodass
+    # wiederholte Multiplikationen mit demselben Faktor sie wiederverwenden. Die orthogonale Form eines nicht
+    # orthogonalen Faktors wird hingegen nur fuer diesen Aufruf berechnet
+    # Im mixed precision Modus geschieht dies in torch.float64
+    mixed_precision = opts["mixed_precision"] if opts is not None and "mixed_precision" in opts else False
+    # Gekuerzt wird nur, wenn opts einen Rang- oder Fehler-Constraint enthaelt
+    truncating = opts is not None and any(k in opts for k in ("max_rank", "err_tol_abs", "err_tol_rel"))
+    x, y = self._get_orthogonal(), y._get_orthogonal()
+    Gx = x._get_gramians(torch.float64 if mixed_precision else None)
+    Gy = y._get_gramians(torch.float64 if mixed_precision else None)
+
+    # Erzeuge flache Kopien der orthogonalen Formen
+    # Hinweis: Die folgenden Updates ersetzen die Kerne, veraendern diese aber nicht in-place
+    x, y = _shallow_copy(x), _shallow_copy(y)
 
     # Traversiere der Baum bottom-up
     for level in range(x.dtree.get_depth(), -1, -1):
@@ -94,31 +114,32 @@ def ele_mul(self, y, opts: dict=None):
                 Qx, svx = self.left_svd_gramian(Gx[node])
                 Qy, svy = self.left_svd_gramian(Gy[node])
 
-                # Konvertiere die Singulaerwerte zu np.ndarray
-                svx = np.array(svx)
-                svy = np.array(svy)
-
                 # Berechne alle Zweierprodukte aus Singulaerwerten
-                sv = svx.reshape((-1, 1)) @ svy.reshape((-1, 1)).T
+                # Hinweis: Die Berechnung verbleibt in torch, sodass dtype und device der Singulaerwerte
+                #          erhalten bleiben
+                sv = torch.outer(svx, svy)
 
                 # Ordne diese Produkte absteigend
-                ind = np.argsort(sv.ravel())[::-1]
+                ind = torch.argsort(sv.ravel(), descending=True)
                 sv_flat_and_ordered = sv.ravel()[ind]
 
                 # Bestimme Kuerzungsrang
                 # Hinweis: Der Rang bezieht sich auf alle Zweierprodukte. Der maximale Rang
                 #          ist damit gegeben als #Spalten in Qx * #Anzahl Spalten in Qy
-                if opts:
-                    rank = self._get_truncation_rank(torch.Tensor(sv_flat_and_ordered), opts)
+                if truncating:
+                    rank = self._get_truncation_rank(sv_flat_and_ordered, opts)
                 else:
                     rank = len(sv_flat_and_ordered)
+                _record(report, node, sv_flat_and_ordered, rank)
+                norm = torch.linalg.norm(sv_flat_and_ordered)
 
                 # Bestimme die Spalten, die mitgenommen werden
                 # Hinweis: Da die Indizes aus indx und indy angeben, welche Zweierprodukte mitgenommen werden,
                 #          ist es moeglich (sogar wahrscheinlich), dass manche Spalten doppelt auftreten
-                indx, indy = np.unravel_index(indices=ind[:rank], shape=sv.shape)
-                Qx = Qx[:, indx]
-                Qy = Qy[:, indy]
+                # Die Basen werden im dtype der Kerne weiterverrechnet
+                indx, indy = ind[:rank] // sv.shape[1], ind[:rank] % sv.shape[1]
+                Qx = Qx[:, indx].to(x.B[x.dtree.get_parent(node)].dtype)
+                Qy = Qy[:, indy].to(y.B[y.dtree.get_parent(node)].dtype)
 
 
                 if x.dtree.is_leaf(node):
@@ -147,4 +168,6 @@ def ele_mul(self, y, opts: dict=None):
 
     # Setze is_orthog Flag auf false
     x.is_orthog = False
+    if report is not None:
+        return x, _finish_report(report, requested_opts, norm)
     return x
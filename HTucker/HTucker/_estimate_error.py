@@ -0,0 +1,124 @@
+import torch
+from math import prod, sqrt
+from statistics import NormalDist
+
+
+def estimate_error(self, reference, n_samples: int = 10000, sampling: str = "uniform", confidence: float = 0.95,
+                   batch_size: int = 65536, seed: int = None):
+    """
+    Schaetzt den Fehler zwischen dem hierarchischen Tuckertensor 'self' und der Referenz 'reference' anhand zufaellig
+    gezogener Multiindizes, ohne 'self' mittels full() zu rekonstruieren. 'self' wird dabei mit HTTensor.get_entries
+    ausgewertet, die Referenz nur an den gezogenen Multiindizes gelesen.
+    Aus den quadrierten Fehlern an den Stichproben werden der mittlere quadratische Fehler (RMS), die daraus
+    hochgerechnete Frobeniusnorm des Fehlers und der relative Fehler geschaetzt. Die Konfidenzintervalle beruhen auf
+    dem zentralen Grenzwertsatz fuer den Mittelwert der quadrierten Fehler.
+    Hinweis: - Der maximale absolute Fehler der Stichprobe ist lediglich eine untere Schranke fuer den tatsaechlichen
+               maximalen Fehler.
+             - Bei stark lokalisierten Fehlern sind entsprechend viele Stichproben noetig.
+    ______________________________________________________________________
+    Parameter:
+    - reference torch.Tensor | array-artig | callable: Die Referenz. Dies kann ein voller torch.Tensor, ein beliebiges
+                                                        Objekt mit shape und numpy-artiger Indizierung (z.B.
+                                                        numpy.memmap) oder eine Funktion sein, die zu einem 2D
+                                                        torch.Tensor von Multiindizes der shape (M, d) die M Werte
+                                                        zurueckgibt.
+    - n_samples int: Die Anzahl der Stichproben.
+    - sampling str: "uniform" zieht die Multiindizes unabhaengig und gleichverteilt. "stratified" verwendet ein Latin
+                    Hypercube Design, bei dem die Stichproben in jeder Dimension gleichmaessig ueber die Indizes
+                    verteilt sind.
+    - confidence float: Das Konfidenzniveau der Intervalle, 0 < confidence < 1.
+    - batch_size int: Die Anzahl der Multiindizes, die gleichzeitig ausgewertet werden.
+    - seed int | None: Der Seed des Zufallszahlengenerators.
+    ______________________________________________________________________
+    Output:
+    (dict,): Das dict enthaelt:
+             - "n_samples": Die Anzahl der Stichproben
+             - "rms", "rms_ci": Der geschaetzte RMS Fehler samt Konfidenzintervall
+             - "frobenius", "frobenius_ci": Die geschaetzte Frobeniusnorm des Fehlers samt Konfidenzintervall
+             - "relative": Der geschaetzte relative Fehler ||self - reference|| / ||reference||
+             - "max_abs": Der maximale absolute Fehler der Stichprobe
+             - "confidence": Das Konfidenzniveau
+    ______________________________________________________________________
+    Beispiel:
+    x = torch.randn(30,40,50,60)
+    xh = HTTensor.truncate(x, {"err_tol_rel": 0.5})
+    est = xh.estimate_error(x, n_samples=100000)
+    est["relative"]    # ~ torch.linalg.norm(x - xh.full()) / torch.linalg.norm(x)
+    """
+    if not isinstance(n_samples, int):
+        raise TypeError("Argument 'n_samples': type(n_samples)={} | n_samples ist kein int.".format(type(n_samples)))
+    if n_samples < 2:
+        raise ValueError("Argument 'n_samples': n_samples={} | Es sind mindestens zwei Stichproben"
+                         " noetig.".format(n_samples))
+    if sampling not in ("uniform", "stratified"):
+        raise ValueError("Argument 'sampling': sampling={} | Erlaubt sind \"uniform\" und"
+                         " \"stratified\".".format(sampling))
+    if not isinstance(confidence, float):
+        raise TypeError("Argument 'confidence': type(confidence)={} | confidence ist kein"
+                        " float.".format(type(confidence)))
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("Argument 'confidence': confidence={} | confidence liegt nicht in (0, 1).".format(confidence))
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("Argument 'batch_size': batch_size={} | batch_size ist kein positiver"
+                         " integer.".format(batch_size))
+    shape = self.get_shape()
+    if not callable(reference):
+        if not hasattr(reference, "shape") or tuple(reference.shape) != shape:
+            raise ValueError("Argument 'reference': Die shape von reference stimmt nicht mit der shape {} von self"
+                             " ueberein.".format(shape))
+
+    # Ziehe die Multiindizes
+    generator = torch.Generator()
+    if seed is not None:
+        generator.manual_seed(seed)
+    if sampling == "uniform":
+        idx = torch.stack([torch.randint(n, (n_samples,), generator=generator) for n in shape], dim=1)
+    else:
+        # Latin Hypercube: Pro Dimension liegt in jedem der n_samples gleich grossen Intervalle genau eine Stichprobe
+        strata = torch.stack([torch.randperm(n_samples, generator=generator) for _ in shape], dim=1)
+        u = (strata + torch.rand(n_samples, len(shape), generator=generator, dtype=torch.float64)) / n_samples
+        idx = torch.minimum((u * torch.tensor(shape, dtype=torch.float64)).long(), torch.tensor(shape) - 1)
+
+    # Werte self und die Referenz stapelweise aus
+    approx, ref = [], []
+    for start in range(0, n_samples, batch_size):
+        batch = idx[start:start + batch_size]
+        approx.append(self.get_entries(batch).double().cpu())
+        ref.append(_evaluate_reference(reference, batch))
+    approx, ref = torch.cat(approx), torch.cat(ref)
+
+    # Schaetzer
+    err2 = (approx - ref) ** 2
+    mean_err2 = float(err2.mean())
+    # Halbe Breite des Konfidenzintervalls fuer den Mittelwert der quadrierten Fehler
+    z = NormalDist().inv_cdf((1.0 + confidence) / 2.0)
+    half_width = z * float(err2.std()) / sqrt(n_samples)
+    lo, hi = max(mean_err2 - half_width, 0.0), mean_err2 + half_width
+    numel = prod(shape)
+    mean_ref2 = float((ref ** 2).mean())
+    return {"n_samples": n_samples,
+            "rms": sqrt(mean_err2),
+            "rms_ci": (sqrt(lo), sqrt(hi)),
+            "frobenius": sqrt(numel * mean_err2),
+            "frobenius_ci": (sqrt(numel * lo), sqrt(numel * hi)),
+            "relative": sqrt(mean_err2 / mean_ref2) if mean_ref2 > 0 else float("inf"),
+            "max_abs": float(torch.sqrt(err2.max())),
+            "confidence": confidence}
+
+
+def _evaluate_reference(reference, idx: torch.Tensor):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion HTTensor.estimate_error.
+    Wertet die Referenz an den Multiindizes 'idx' aus und gibt die Werte als 1D torch.Tensor in torch.float64 zurueck.
+    """
+    if isinstance(reference, torch.Tensor):
+        values = reference[tuple(idx.to(reference.device).T)]
+    elif callable(reference):
+        values = reference(idx)
+    else:
+        # numpy-artige Indizierung, z.B. fuer numpy.memmap. Es werden nur die indizierten Eintraege gelesen
+        values = reference[tuple(idx.T.numpy())]
+    values = torch.as_tensor(values).reshape(-1)
+    if len(values) != len(idx):
+        raise ValueError("Argument 'reference': reference liefert {} statt {} Werte.".format(len(values), len(idx)))
+    return values.double().cpu()
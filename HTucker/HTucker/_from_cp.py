@@ -0,0 +1,60 @@
+import torch
+from .dimtree import dimtree
+
+
+def from_cp(cls, factors: list, weights: torch.Tensor = None, opts: dict = None):
+    """
+    Erzeugt den hierarchischen Tuckertensor zum CP-Tensor sum_j weights[j] * a_0j x a_1j x ... x a_{d-1}j mit den
+    Faktormatrizen A_mu = factors[mu] (Spalten a_mu1, ..., a_muR) auf dem kanonischen Dimensionsbaum, ohne den vollen
+    Tensor zu berechnen. Die Blattmatrizen sind die Faktormatrizen, die Transfertensoren der inneren Knoten die
+    Einheitstensoren delta_abc und der Transfertensor der Wurzel diag(weights). Alle Raenge sind also hoechstens R.
+    ______________________________________________________________________
+    Parameter:
+    - factors [2D torch.Tensor,...]: Die Faktormatrizen mit shape (n_mu, R).
+    - weights 1D torch.Tensor | None: Die Gewichte der R Summanden. Ist weights None, so sind alle Gewichte 1.
+    - opts dict | None: Ist opts gegeben, so wird das Ergebnis im Anschluss mittels truncate_htt gekuerzt.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der hierarchische Tuckertensor. Ist opts["report"] True, so wird das Tupel
+                         (hierarchischer Tuckertensor, Kuerzungsbericht) zurueckgegeben.
+    ______________________________________________________________________
+    Beispiel:
+    A, B, C = torch.randn(3, 5), torch.randn(4, 5), torch.randn(6, 5)
+    x = HTTensor.from_cp([A, B, C])    # entspricht torch.einsum("ir,jr,kr->ijk", A, B, C)
+    """
+    if not isinstance(factors, (list, tuple)):
+        raise TypeError("Argument 'factors': type(factors)={} | factors ist keine list.".format(type(factors)))
+    if len(factors) < 2:
+        raise ValueError("Argument 'factors': len(factors)={} | Ein HTucker Tensor ist stets von Ordnung"
+                         " >= 2.".format(len(factors)))
+    if not all(isinstance(A, torch.Tensor) and A.dim() == 2 for A in factors):
+        raise TypeError("Argument 'factors': factors enthaelt Elemente, die keine 2D torch.Tensoren sind.")
+    R = factors[0].shape[1]
+    if any(A.shape[1] != R for A in factors):
+        raise ValueError("Argument 'factors': Die Faktormatrizen haben unterschiedlich viele Spalten.")
+    dtype, device = factors[0].dtype, factors[0].device
+    if weights is None:
+        weights = torch.ones(R, dtype=dtype, device=device)
+    if not isinstance(weights, torch.Tensor):
+        raise TypeError("Argument 'weights': type(weights)={} | weights ist kein torch.Tensor.".format(type(weights)))
+    if weights.shape != (R,):
+        raise ValueError("Argument 'weights': weights.shape={} | weights muss shape ({},) haben.".format(weights.shape,
+                                                                                                        R))
+    if opts is not None:
+        cls._check_opts(opts)
+
+    dtree = dimtree.get_canonic_dimtree(len(factors))
+    U = {leaf: factors[leaf[0]] for leaf in dtree.get_leaves()}
+    # Einheitstensor delta_abc
+    idx = torch.arange(R, device=device)
+    B = {}
+    for node in dtree.get_inner_nodes():
+        B[node] = torch.zeros(R, R, R, dtype=dtype, device=device)
+        B[node][idx, idx, idx] = 1.0
+    B[dtree.get_root()] = torch.diag(weights).reshape(R, R, 1)
+    x = cls._new(U=U, B=B, dtree=dtree, is_orthog=False)
+    if opts is not None:
+        report = x.truncate_htt(opts)
+        if report is not None:
+            return x, report
+    return x
@@ -0,0 +1,67 @@
+import torch
+from .dimtree import dimtree
+
+
+def from_tt(cls, cores: list, opts: dict = None):
+    """
+    Erzeugt den hierarchischen Tuckertensor zum Tensor-Train (TT) mit den Kernen 'cores' auf dem degenerierten
+    Dimensionsbaum (siehe dimtree.get_degenerate_dimtree), ohne den vollen Tensor zu berechnen. Der innere Knoten
+    (k, ..., d-1) erhaelt den TT-Rang r_{k-1}, sein Transfertensor entspricht dem k-ten Kern. Ist die Modusgroesse n_k
+    groesser als r_{k-1} * r_k, so wird die Blattmatrix per QR Zerlegung der Modus-Matrizierung des Kerns bestimmt,
+    ansonsten ist sie die Einheitsmatrix.
+    ______________________________________________________________________
+    Parameter:
+    - cores [3D torch.Tensor,...]: Die TT-Kerne G_k mit shape (r_{k-1}, n_k, r_k), wobei r_{-1} = r_{d-1} = 1.
+    - opts dict | None: Ist opts gegeben, so wird das Ergebnis im Anschluss mittels truncate_htt gekuerzt.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der hierarchische Tuckertensor. Ist opts["report"] True, so wird das Tupel
+                         (hierarchischer Tuckertensor, Kuerzungsbericht) zurueckgegeben.
+    ______________________________________________________________________
+    Beispiel:
+    cores = [torch.randn(1, 3, 2), torch.randn(2, 4, 5), torch.randn(5, 6, 1)]
+    x = HTTensor.from_tt(cores)
+    x.to_tt()    # entspricht cores bis auf Basiswechsel
+    """
+    if not isinstance(cores, (list, tuple)):
+        raise TypeError("Argument 'cores': type(cores)={} | cores ist keine list.".format(type(cores)))
+    if len(cores) < 2:
+        raise ValueError("Argument 'cores': len(cores)={} | Ein HTucker Tensor ist stets von Ordnung"
+                         " >= 2.".format(len(cores)))
+    if not all(isinstance(core, torch.Tensor) and core.dim() == 3 for core in cores):
+        raise TypeError("Argument 'cores': cores enthaelt Elemente, die keine 3D torch.Tensoren sind.")
+    if cores[0].shape[0] != 1 or cores[-1].shape[2] != 1:
+        raise ValueError("Argument 'cores': Der erste und der letzte TT-Rang muessen 1 sein.")
+    if any(cores[k].shape[2] != cores[k + 1].shape[0] for k in range(len(cores) - 1)):
+        raise ValueError("Argument 'cores': Die TT-Raenge benachbarter Kerne stimmen nicht ueberein.")
+    if opts is not None:
+        cls._check_opts(opts)
+
+    d = len(cores)
+    dtree = dimtree.get_degenerate_dimtree(d)
+    U, B, G = {}, {}, []
+    for k, core in enumerate(cores):
+        r_left, n, r_right = core.shape
+        if n > r_left * r_right:
+            # Blattbasis aus der Modus-Matrizierung (n_k x r_{k-1} r_k) des Kerns
+            Q, R = torch.linalg.qr(core.permute(1, 0, 2).reshape(n, r_left * r_right), mode="reduced")
+            U[(k,)] = Q
+            G.append(R.reshape(Q.shape[1], r_left, r_right).permute(1, 0, 2))
+        else:
+            U[(k,)] = torch.eye(n, dtype=core.dtype, device=core.device)
+            G.append(core)
+
+    # Der Knoten (k, ..., d-1) hat die Kinder (k,) und (k+1, ..., d-1)
+    for k in range(d - 1):
+        node = tuple(range(k, d))
+        if k == d - 2:
+            # Das rechte Kind ist das Blatt (d-1,), dessen Kern in den Transfertensor multipliziert wird
+            B[node] = torch.einsum("cas,sb->abc", G[k], G[d - 1][:, :, 0])
+        else:
+            B[node] = G[k].permute(1, 2, 0)
+    x = cls._new(U=U, B=B, dtree=dtree, is_orthog=False)
+    if opts is not None:
+        report = x.truncate_htt(opts)
+        if report is not None:
+            return x, report
+    return x
@@ -0,0 +1,46 @@
+import torch
+
+
+def get_entries(self, idx: torch.Tensor):
+    """
+    Wertet den hierarchischen Tuckertensor 'self' an den Multiindizes in 'idx' aus, ohne den vollen Tensor zu
+    berechnen. Dazu werden die Zeilen der Blattmatrizen gesammelt und bottom-up fuer alle Multiindizes gleichzeitig mit
+    den Transfertensoren kontrahiert. Der Aufwand ist linear in der Anzahl der Multiindizes.
+    ______________________________________________________________________
+    Parameter:
+    - idx 2D torch.Tensor: Die Multiindizes zeilenweise, also mit shape (M, d) und ganzzahligem dtype.
+    ______________________________________________________________________
+    Output:
+    (1D torch.Tensor,): Die M Eintraege.
+    ______________________________________________________________________
+    Beispiel:
+                  HTucker.HTTensor             <~~~>            torch.Tensor
+    x = HTTensor.randn((3,4,5,6))              |           x = torch.randn(3,4,5,6)
+    idx = torch.tensor([[0,1,2,3],[2,3,4,5]])  |           idx = torch.tensor([[0,1,2,3],[2,3,4,5]])
+    x.get_entries(idx)                         |           x[tuple(idx.T)]
+    """
+    if not isinstance(idx, torch.Tensor):
+        raise TypeError("Argument 'idx': type(idx)={} | idx ist kein torch.Tensor.".format(type(idx)))
+    shape = self.get_shape()
+    if idx.dim() != 2 or idx.shape[1] != len(shape):
+        raise ValueError("Argument 'idx': idx.shape={} | idx ist kein 2D-torch.Tensor mit {}"
+                         " Spalten.".format(tuple(idx.shape), len(shape)))
+    if idx.dtype.is_floating_point or idx.dtype.is_complex:
+        raise TypeError("Argument 'idx': idx.dtype={} | idx besitzt keinen ganzzahligen dtype.".format(idx.dtype))
+    if len(idx) > 0 and (bool((idx < 0).any()) or bool((idx >= torch.tensor(shape, device=idx.device)).any())):
+        raise ValueError("Argument 'idx': idx enthaelt Multiindizes ausserhalb der shape {}.".format(shape))
+
+    x = self
+    root = x.dtree.get_root()
+    idx = idx.to(device=x.B[root].device, dtype=torch.long)
+    # Zeilen der Blattmatrizen bzw. Basisvektoren der inneren Knoten an den Multiindizes
+    V = {}
+    # Iteriere den Dimensionsbaum bottom-up
+    for level in range(x.dtree.get_depth(), -1, -1):
+        for node in x.dtree.get_nodes_of_lvl(level):
+            if x.dtree.is_leaf(node):
+                V[node] = x.U[node][idx[:, node[0]], :]
+                continue
+            l, r = x.dtree.get_children(node)
+            V[node] = torch.einsum("ma,mb,abk->mk", V.pop(l), V.pop(r), x.B[node])
+    return V[root][:, 0]
@@ -1,8 +1,9 @@
 import torch
 import warnings
+from ._cache import _get_cached, _set_cached
 
 
-def _get_gramians(self):
+def _get_gramians(self, dtype: torch.dtype = None):
     """
     Hinweis: Dies ist eine interne Funktion
     ______________________________________________________________________
@@ -13,6 +14,12 @@ def _get_gramians(self):
     des Spaltenraums von X_t. Dann erfuellt die reduzierte Gram'sche Matrix G_t folgende Gleichung:
     X_t @ X_t.T = U_t @ G_t @ U_t.T
     ______________________________________________________________________
+    Parameter:
+    - dtype torch.dtype: Der dtype, in dem die reduzierten Gram'schen Matrizen berechnet werden. Ist dtype None, so
+                         wird der dtype der Transfertensoren von 'self' verwendet. Im mixed precision Modus werden
+                         die Gram'schen Matrizen so z.B. in torch.float64 akkumuliert, waehrend 'self' in
+                         torch.float32 gespeichert ist.
+    ______________________________________________________________________
     Output:
     (dict,): Das dict enthaelt fuer jeden Knoten des Dimensionsbaums von 'self' die zugehoerige
              reduzierte Gram'sche Matrix.
@@ -34,7 +41,15 @@ def _get_gramians(self):
         x.orthogonalize()
 
     # Gramian dict
-    G = {x.dtree.get_root(): torch.ones(1, 1)}
+    root = x.dtree.get_root()
+    if dtype is None:
+        dtype = x.B[root].dtype
+
+    # Verwende die zwischengespeicherten Gram'schen Matrizen, sofern die Kerne seither unveraendert sind
+    cached = _get_cached(x, ("gramians", dtype))
+    if cached is not None:
+        return dict(cached)
+    G = {root: torch.ones(1, 1, dtype=dtype, device=x.B[root].device)}
 
     # Traversiere den Dimensionsbaum top down beginnend bei der Wurzel
     # Berechne dabei die jeweiligen reduzierten Gram'schen Matrizen
@@ -45,9 +60,48 @@ def _get_gramians(self):
                 continue
             # Kinder von Node
             l, r = x.dtree.get_children(node)
+            # Transfertensor im Rechen-dtype (Kopie nur, falls sich der dtype unterscheidet)
+            B = x.B[node].to(dtype)
             # Kontrahiere den Transfertensor von node mit der reduzierten Gramschen'Matrix von node
-            BG = torch.tensordot(x.B[node], G[node], dims=([2], [1]))
+            BG = torch.tensordot(B, G[node], dims=([2], [1]))
             # Be
-            G[l] = torch.tensordot(x.B[node], BG, dims=([1, 2], [1, 2]))
-            G[r] = torch.tensordot(x.B[node], BG, dims=([0, 2], [0, 2]))
-    return G
+            G[l] = torch.tensordot(B, BG, dims=([1, 2], [1, 2]))
+            G[r] = torch.tensordot(B, BG, dims=([0, 2], [0, 2]))
+    return dict(_set_cached(x, ("gramians", dtype), G))
+
+
+def gramians(self, dtype: torch.dtype = None, keep_orthog: bool = False):
+    """
+    Berechnet die reduzierten Gram'schen Matrizen des hierarchischen Tuckertensors 'self', ohne 'self' zu veraendern.
+    Diese beziehen sich auf die Basen der orthogonalen Form von 'self'.
+    Die Gram'schen Matrizen werden zwischengespeichert, bis ein Kern von 'self' ersetzt oder in-place veraendert wird.
+    Wiederholte Aufrufe, z.B. bei wiederholter Multiplikation mit demselben Koeffizientenfeld mittels ele_mul, sind
+    daher guenstig. Die orthogonale Form selbst belegt so viel Speicher wie 'self' und wird nur auf Wunsch
+    (keep_orthog=True) zwischengespeichert.
+    ______________________________________________________________________
+    Parameter:
+    - dtype torch.dtype: Der dtype, in dem die reduzierten Gram'schen Matrizen berechnet werden. Ist dtype None, so
+                         wird der dtype der Transfertensoren von 'self' verwendet.
+    - keep_orthog bool: Ist keep_orthog True und 'self' nicht orthogonal, so wird die orthogonale Form
+                        zwischengespeichert und von einem anschliessenden self.orthogonalize() ohne erneute Rechnung
+                        uebernommen.
+    ______________________________________________________________________
+    Output:
+    (dict,): Das dict enthaelt fuer jeden Knoten des Dimensionsbaums von 'self' die zugehoerige
+             reduzierte Gram'sche Matrix.
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6))
+    G = x.gramians(keep_orthog=True)
+    x.orthogonalize()    # uebernimmt die zwischengespeicherte orthogonale Form
+    """
+    if not isinstance(keep_orthog, bool):
+        raise TypeError("Argument 'keep_orthog': type(keep_orthog)={} | keep_orthog ist kein bool.".format(
+            type(keep_orthog)))
+    if dtype is None:
+        dtype = self.B[self.dtree.get_root()].dtype
+    cached = _get_cached(self, ("gramians", dtype))
+    if cached is not None:
+        return dict(cached)
+    G = self._get_orthogonal(keep_orthog)._get_gramians(dtype)
+    return dict(_set_cached(self, ("gramians", dtype), G))
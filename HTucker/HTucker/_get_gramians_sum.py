@@ -1,7 +1,7 @@
 import torch
 from numpy import cumsum
 
-def _get_gramians_sum(cls, summands: list):
+def _get_gramians_sum(cls, summands: list, dtype: torch.dtype = None):
     """
     Hinweis: Dies ist eine interne Funktion.
     ______________________________________________________________________
@@ -15,6 +15,8 @@ def _get_gramians_sum(cls, summands: list):
     Parameter:
     - summands list mit HTucker.HTTensor Eintraegen: Die Summanden von deren Summe die reduzierten Gram'schen Matrizen
                                                     berechnet werden sollen.
+    - dtype torch.dtype: Der dtype, in dem die reduzierten Gram'schen Matrizen berechnet werden. Ist dtype None, so
+                         wird der dtype der Transfertensoren des ersten Summanden verwendet.
     ______________________________________________________________________
     Output:
     (dict,): Das dict enthaelt fuer jeden Knoten des Dimensionsbaums der impliziten Summe die zugehoerige
@@ -39,6 +41,16 @@ def _get_gramians_sum(cls, summands: list):
     # Referenzdimensionsbaum
     dtree = summands[0].dtree
 
+    # Rechen-dtype und device
+    root = dtree.get_root()
+    if dtype is None:
+        dtype = summands[0].B[root].dtype
+    device = summands[0].B[root].device
+
+    # Kerne der Summanden im Rechen-dtype
+    # Hinweis: .to(dtype) erzeugt nur dann eine Kopie, wenn sich der dtype tatsaechlich unterscheidet
+    B = [{node: item.B[node].to(dtype) for node in dtree.get_inner_nodes()} for item in summands]
+
     # Berechne M = U.T @ U fuer jeden Knoten
     # Sei n die Anzahl an Summanden, dann ist U.T @ U eine Matrix mit r_1+r_2+...+r_n Zeilen und Spalten
     # Damit entspricht U.T @ U einer Blockmatrix mit n^2 vielen Bloecken. Der Block (i,j) hat dabei die
@@ -50,7 +62,7 @@ def _get_gramians_sum(cls, summands: list):
 
     # Iteriere ueber alle Blattknoten
     for leaf in dtree.get_leaves():
-        U = torch.hstack(tuple(item.U[leaf] for item in summands))
+        U = torch.hstack(tuple(item.U[leaf].to(dtype) for item in summands))
         M_leaf = U.T @ U
         # cum_ranks = [0, r0, r0+r1, r0+r1+r2, ...]
         cum_ranks = cumsum([0] + [item.U[leaf].shape[1] for item in summands])
@@ -72,8 +84,8 @@ def _get_gramians_sum(cls, summands: list):
             M[node] = {}
             for i in range(len(summands)):
                 for j in range(len(summands)):
-                    M_left_times_B = torch.tensordot(M[l][j, i], summands[i].B[node], dims=([1], [0]))
-                    M_right_times_B = torch.tensordot(M[r][i, j], summands[j].B[node], dims=([1], [1]))
+                    M_left_times_B = torch.tensordot(M[l][j, i], B[i][node], dims=([1], [0]))
+                    M_right_times_B = torch.tensordot(M[r][i, j], B[j][node], dims=([1], [1]))
                     M_right_times_B = torch.movedim(M_right_times_B, source=0, destination=1)
                     M[node][i,j] = torch.tensordot(M_left_times_B, M_right_times_B, dims=([0, 1], [0, 1]))
 
@@ -81,7 +93,7 @@ def _get_gramians_sum(cls, summands: list):
     # berechnet werden
     # Das nachstehende dict speichert diese
     # Die reduzierte Gram'sche Matrix der Wurzel ist stets 1
-    G = {dtree.get_root(): torch.ones(1,1)}
+    G = {root: torch.ones(1, 1, dtype=dtype, device=device)}
     # Alle weiteren Eintrage von G sind vorerst dicts, die spaeter zu einer Matrix gemerged werden
 
     # Iteriere top-down durch den Dimensionsbaum
@@ -98,12 +110,12 @@ def _get_gramians_sum(cls, summands: list):
                     if dtree.is_root(node):
                         # Die reduzierte Gram'sche Matrix der Wurzel ist 1, weswegen die
                         # Transfertensoren B_i und B_j des Paares (i,j) direkt verrechnet werden koennen
-                        B_times_G_times_B = torch.tensordot(summands[i].B[node], summands[j].B[node],
+                        B_times_G_times_B = torch.tensordot(B[i][node], B[j][node],
                                                             dims=([2], [2]))
                     else:
-                        B_times_G = torch.tensordot(summands[i].B[node], G[node][j, i],
+                        B_times_G = torch.tensordot(B[i][node], G[node][j, i],
                                                     dims=([2], [1]))
-                        B_times_G_times_B = torch.tensordot(B_times_G, summands[j].B[node],
+                        B_times_G_times_B = torch.tensordot(B_times_G, B[j][node],
                                                             dims=([2], [2]))
                     G[l][i,j] = torch.tensordot(B_times_G_times_B, M[r][i,j],
                                                 dims=([1, 3], [0, 1]))
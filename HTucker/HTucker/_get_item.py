@@ -1,4 +1,4 @@
-from copy import deepcopy
+from ._tensordot import _shallow_copy
 
 
 def get(self, key: int | slice | tuple):
@@ -46,9 +46,11 @@ def get(self, key: int | slice | tuple):
 def get_from_slice(self, key):
     if not isinstance(key, slice):
         raise TypeError("Argument 'key': type(key)={} | key ist kein slice Objekt.".format(type(key)))
-    z = deepcopy(self)
+    z = _shallow_copy(self)
     # Es werden nur die in key definierten Zeilen behalten
     z.U[(0,)] = z.U[(0,)][key, :]
+    # Lediglich die Blattmatrix der 0-ten Dimension ist nicht mehr orthonormal
+    z._dirty.add((0,))
     # Entfernen der Singletondimension, falls vorhanden
     if z.U[(0,)].shape[0] == 1:
         z = z.squeeze()
@@ -62,9 +64,10 @@ def get_from_int(self, key):
     if key not in range(shape[0]):
         raise ValueError("Argument 'key': key={} ist kein gueltiger Index fuer eine Dimension der Groesse {}."
                          .format(key, shape[0]))
-    z = deepcopy(self)
+    z = _shallow_copy(self)
     # Es wird nur die key-te Zeile der Blattmatrix der 0-ten Dimension beibehalten
     z.U[(0,)] = z.U[(0,)][key, :].reshape(1, -1)
+    z._dirty.add((0,))
     # Entfernen der Singletondimension
     z = z.squeeze()
     return z
@@ -73,8 +76,8 @@ def get_from_int(self, key):
 def get_from_tuple(self, key):
     if not isinstance(key, tuple):
         raise TypeError("Argument 'key': type(key)={} | key ist kein tuple.".format(type(key)))
-    shape = self.get_shape()
-    z = deepcopy(self)
+    # Flache Kopie, lediglich die Blattmatrizen der indizierten Dimensionen werden ersetzt
+    z = _shallow_copy(self)
     # Iteriere ueber Tupeleintraege
     for counter, idx in enumerate(key):
         if isinstance(idx, int):
@@ -83,6 +86,8 @@ def get_from_tuple(self, key):
             z.U[(counter,)] = z.U[(counter,)][idx, :]
         else:
             raise TypeError("Argument 'key': key enthaelt ungueltige Eintraege, die weder vom Typ int noch slice sind.")
+        # Lediglich die Blattmatrizen der indizierten Dimensionen sind nicht mehr orthonormal
+        z._dirty.add((counter,))
     if any(mat.shape[0] == 1 for mat in z.U.values()):
         # Entferne Singleton Dimensionen falls vorhanden
         z = z.squeeze()
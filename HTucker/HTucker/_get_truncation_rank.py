@@ -33,17 +33,20 @@ def _get_truncation_rank(cls, sv: torch.Tensor, opts: dict):
     rtol = opts["err_tol_rel"] if "err_tol_rel" in opts else None
     max_rank = opts["max_rank"] if "max_rank" in opts else None
     # compute cumsum
-    cum_sv = torch.cat([torch.sqrt(torch.cumsum(sv.flip(dims=(0,))**2,dim=0)).flip(dims=(0,)), torch.zeros(1)])
+    # Hinweis: Alle Hilfstensoren uebernehmen dtype und device von sv
+    cum_sv = torch.cat([torch.sqrt(torch.cumsum(sv.flip(dims=(0,))**2,dim=0)).flip(dims=(0,)),
+                        torch.zeros(1, dtype=sv.dtype, device=sv.device)])
     # compute rank_a
     if atol:
-        rank_a = torch.max((cum_sv <= atol).nonzero()[0,0], torch.tensor(1))
+        rank_a = torch.max((cum_sv <= atol).nonzero()[0,0], torch.tensor(1, device=sv.device))
     else:
-        rank_a = torch.tensor(1)
+        rank_a = torch.tensor(1, device=sv.device)
     # compute rank_r
     if rtol:
-        rank_r = torch.max((cum_sv <= rtol*torch.linalg.norm(sv.type(torch.float))).nonzero()[0,0], torch.tensor(1))
+        rank_r = torch.max((cum_sv <= rtol*torch.linalg.norm(sv)).nonzero()[0,0],
+                           torch.tensor(1, device=sv.device))
     else:
-        rank_r = torch.tensor(1)
+        rank_r = torch.tensor(1, device=sv.device)
     rank = torch.max(rank_r, rank_a)
     if max_rank:
         if rank > max_rank:
@@ -51,3 +54,149 @@ def _get_truncation_rank(cls, sv: torch.Tensor, opts: dict):
             rank = max_rank
     return rank
 
+
+
+def _get_truncation_ranks_global(cls, svs: dict, opts: dict):
+    """
+    Hinweis: Dies ist eine innere Funktion der Funktion truncate_htt.
+    ______________________________________________________________________
+    Berechnet auf Grundlage der Singulaerwerte aller Knoten die hierarchischen Raenge, die die Constraints aus 'opts'
+    global einhalten. Anstatt die Fehlertoleranz gleichmaessig auf die Knoten aufzuteilen, wird das quadrierte
+    Fehlerbudget err^2 >= sum_t sum_{i > rank_t} sv_t[i]^2 gierig verteilt: Ueber alle Knoten hinweg werden stets die
+    kleinsten noch verbliebenen Singulaerwerte verworfen, solange das Budget reicht. Da jeder verworfene Singulaerwert
+    den Rang um genau eins verringert, ist die Summe der Raenge damit minimal.
+    Ein durch "max_rank" erzwungenes Verwerfen wird zuerst vom Budget abgezogen.
+    ______________________________________________________________________
+    Parameter:
+    - svs dict: Das dict enthaelt fuer jeden zu kuerzenden Knoten die absteigend sortierten Singulaerwerte als
+                1D-torch.Tensor.
+    - opts dict: Das Optionen-dict (siehe _get_truncation_rank). Die Fehlertoleranzen beziehen sich hier auf den
+                 globalen Fehler und werden nicht auf die Knoten aufgeteilt.
+    ______________________________________________________________________
+    Output:
+    (dict,): Das dict enthaelt fuer jeden Knoten aus 'svs' den berechneten Rang als integer.
+    ______________________________________________________________________
+    """
+    if not isinstance(svs, dict):
+        raise TypeError("Argument 'svs': type(svs)={} | svs ist kein dict.".format(type(svs)))
+    cls._check_opts(opts)
+    atol = opts["err_tol_abs"] if "err_tol_abs" in opts else None
+    rtol = opts["err_tol_rel"] if "err_tol_rel" in opts else None
+    max_rank = opts["max_rank"] if "max_rank" in opts else None
+    nodes = list(svs.keys())
+    ref = svs[nodes[0]]
+
+    # Quadriertes Fehlerbudget
+    # Hinweis: Fuer orthogonale hierarchische Tuckertensoren stimmt die Norm der Singulaerwerte an allen Knoten mit der
+    #          Norm des Tensors ueberein
+    budget = float("inf") if atol or rtol else 0.0
+    if atol:
+        budget = min(budget, atol ** 2)
+    if rtol:
+        budget = min(budget, float(rtol * torch.linalg.norm(ref)) ** 2)
+
+    # Durch max_rank erzwungene Kuerzung
+    ranks = {node: min(len(svs[node]), max_rank) if max_rank else len(svs[node]) for node in nodes}
+    spent = sum(float(torch.sum(svs[node][ranks[node]:] ** 2)) for node in nodes)
+    if spent > budget and (atol or rtol):
+        warn("Requested greater truncation rank than allowed -> Error boundary potentially broken.")
+
+    # Kandidaten: alle verbliebenen Singulaerwerte ausser dem jeweils ersten (Rang >= 1)
+    cand = [svs[node][1:ranks[node]].to(ref.dtype) ** 2 for node in nodes]
+    owner = torch.cat([torch.full((len(c),), i, dtype=torch.long) for i, c in enumerate(cand)])
+    cand = torch.cat(cand).cpu()
+    if len(cand) == 0 or spent >= budget:
+        return ranks
+    # Verwerfe die kleinsten Kandidaten, solange das verbliebene Budget reicht
+    # Hinweis: Da die Kandidaten eines Knotens aufsteigend zum Ende hin verworfen werden, genuegt deren Anzahl pro
+    #          Knoten
+    order = torch.argsort(cand)
+    nr_dropped = int(torch.sum(torch.cumsum(cand[order], dim=0) <= budget - spent))
+    dropped = torch.bincount(owner[order[:nr_dropped]], minlength=len(nodes))
+    return {node: ranks[node] - int(dropped[i]) for i, node in enumerate(nodes)}
+
+
+def _get_nr_params(dtree, sizes: dict, ranks: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Berechnet die Anzahl der Eintraege aller Blattmatrizen (n_t x r_t) und Transfertensoren (r_l x r_r x r_t) eines
+    hierarchischen Tuckertensors mit Dimensionsbaum 'dtree', Blattgroessen 'sizes' und Raengen 'ranks'. Dies entspricht
+    der Berechnung von HTTensor.nbytes geteilt durch die Groesse eines Eintrags.
+    """
+    nr_params = 0
+    for node in dtree.get_nodes():
+        if dtree.is_leaf(node):
+            nr_params += sizes[node] * ranks[node]
+        else:
+            l, r = dtree.get_children(node)
+            nr_params += ranks[l] * ranks[r] * ranks[node]
+    return nr_params
+
+
+def _fit_ranks_to_budget(cls, svs: dict, ranks: dict, dtree, sizes: dict, max_params: int):
+    """
+    Hinweis: Dies ist eine innere Funktion der Funktion truncate_htt.
+    ______________________________________________________________________
+    Verringert die Raenge 'ranks' gierig, bis die Anzahl der Eintraege aller Kerne hoechstens 'max_params' betraegt.
+    Dabei wird stets der Rang des Knotens verringert, dessen zuletzt beibehaltener Singulaerwert pro eingespartem
+    Eintrag den geringsten zusaetzlichen quadrierten Fehler verursacht. Die Einsparung haengt von den Raengen der
+    Nachbarknoten ab und wird daher in jedem Schritt neu berechnet.
+    ______________________________________________________________________
+    Parameter:
+    - svs dict: Das dict enthaelt fuer jeden zu kuerzenden Knoten die absteigend sortierten Singulaerwerte als
+                1D-torch.Tensor.
+    - ranks dict: Die Ausgangsraenge der Knoten aus 'svs'.
+    - dtree HTucker.dimtree: Der Dimensionsbaum.
+    - sizes dict: Das dict enthaelt fuer jedes Blatt die Groesse der zugehoerigen Dimension.
+    - max_params int: Die maximale Anzahl an Eintraegen.
+    ______________________________________________________________________
+    Output:
+    (dict,): Das dict enthaelt fuer jeden Knoten aus 'svs' den berechneten Rang als integer.
+    ______________________________________________________________________
+    """
+    ranks = dict(ranks)
+    ranks[dtree.get_root()] = 1
+    sv2 = {node: (sv.double() ** 2).tolist() for node, sv in svs.items()}
+    nr_params = _get_nr_params(dtree, sizes, ranks)
+    # Nachbarschaft der Knoten: Elternknoten, Geschwisterknoten und Kinder
+    parent, sibling = {}, {}
+    for node, children in dtree.nodes.items():
+        for i, child in enumerate(children):
+            parent[child], sibling[child] = node, children[1 - i]
+
+    def saving(node):
+        # Einsparung bei Verringerung des Rangs von node um eins
+        s = ranks[sibling[node]] * ranks[parent[node]]
+        if len(dtree.nodes[node]) == 0:
+            return s + sizes[node]
+        l, r = dtree.nodes[node]
+        return s + ranks[l] * ranks[r]
+
+    while nr_params > max_params:
+        candidates = [(sv2[node][ranks[node] - 1] / saving(node), node) for node in svs if ranks[node] > 1]
+        if len(candidates) == 0:
+            warn("Requested storage budget cannot be met -> All hierarchical ranks truncated to 1.")
+            break
+        _, node = min(candidates)
+        nr_params -= saving(node)
+        ranks[node] -= 1
+    del ranks[dtree.get_root()]
+    return ranks
+
+
+def _split_storage_opts(opts: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktionen truncate und truncate_sum.
+    Teilt 'opts' in die Optionen der eigentlichen Kuerzung und die Speicherbudget-Optionen ("max_nbytes",
+    "max_params"), die anschliessend mittels truncate_htt durchgesetzt werden. Enthaelt 'opts' ausser dem Speicherbudget
+    keine Constraints, so ist der erste Eintrag None (exakte Berechnung). Enthaelt 'opts' kein Speicherbudget, so ist
+    der zweite Eintrag None.
+    """
+    storage_keys = ("max_nbytes", "max_params")
+    if opts is None or not any(k in opts for k in storage_keys):
+        return opts, None
+    storage_opts = {k: v for k, v in opts.items() if k in storage_keys + ("mixed_precision",)}
+    opts = {k: v for k, v in opts.items() if k not in storage_keys}
+    if not any(k in opts for k in ("max_rank", "err_tol_abs", "err_tol_rel")):
+        opts = None
+    return opts, storage_opts
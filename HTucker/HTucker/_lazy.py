@@ -0,0 +1,38 @@
+# Globaler Lazy-Modus der Operatoren "+", "-" und "*" von HTTensor
+# Ist dieser aktiv, so bauen die Operatoren einen Ausdruck (siehe HTExpression) auf, anstatt sofort auszuwerten.
+_lazy_mode = False
+
+
+def set_lazy_mode(flag: bool):
+    """
+    Aktiviert bzw. deaktiviert den globalen Lazy-Modus. Im Lazy-Modus liefern die Operatoren "+", "-" und "*" von
+    HTTensor einen Ausdruck (HTucker.HTExpression), der erst beim Kuerzen mittels "%" oder beim Aufruf von
+    HTExpression.evaluate ausgewertet wird. Linearkombinationen werden dabei zu einem einzigen Aufruf von
+    HTTensor.truncate_sum zusammengefasst.
+    Hinweis: Die Methoden plus, minus und scalar_mul werten stets sofort aus.
+    ______________________________________________________________________
+    Parameter:
+    - flag bool: True aktiviert, False deaktiviert den Lazy-Modus.
+    ______________________________________________________________________
+    Output:
+    None
+    ______________________________________________________________________
+    Beispiel:
+    HTTensor.set_lazy_mode(True)
+    z = ((a + b) - c * 2.0) % {"err_tol_rel": 1e-6}    # ein einziger Aufruf von truncate_sum
+    HTTensor.set_lazy_mode(False)
+    """
+    global _lazy_mode
+    if not isinstance(flag, bool):
+        raise TypeError("Argument 'flag': type(flag)={} | flag ist kein bool.".format(type(flag)))
+    _lazy_mode = flag
+
+
+def get_lazy_mode():
+    """
+    Gibt zurueck, ob der globale Lazy-Modus aktiv ist.
+    ______________________________________________________________________
+    Output:
+    (bool,): True, falls der Lazy-Modus aktiv ist. Ansonsten False.
+    """
+    return _lazy_mode
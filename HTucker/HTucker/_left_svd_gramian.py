@@ -1,20 +1,33 @@
 import torch
 
+# Schwellwerte fuer die partielle Spektralzerlegung (siehe _truncated_left_svd_gramian)
+# Die partielle Zerlegung wird nur fuer Gram'sche Matrizen mit mindestens _PARTIAL_MIN_SIZE Zeilen verwendet, sofern
+# hoechstens der Anteil _PARTIAL_MAX_RATIO der Singulaervektoren benoetigt wird
+_PARTIAL_MIN_SIZE = 128
+_PARTIAL_MAX_RATIO = 0.25
+# Ueberabtastung und Anzahl der Potenziterationen der randomisierten Unterraumiteration
+_OVERSAMPLING = 10
+_POWER_ITERATIONS = 4
 
-def left_svd_gramian(x: torch.Tensor):
+
+def left_svd_gramian(x: torch.Tensor, k: int = None):
     """
     Berechnet die linken Singulaervektoren samt Singulaerwerte einer Matrix
     v ueber ihre Gram-Matrix x=v@v.T
+    Ist 'k' gegeben, so werden lediglich die k groessten Singulaerwerte samt Singulaervektoren mittels randomisierter
+    Unterraumiteration berechnet. Der Aufwand betraegt dann O(n^2 k) statt O(n^3).
     ______________________________________________________________________
     Parameter:
     - x 2D torch.Tensor
+    - k int | None: Die Anzahl der zu berechnenden Singulaerwerte. Ist k None, so werden alle berechnet.
     ______________________________________________________________________
     Output:
     (2D torch.Tensor, 1D torch.Tensor): Der erste Eintrag entspricht den linken Singulaervektoren, waehred der zweite
                                         Eintrag den zugehoerigen Singulaerwerten entspricht. Das Tupel ist bezogen
                                         auf die Singulaerwerte in absteigender Reihenfolge sortiert.
     """
-
+    if k is not None and k < x.shape[0]:
+        return _left_svd_gramian_topk(x, k)
 
     ## Spektralzerlegung
     eig_val, Q = torch.linalg.eigh(x)
@@ -24,3 +37,51 @@ def left_svd_gramian(x: torch.Tensor):
     desc_idc = torch.argsort(s_val, dim=0, descending=True)
     return Q[:, desc_idc], s_val[desc_idc]
 
+
+def _left_svd_gramian_topk(x: torch.Tensor, k: int):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion left_svd_gramian.
+    Berechnet die k groessten Singulaerwerte samt linker Singulaervektoren ueber die Gram-Matrix 'x' mittels
+    randomisierter Unterraumiteration und anschliessender Rayleigh-Ritz Projektion.
+    Hinweis: Der Startunterraum wird mit festem Seed gezogen, sodass das Ergebnis reproduzierbar ist.
+    """
+    n = x.shape[0]
+    p = min(n, k + _OVERSAMPLING)
+    generator = torch.Generator().manual_seed(0)
+    Y = x @ torch.randn(n, p, generator=generator, dtype=x.dtype).to(x.device)
+    for _ in range(_POWER_ITERATIONS):
+        Y, _ = torch.linalg.qr(Y, mode="reduced")
+        Y = x @ Y
+    Y, _ = torch.linalg.qr(Y, mode="reduced")
+    # Rayleigh-Ritz: Spektralzerlegung der auf den Unterraum projizierten Gram-Matrix
+    eig_val, V = torch.linalg.eigh(Y.T @ x @ Y)
+    s_val = torch.sqrt(torch.abs(eig_val))
+    desc_idc = torch.argsort(s_val, dim=0, descending=True)[:k]
+    return Y @ V[:, desc_idc], s_val[desc_idc]
+
+
+def _truncated_left_svd_gramian(cls, x: torch.Tensor, opts: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktionen truncate_htt und truncate_sum.
+    Berechnet die fuer die Rangkuerzung entsprechend 'opts' benoetigten linken Singulaervektoren ueber die Gram-Matrix
+    'x' samt Kuerzungsrang. Ist der durch "max_rank" beschraenkte Rang klein im Vergleich zur Groesse von 'x', so
+    werden lediglich die "max_rank" groessten Singulaerwerte partiell berechnet. Die Energie des restlichen Spektrums
+    ergibt sich dann aus der Spur von 'x' und wird als zusaetzlicher letzter Singulaerwert angehaengt. Damit bleiben die
+    Fehlertoleranzen exakt pruefbar: Fuer die berechnete Basis Q_r gilt trace(x) - sum_{i<=r} sv[i]^2 =
+    trace(x) - trace(Q_r.T @ x @ Q_r), was genau dem Kuerzungsfehler bzgl. Q_r entspricht.
+    Ohne "max_rank" (reine Toleranzkuerzung) wird die volle Spektralzerlegung verwendet.
+    ______________________________________________________________________
+    Output:
+    (2D torch.Tensor, 1D torch.Tensor, int, int): Die linken Singulaervektoren, die Singulaerwerte (ggf. samt
+                                                  Restenergie), der Kuerzungsrang und der Rang vor der Kuerzung.
+    """
+    max_rank = opts["max_rank"] if "max_rank" in opts else None
+    n = x.shape[0]
+    if max_rank is None or n < _PARTIAL_MIN_SIZE or max_rank > _PARTIAL_MAX_RATIO * n:
+        Q, sv = cls.left_svd_gramian(x)
+        return Q, sv, cls._get_truncation_rank(sv, opts), len(sv)
+    Q, sv = cls.left_svd_gramian(x, k=max_rank)
+    # Energie des nicht berechneten Spektrums
+    residual = torch.sqrt(torch.clamp(torch.trace(x) - torch.sum(sv ** 2), min=0)).reshape(1)
+    sv = torch.cat([sv, residual])
+    return Q, sv, cls._get_truncation_rank(sv, opts), n
@@ -1,11 +1,13 @@
 import torch
+from ._tall_qr import tall_qr
 
-def left_svd_qr(x: torch.Tensor):
+def left_svd_qr(x: torch.Tensor, method: str = "householder"):
     """
     Berechnet die linken Singulaervektoren samt Singulaerwerte der Matrix 'x'.
     ______________________________________________________________________
     Parameter:
     x 2D torch.Tensor
+    method str: Das QR Verfahren fuer die vorgeschaltete QR Zerlegung (siehe HTTensor.tall_qr)
     ______________________________________________________________________
     Output:
     (2D torch.Tensor, 1D torch.Tensor): Der erste Eintrag entspricht den linken Singulaervektoren, waehred der zweite
@@ -19,10 +21,13 @@ def left_svd_qr(x: torch.Tensor):
         raise ValueError("Argument 'x': x.shape={} | x ist kein 2D-torch.Tensor.".format(x.shape))
 
     if x.shape[0] > x.shape[1]:
-        q, r = torch.linalg.qr(x, mode="reduced")
+        q, r = tall_qr(x, method=method)
         u, s, _ = torch.linalg.svd(r, full_matrices=False)
         u = q @ u
     else:
-        _, r = torch.linalg.qr(x.T, mode="r")
+        if method == "householder":
+            _, r = torch.linalg.qr(x.T, mode="r")
+        else:
+            _, r = tall_qr(x.T, method=method)
         u, s, _ = torch.linalg.svd(r.T, full_matrices=False)
     return u, s
\ No newline at end of file
@@ -49,6 +49,6 @@ def mode_mul(self, A: torch.Tensor, dim: int):
     # Multipliziere A mit der Blattmatrix des Knotens, der die Dimension dim repraesentiert
     node = (dim,)
     x.U[node] = torch.tensordot(A, x.U[node], dims=([1], [0]))
-    # Setze is_orthog Flag auf False
-    x.is_orthog = False
+    # Lediglich die Blattmatrix des Knotens ist nicht mehr orthonormal
+    x._dirty.add(node)
     return x
@@ -21,6 +21,9 @@ def nbytes(self):
 
     (Die Byteanzahl ist in Beispiel a) groesser, da dort als in b) keine Rangkuerzung vorgenommen wird)
     """
+    if self.is_packed():
+        # Alle Kerne liegen in einer gemeinsamen Arena
+        return self._arena.numel() * self._arena.element_size()
     mem = 0
     for matrix in self.U.values():
         mem += matrix.numel() * matrix.element_size()
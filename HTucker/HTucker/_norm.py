@@ -0,0 +1,24 @@
+import torch
+from ._cache import _get_cached, _set_cached
+
+
+def norm(self):
+    """
+    Berechnet die Frobeniusnorm des hierarchischen Tuckertensors 'self', ohne 'self' zu veraendern. Diese entspricht
+    der Norm des Transfertensors der Wurzel der orthogonalen Form von 'self'.
+    Die Norm wird zwischengespeichert, bis ein Kern von 'self' ersetzt oder in-place veraendert wird. Die hierfuer
+    ggf. berechnete orthogonale Form wird hingegen nicht aufbewahrt.
+    ______________________________________________________________________
+    Output:
+    (torch.Tensor,): Die Norm als 0D torch.Tensor.
+    ______________________________________________________________________
+    Beispiel:
+                  HTucker.HTTensor             <~~~>            torch.Tensor
+    x = HTTensor.randn((3,4,5,6))              |           x = torch.randn(3,4,5,6)
+    x.norm()                                   |           torch.linalg.norm(x)
+    """
+    cached = _get_cached(self, "norm")
+    if cached is not None:
+        return cached
+    x = self._get_orthogonal()
+    return _set_cached(self, "norm", torch.linalg.norm(x.B[x.dtree.get_root()]))
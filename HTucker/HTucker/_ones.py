@@ -0,0 +1,24 @@
+import torch
+
+
+def ones(cls, shape: tuple, dtype: torch.dtype = None, device: torch.device = None):
+    """
+    Erzeugt den hierarchischen Tuckertensor, dessen Eintraege alle 1 sind, exakt mit Rang 1 auf dem kanonischen
+    Dimensionsbaum.
+    ______________________________________________________________________
+    Parameter:
+    - shape (int,...): Die Dimensionsgroessen. Es werden mindestens zwei Dimensionen benoetigt.
+    - dtype torch.dtype: Der dtype der Blattmatrizen und Transfertensoren. Ist dtype None, so wird der torch default
+            dtype verwendet.
+    - device torch.device: Das device der Blattmatrizen und Transfertensoren.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der hierarchische Tuckertensor.
+    ______________________________________________________________________
+    Beispiel:
+                      HTucker.HTTensor         <~~~>          torch.Tensor
+    x = HTTensor.ones((3,4,5))                 |           x = torch.ones(3,4,5)
+    """
+    if not isinstance(shape, (tuple, list)) or not all(isinstance(n, int) and n > 0 for n in shape):
+        raise TypeError("Argument 'shape': shape={} | shape ist kein Tupel positiver integer.".format(shape))
+    return cls.outer([torch.ones(n, dtype=dtype, device=device) for n in shape])
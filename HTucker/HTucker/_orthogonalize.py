@@ -1,12 +1,21 @@
 import torch
-from copy import deepcopy
+from ._cache import _get_cached, _set_cached, _evict_stale
+from ._tensordot import _shallow_copy
+from ._tall_qr import _QR_METHODS
 
-def orthogonalize(self):
+def orthogonalize(self, method: str = "householder"):
     """
     Orthogonalisiert den hierarchischen Tuckertensor 'self', wenn dieser noch nicht orthogonal ist.
 
     Ein hierarchischer Tuckertensor wird orthogonal genannt, wenn die Spaltenraumbasen eines jeden Knotens orthogonal
     sind.
+    Die Orthogonalitaet wird pro Knoten verfolgt. Lokale Operationen wie mode_mul oder das Slicing einer Dimension
+    markieren nur die veraenderten Blattmatrizen, sodass lediglich diese sowie die Transfertensoren auf ihren Pfaden zur
+    Wurzel neu orthogonalisiert werden. Dies erfordert O(Tiefe) statt O(Knotenanzahl) QR Zerlegungen.
+    ______________________________________________________________________
+    Parameter:
+    - method str: Das QR Verfahren fuer die Blattmatrizen und Transfertensoren (siehe HTTensor.tall_qr). Fuer sehr hohe
+                  Blattmatrizen sind "cholesky" (CholeskyQR2) bzw. "tsqr" deutlich schneller als "householder".
     ______________________________________________________________________
     Output:
     None
@@ -15,22 +24,40 @@ def orthogonalize(self):
     x = HTTensor.randn((3,4,5,6))
     x.orthogonalize()
     """
+    if method not in _QR_METHODS:
+        raise ValueError("Argument 'method': method={} | method ist keines der Verfahren {}.".format(method,
+                                                                                                    _QR_METHODS))
 
     if self.is_orthog:
         # self ist bereits orthogonal, entsprechend kann direkt der neue HTucker Tensor
         # returned werden
         return self
 
+    # Uebernehme die zwischengespeicherte orthogonale Form samt deren gueltigen Eintraegen, sofern vorhanden
+    # (siehe HTTensor._get_orthogonal)
+    form = _get_cached(self, "orthog")
+    if form is not None:
+        self.U, self.B, self.is_orthog = dict(form.U), dict(form.B), True
+        self._cache = {}
+        for key in list(form._cache):
+            value = _get_cached(form, key)
+            if value is not None:
+                _set_cached(self, key, value)
+        return self
+
     # Lesbarkeit
     x = self
 
     # Dict fuer die R Matrizen der QR-Zerlegungen
+    # Hinweis: Es werden nur als nicht-orthonormal markierte Knoten (x._dirty) sowie deren Pfade zur Wurzel
+    #          orthogonalisiert. Fehlt R[t], so ist die Basis von t bereits orthonormal (R[t] entspricht der Identitaet)
     R = {}
 
-    # Orthogonalisieren der Blattmatrizen
+    # Orthogonalisieren der markierten Blattmatrizen
     for leaf in x.dtree.get_leaves():
-        # torch.linalg.qr gibt ein Tupel (Q,R) zurueck
-            x.U[leaf], R[leaf] = torch.linalg.qr(x.U[leaf], mode="reduced")
+        if leaf in x._dirty:
+            # tall_qr gibt ein Tupel (Q,R) zurueck
+            x.U[leaf], R[leaf] = x.tall_qr(x.U[leaf], method=method)
 
     # Orthogonalisieren der Transfertensoren
     # Iteriere den Dimensionsbaum dazu bottom-up
@@ -41,20 +68,46 @@ def orthogonalize(self):
                 continue
             # Kinder von node
             l, r = x.dtree.get_children(node)
+            if l not in R and r not in R and node not in x._dirty:
+                # Weder node noch ein Knoten seines Subtrees wurde veraendert
+                continue
             # Multipliziere R[l] und R[r] in den Transfertensor B[node]
-            x.B[node] = torch.tensordot(R[r], x.B[node], dims=([1], [1]))
-            x.B[node] = torch.tensordot(R[l], x.B[node], dims=([1], [1]))
+            if r in R:
+                x.B[node] = torch.tensordot(R.pop(r), x.B[node], dims=([1], [1]))
+                x.B[node] = torch.movedim(x.B[node], source=0, destination=1)
+            if l in R:
+                x.B[node] = torch.tensordot(R.pop(l), x.B[node], dims=([1], [0]))
             if not x.dtree.is_root(node):
                 # Der Transfertensor der Wurzel muss nicht mehr orthogonalisiert werden
                 # Daher wird dieser Abschnitt nur dann durchgefuehrt, falls node ungleich der Wurzel ist
                 # Berechne also die QR Zerlegung der Matrizierung des geupdateten Transfertensors
-                x.B[node], R[node] = torch.linalg.qr(self.matricise(x.B[node], t=(0, 1)), mode="reduced")
+                shape = x.B[node].shape
+                Q, R[node] = x.tall_qr(self.matricise(x.B[node], t=(0, 1)), method=method)
                 # Dematriziere den orthogonalisierten Transfertensor wieder zu 3D
-                x.B[node] = self.dematricise(x.B[node],
-                                                      shape=(R[l].shape[0], R[r].shape[0], x.B[node].shape[1]), t=(0, 1))
-            # Gebe Speicher den Speicher der R-Matrizen der Kinder frei
-            del R[l]
-            del R[r]
+                x.B[node] = self.dematricise(Q, shape=(shape[0], shape[1], Q.shape[1]), t=(0, 1))
     # Setze die Flag, dass self ein orthogonaler HTucker Tensor ist
     x.is_orthog = True
+    # Eintraege, die sich auf die ersetzten Kerne beziehen, werden sofort verworfen
+    _evict_stale(x)
     return x
+
+
+def _get_orthogonal(self, keep: bool = False):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Gibt die orthogonale Form des hierarchischen Tuckertensors 'self' zurueck, ohne 'self' zu veraendern. Ist 'self'
+    bereits orthogonal, so ist dies 'self' selbst. Ansonsten wird eine orthogonalisierte flache Kopie berechnet.
+    Diese belegt so viel Speicher wie 'self' und wird daher nur fuer keep=True zwischengespeichert, solange die Kerne
+    von 'self' unveraendert bleiben. Ein anschliessendes self.orthogonalize() uebernimmt sie ohne erneute Rechnung.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Die orthogonale Form.
+    """
+    if self.is_orthog:
+        return self
+    form = _get_cached(self, "orthog")
+    if form is None:
+        form = _shallow_copy(self).orthogonalize()
+        if keep:
+            _set_cached(self, "orthog", form)
+    return form
@@ -0,0 +1,61 @@
+import torch
+from .dimtree import dimtree
+
+
+def outer(cls, vectors: list):
+    """
+    Erzeugt das aeussere Produkt v_0 x v_1 x ... x v_{d-1} der Vektoren aus 'vectors' als hierarchischen Tuckertensor
+    vom Rang 1 auf dem kanonischen Dimensionsbaum, ohne den vollen Tensor zu berechnen. Die Blattmatrizen sind die
+    normierten Vektoren, das Produkt der Normen steht im Transfertensor der Wurzel. Das Ergebnis ist orthogonal.
+    ______________________________________________________________________
+    Parameter:
+    - vectors [1D torch.Tensor,...]: Mindestens zwei Vektoren mit uebereinstimmendem dtype und device.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Das aeussere Produkt mit shape (len(v_0), ..., len(v_{d-1})).
+    ______________________________________________________________________
+    Beispiel:
+                      HTucker.HTTensor         <~~~>          torch.Tensor
+    a, b, c = torch.randn(3), torch.randn(4), torch.randn(5)
+    x = HTTensor.outer([a, b, c])              |           x = torch.einsum("i,j,k->ijk", a, b, c)
+    """
+    _check_vectors(vectors, "vectors")
+    dtree = dimtree.get_canonic_dimtree(len(vectors))
+    U, scale = {}, 1.0
+    for leaf in dtree.get_leaves():
+        v = vectors[leaf[0]]
+        norm = torch.linalg.norm(v)
+        if norm > 0:
+            U[leaf] = (v / norm).reshape(-1, 1)
+        else:
+            # Fuer den Nullvektor wird ein beliebiger Einheitsvektor gewaehlt, der Faktor 0 steht in der Wurzel
+            U[leaf] = torch.zeros(v.shape[0], 1, dtype=v.dtype, device=v.device)
+            U[leaf][0, 0] = 1.0
+        scale = scale * norm
+    dtype, device = vectors[0].dtype, vectors[0].device
+    B = {node: torch.ones(1, 1, 1, dtype=dtype, device=device) for node in dtree.get_nodes()
+         if not dtree.is_leaf(node)}
+    B[dtree.get_root()] = B[dtree.get_root()] * scale
+    return cls._new(U=U, B=B, dtree=dtree, is_orthog=True)
+
+
+def _check_vectors(vectors: list, name: str):
+    """
+    Hinweis: Dies ist eine interne Funktion der analytischen Konstruktoren (outer, sum_of_univariate).
+    Prueft, ob 'vectors' eine Liste von mindestens zwei nicht-leeren 1D torch.Tensoren mit uebereinstimmendem dtype
+    und device ist.
+    """
+    if not isinstance(vectors, (list, tuple)):
+        raise TypeError("Argument '{}': type({})={} | {} ist keine list.".format(name, name, type(vectors), name))
+    if len(vectors) < 2:
+        raise ValueError("Argument '{}': len({})={} | Ein HTucker Tensor ist stets von Ordnung >= 2.".format(
+            name, name, len(vectors)))
+    for v in vectors:
+        if not isinstance(v, torch.Tensor):
+            raise TypeError("Argument '{}': {} enthaelt Elemente, die keine torch.Tensoren sind.".format(name, name))
+        if v.dim() != 1 or v.shape[0] == 0:
+            raise ValueError("Argument '{}': {} enthaelt einen Tensor mit shape {}, der kein nicht-leerer 1D Tensor"
+                             " ist.".format(name, name, v.shape))
+    if any(v.dtype != vectors[0].dtype or v.device != vectors[0].device for v in vectors):
+        raise ValueError("Argument '{}': Die Tensoren in {} stimmen in dtype oder device nicht ueberein.".format(name,
+                                                                                                                name))
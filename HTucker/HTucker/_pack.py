@@ -0,0 +1,92 @@
+import torch
+from math import prod
+
+
+def pack(self):
+    """
+    Legt alle Blattmatrizen und Transfertensoren des hierarchischen Tuckertensors 'self' in einem einzigen
+    zusammenhaengenden Speicherbereich (Arena) ab. Die Kerne sind danach Sichten auf diese Arena, deren Lage durch eine
+    Offsettabelle (Knoten -> Offset) beschrieben wird.
+    Ein gepackter hierarchischer Tuckertensor benoetigt damit nur eine einzige Allokation, kann als Ganzes kopiert,
+    serialisiert oder zwischen Prozessen geteilt werden und wird bei Traversierungen cachefreundlicher durchlaufen.
+    Hinweis: - Operationen, die einzelne Kerne ersetzen, loesen diese aus der Arena. 'self' gilt dann nicht mehr als
+               gepackt (siehe HTTensor.is_packed) und kann bei Bedarf erneut gepackt werden.
+             - Alle Kerne muessen denselben dtype und dasselbe device besitzen.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): 'self' mit gepackten Kernen.
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6))
+    x.pack()
+    x.is_packed()    # is True
+    """
+    if self.is_packed():
+        return self
+    cores = list(self.U.values()) + list(self.B.values())
+    dtype, device = cores[0].dtype, cores[0].device
+    if any(core.dtype != dtype or core.device != device for core in cores):
+        raise ValueError("Die Kerne von 'self' besitzen unterschiedliche dtypes oder devices und koennen daher"
+                         " nicht in einer gemeinsamen Arena abgelegt werden.")
+    shapes = {node: core.shape for node, core in list(self.U.items()) + list(self.B.items())}
+    arena, offsets, views = _allocate_arena(shapes, dtype, device)
+    for node, view in views.items():
+        view.copy_(self.U[node] if node in self.U else self.B[node])
+    _set_arena(self, arena, offsets, views)
+    return self
+
+
+def is_packed(self):
+    """
+    Prueft, ob alle Blattmatrizen und Transfertensoren des hierarchischen Tuckertensors 'self' (noch) Sichten auf eine
+    gemeinsame Arena sind, die an den in der Offsettabelle hinterlegten Positionen liegen.
+    ______________________________________________________________________
+    Output:
+    (bool,): True, falls 'self' gepackt ist. Ansonsten False.
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6))
+    x.is_packed()    # is False
+    x.pack()
+    x.is_packed()    # is True
+    """
+    arena, offsets = self._arena, self._arena_offsets
+    if arena is None or len(offsets) != len(self.U) + len(self.B):
+        return False
+    base, itemsize = arena.data_ptr(), arena.element_size()
+    for node, core in list(self.U.items()) + list(self.B.items()):
+        if node not in offsets or core.dtype != arena.dtype or not core.is_contiguous():
+            return False
+        if core.data_ptr() != base + offsets[node] * itemsize:
+            return False
+    return True
+
+
+def _allocate_arena(shapes: dict, dtype: torch.dtype, device: torch.device):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Allokiert eine mit Nullen initialisierte Arena, die Platz fuer Kerne der in 'shapes' angegebenen Groessen bietet.
+    ______________________________________________________________________
+    Output:
+    (1D torch.Tensor, dict, dict): Die Arena, die Offsettabelle (Knoten -> Offset in Elementen) und die Sichten
+                                   (Knoten -> Kern) auf die Arena.
+    """
+    offsets = {}
+    numel = 0
+    for node, shape in shapes.items():
+        offsets[node] = numel
+        numel += prod(shape)
+    arena = torch.zeros(numel, dtype=dtype, device=device)
+    views = {node: arena[offsets[node]:offsets[node] + prod(shape)].view(shape) for node, shape in shapes.items()}
+    return arena, offsets, views
+
+
+def _set_arena(x, arena: torch.Tensor, offsets: dict, views: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Ersetzt die Kerne von 'x' durch die Sichten 'views' auf 'arena' und hinterlegt Arena samt Offsettabelle in 'x'.
+    """
+    x.U = {node: views[node] for node in x.U}
+    x.B = {node: views[node] for node in x.B}
+    x._arena = arena
+    x._arena_offsets = offsets
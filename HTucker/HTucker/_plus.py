@@ -1,5 +1,5 @@
 import torch
-from copy import deepcopy
+from ._pack import _allocate_arena, _set_arena
 
 
 def plus(self, y):
@@ -38,32 +38,44 @@ def plus(self, y):
         raise ValueError("Argument 'y': y.shape={} | Die shape von y ist nicht kompatibel zur shape von"
                          "self={}.".format(y.get_shape(), self.get_shape()))
 
-    # Erzeuge Kopien
-    x = deepcopy(self)
-    y = deepcopy(y)
-
     # Aus Lesbarkeitsgruenden
+    x = self
     rx = x.get_rank()
     ry = y.get_rank()
+    root = x.dtree.get_root()
+
+    # Die Summe entsteht durch blockweises Konkatenieren der Kerne von x und y. Alle Kerne der Summe werden dabei in
+    # einer einzigen Allokation (Arena) angelegt und die Bloecke direkt in die Sichten auf die Arena geschrieben
+    shapes = {}
+    for leaf in x.dtree.get_leaves():
+        shapes[leaf] = (x.U[leaf].shape[0], rx[leaf] + ry[leaf])
+    for node in x.dtree.get_inner_nodes():
+        l, r = x.dtree.get_children(node)
+        shapes[node] = (rx[l] + ry[l], rx[r] + ry[r], 1 if node == root else rx[node] + ry[node])
+    arena, offsets, views = _allocate_arena(shapes, torch.promote_types(x.B[root].dtype, y.B[root].dtype),
+                                            x.B[root].device)
 
     # Konkatenieren der Blattmatrizen
+    U = {}
     for leaf in x.dtree.get_leaves():
-        x.U[leaf] = torch.hstack((x.U[leaf], y.U[leaf]))
+        U[leaf] = views[leaf]
+        U[leaf][:, :rx[leaf]] = x.U[leaf]
+        U[leaf][:, rx[leaf]:] = y.U[leaf]
 
     # 3D konkatenieren der Transfertensoren
+    B = {}
     for node in x.dtree.get_inner_nodes():
         # Kinder
         l, r = x.dtree.get_children(node)
+        B[node] = views[node]
         if x.dtree.is_root(node):
-            B = torch.zeros(rx[l] + ry[l], rx[r] + ry[r], 1)
-            B[:rx[l], :rx[r]] = x.B[node]
-            B[rx[l]:, rx[r]:] = y.B[node]
+            B[node][:rx[l], :rx[r]] = x.B[node]
+            B[node][rx[l]:, rx[r]:] = y.B[node]
         else:
-            B = torch.zeros(rx[l] + ry[l], rx[r] + ry[r], rx[node] + ry[node])
-            B[:rx[l], :rx[r], :rx[node]] = x.B[node]
-            B[rx[l]:, rx[r]:, rx[node]:] = y.B[node]
-        x.B[node] = B
+            B[node][:rx[l], :rx[r], :rx[node]] = x.B[node]
+            B[node][rx[l]:, rx[r]:, rx[node]:] = y.B[node]
 
-    # Setze is_orthog Flag auf False
-    x.is_orthog = False
-    return x
+    # Die Summe ist i.A. nicht orthogonal
+    z = type(x)._new(U=U, B=B, dtree=type(x.dtree)._new(dict(x.dtree.nodes)), is_orthog=False)
+    _set_arena(z, arena, offsets, views)
+    return z
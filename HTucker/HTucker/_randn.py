@@ -2,7 +2,7 @@ import torch
 from .dimtree import dimtree
 
 
-def randn(cls, shape: tuple, rank: dict = None, is_orthog: bool = False):
+def randn(cls, shape: tuple, rank: dict = None, is_orthog: bool = False, dtype: torch.dtype = None):
     """
     Erzeugt einen hierarchischen Tuckertensor mit normalverteilten Eintraegen in den Blattmatrizen und Transfertensoren.
     Die Dimensionen werden hierbei als kanonischer Dimensionsbaum angeordnet.
@@ -15,6 +15,8 @@ def randn(cls, shape: tuple, rank: dict = None, is_orthog: bool = False):
             tatsaechliche hierarchische Rang niedriger ausfaellt.
             Wird dieser Parameter nicht uebergeben, werden hierarchische Raenge zufaellig zwischen 1 und 7 gewaehlt.
     - is_orthog bool: Bestimmt, ob der zu erzeugenden hierarchische Tuckertensor orthogonal sein soll oder nicht.
+    - dtype torch.dtype: Der dtype der Blattmatrizen und Transfertensoren. Ist dtype None, so wird der torch default
+            dtype verwendet.
     ______________________________________________________________________
     Beispiel:
     - HTTensor.randn(shape=(3,4,5,6))
@@ -22,6 +24,7 @@ def randn(cls, shape: tuple, rank: dict = None, is_orthog: bool = False):
     - HTTensor.randn(shape=(3,4,5,6), rank={(0,): 10, (0,1): 10}
     - HTTensor.randn(shape=(3,4,5,6), is_orthog=True)
     - HTTensor.randn(shape=(3,4,5,6), rank={(2,): 5, (3,): 10, (2,3): 7}, is_orthog=True)
+    - HTTensor.randn(shape=(3,4,5,6), dtype=torch.float64)
     """
     if rank is None:
         rank = {}
@@ -38,7 +41,7 @@ def randn(cls, shape: tuple, rank: dict = None, is_orthog: bool = False):
             k = rank[leaf]
         else:
             k = torch.randint(1, min(dim_sz+1, 8), (1,)).item()
-        U[leaf] = torch.randn(dim_sz, k)
+        U[leaf] = torch.randn(dim_sz, k, dtype=dtype)
         if is_orthog:
             U[leaf] = orthogonalize(U[leaf])
 
@@ -63,13 +66,13 @@ def randn(cls, shape: tuple, rank: dict = None, is_orthog: bool = False):
                 k = min(rank_l * rank_r, rank[node])
             else:
                 k = min(rank_l * rank_r, torch.randint(1, 8, (1,)).item())
-            B[node] = torch.randn(rank_l, rank_r, k)
+            B[node] = torch.randn(rank_l, rank_r, k, dtype=dtype)
             if is_orthog:
                 B[node] = orthogonalize(cls.matricise(B[node], t=(0, 1)))
                 B[node] = cls.dematricise(A=B[node], shape=(rank_l, rank_r, k), t=(0, 1))
 
     # Erzeuge HTucker Objekt
-    return cls(U=U, B=B, dtree=dtree, is_orthog=is_orthog)
+    return cls._new(U=U, B=B, dtree=dtree, is_orthog=is_orthog)
 
 
 def orthogonalize(A: torch.Tensor):
@@ -0,0 +1,71 @@
+import torch
+from math import sqrt
+
+# Kuerzungsbericht (siehe opts["report"])
+# Ein Kuerzungsbericht ist ein dict mit folgenden Eintraegen:
+#   - "rank_before": dict | Fuer jeden gekuerzten Knoten der Rang vor der Kuerzung
+#   - "rank_after":  dict | Fuer jeden gekuerzten Knoten der Rang nach der Kuerzung
+#   - "discarded":   dict | Fuer jeden gekuerzten Knoten die Norm der verworfenen Singulaerwerte
+#   - "error_bound": float | Die a-posteriori Fehlerschranke sqrt(sum_t discarded[t]^2) fuer ||x - x_trunc||
+#   - "norm":        float | Die Norm des ungekuerzten Tensors
+#   - "err_tol":     float | None | Die angeforderte absolute Fehlertoleranz min(err_tol_abs, err_tol_rel * norm)
+#   - "tol_met":     bool | Gibt an, ob die Fehlerschranke die angeforderte Toleranz einhaelt
+
+
+def _pop_report(opts: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Entfernt den Key "report" aus 'opts' und gibt 'opts' sowie einen leeren Kuerzungsbericht zurueck, falls dieser
+    angefordert wurde. Ansonsten ist der Bericht None.
+    """
+    if opts is None or "report" not in opts:
+        return opts, None
+    report = {"rank_before": {}, "rank_after": {}, "discarded": {}} if opts["report"] else None
+    return {k: v for k, v in opts.items() if k != "report"}, report
+
+
+def _record(report: dict, node: tuple, sv: torch.Tensor, rank: int, rank_before: int = None):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Haelt die Kuerzung des Knotens 'node' mit den absteigend sortierten Singulaerwerten 'sv' auf den Rang 'rank' im
+    Kuerzungsbericht 'report' fest. Ist 'rank_before' None, so entspricht der Rang vor der Kuerzung len(sv).
+    """
+    if report is None:
+        return
+    rank = int(rank)
+    report["rank_before"][node] = len(sv) if rank_before is None else int(rank_before)
+    report["rank_after"][node] = rank
+    report["discarded"][node] = float(torch.linalg.norm(sv[rank:]))
+
+
+def _finish_report(report: dict, opts: dict, norm: float):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Berechnet die globale Fehlerschranke des Kuerzungsberichts 'report' und prueft diese gegen die in 'opts'
+    angeforderten Fehlertoleranzen. 'norm' ist die Norm des ungekuerzten Tensors.
+    """
+    report["error_bound"] = sqrt(sum(v ** 2 for v in report["discarded"].values()))
+    report["norm"] = float(norm)
+    tols = []
+    if opts is not None and "err_tol_abs" in opts:
+        tols.append(opts["err_tol_abs"])
+    if opts is not None and "err_tol_rel" in opts:
+        tols.append(opts["err_tol_rel"] * float(norm))
+    report["err_tol"] = min(tols) if tols else None
+    report["tol_met"] = report["err_tol"] is None or report["error_bound"] <= report["err_tol"]
+    return report
+
+
+def _merge_reports(first: dict, second: dict, opts: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Fasst die Kuerzungsberichte zweier aufeinanderfolgender Kuerzungen zusammen (z.B. Kuerzung und anschliessendes
+    Durchsetzen eines Speicherbudgets). Da beide Kuerzungen orthogonale Projektionen sind, deren Fehler orthogonal
+    zueinander stehen, werden sowohl die verworfenen Anteile je Knoten als auch die Fehlerschranke in Quadratur
+    (Wurzel der Quadratsumme) kombiniert.
+    """
+    report = {"rank_before": dict(first["rank_before"]),
+              "rank_after": {**first["rank_after"], **second["rank_after"]},
+              "discarded": {node: sqrt(first["discarded"].get(node, 0.0) ** 2 + second["discarded"].get(node, 0.0) ** 2)
+                            for node in set(first["discarded"]) | set(second["discarded"])}}
+    return _finish_report(report, opts, first["norm"])
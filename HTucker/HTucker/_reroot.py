@@ -0,0 +1,35 @@
+from ._tensordot import _shallow_copy
+
+
+def reroot(self, node: tuple, lr: str = "right"):
+    """
+    Strukturiert den Dimensionsbaum des hierarchischen Tuckertensors 'self' so um, dass der Knoten 'node' linkes
+    (lr="left") oder rechtes (lr="right") Kind der Wurzel wird. Dazu wird der Pfad von 'node' zur Wurzel invertiert,
+    wobei lediglich die Transfertensoren entlang dieses Pfades transponiert werden. Die Dimensionen von 'self' bleiben
+    unveraendert.
+    ______________________________________________________________________
+    Parameter:
+    - node (int,...): Ein Knoten des Dimensionsbaums von 'self', der nicht die Wurzel ist.
+    - lr str: Einer der beiden Strings "left" oder "right"
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der hierarchische Tuckertensor mit umstrukturiertem Dimensionsbaum.
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6))
+    y = x.reroot((2,), lr="left")
+    y.dtree.get_children(y.dtree.get_root())    # = [(2,), (0,1,3)]
+    torch.allclose(x.full(), y.full())    # = True
+    """
+    if not isinstance(node, tuple):
+        raise TypeError("Argument 'node': type(node)={} | node ist kein tuple.".format(type(node)))
+    if not self.dtree.contains(node):
+        raise ValueError("Argument 'node': node={} | node ist kein Knoten des Dimensionsbaums.".format(node))
+    if self.dtree.is_root(node):
+        raise ValueError("Argument 'node': node={} | node ist bereits die Wurzel.".format(node))
+    if lr not in ["left", "right"]:
+        raise ValueError("Argument 'lr': lr={} ist weder 'left' noch 'right'.".format(lr))
+
+    x = _shallow_copy(self)
+    x._change_root(node=node, lr=lr)
+    return x
@@ -0,0 +1,322 @@
+import torch
+from functools import lru_cache
+from ._change_root import _get_dimensions_for_each_node
+
+
+def _lift(x, t: tuple, g: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktionen HTucker.tensordot und HTucker.to_dimtree
+    ______________________________________________________________________
+    Fuehrt eine lokale Rotation des Dimensionsbaums von 'x' am Knoten 't' durch. Dabei wird der Enkelknoten 'g' zum
+    direkten Kind von 't'. Sein bisheriger Elternknoten c wird aufgeloest und durch einen neuen Knoten ersetzt, der
+    den Geschwisterknoten von 'g' und den Geschwisterknoten von c zusammenfasst. Die Aenderungen werden direkt auf 'x'
+    durchgefuehrt.
+    Die beiden betroffenen Transfertensoren werden zu einem 4D-Tensor kontrahiert und anschliessend per
+    Singulaerwertzerlegung neu aufgeteilt. Die Rotation ist exakt.
+    ______________________________________________________________________
+    Parameter:
+    - t (int,...): Der Knoten, an dem rotiert wird.
+    - g (int,...): Ein Enkelknoten von 't'.
+    ______________________________________________________________________
+    Beispiel:
+    a) _lift(x, t=(0,1,2,3), g=(1,))
+                 (0,1,2,3)                                  (1,0,2,3)
+             (0,1)       (2,3)             ~~~>         (1,)       (0,2,3)
+         (0,)    (1,) (2,)   (3,)                              (0,)      (2,3)
+                                                                      (2,)   (3,)
+    """
+    nodes = x.dtree.nodes
+    parents = _get_parents(nodes)
+    c = parents[g]
+    if parents.get(c) != t:
+        raise ValueError("Argument 'g': g={} ist kein Enkelknoten von t={}.".format(g, t))
+    # Positionen von c unter t und von g unter c
+    i_c = nodes[t].index(c)
+    i_g = nodes[c].index(g)
+
+    # Bringe die beiden Transfertensoren in die Indexreihenfolge (g, s', c) bzw. (c, s, t)
+    # Dabei ist s' der Geschwisterknoten von g und s der Geschwisterknoten von c
+    B_c = x.B[c] if i_g == 0 else torch.transpose(x.B[c], 0, 1)
+    B_t = x.B[t] if i_c == 0 else torch.transpose(x.B[t], 0, 1)
+    T = torch.tensordot(B_c, B_t, dims=([2], [0]))
+    r_g, r_s_, r_s, r_t = T.shape
+
+    # Matriziere T so, dass die Zeilen den Kindern des neuen Knotens entsprechen
+    if i_c == 0:
+        M = torch.permute(T, (1, 2, 0, 3)).reshape(r_s_ * r_s, r_g * r_t)
+        shape_c = (r_s_, r_s)
+    else:
+        M = torch.permute(T, (2, 1, 0, 3)).reshape(r_s * r_s_, r_g * r_t)
+        shape_c = (r_s, r_s_)
+    del T
+
+    # Neue Basis des neu entstehenden Knotens
+    Q, _ = x.left_svd_qr(M)
+    k = Q.shape[1]
+    core = (Q.T @ M).reshape(k, r_g, r_t)
+
+    # Aktualisiere Dimensionsbaum, Transfertensordict und Blattmatrixdict
+    new_nodes, old2new, c_new = _lift_nodes(nodes, t, g)
+    B = {node: tens for node, tens in x.B.items() if node not in (c, t)}
+    B[c_new] = Q.reshape(shape_c[0], shape_c[1], k)
+    B[t] = torch.transpose(core, 0, 1) if i_c == 0 else core
+    x.B = {old2new[node]: tens for node, tens in B.items()}
+    x.U = {old2new[node]: mat for node, mat in x.U.items()}
+    x.dtree = type(x.dtree)._new(new_nodes)
+    # B[c_new] ist orthonormal. Da die Rotation die Basis des Knotens t unveraendert laesst, ist der neue
+    # Transfertensor von t genau dann orthonormal, wenn es die alten Transfertensoren von c und t waren. Die
+    # Markierungen aller uebrigen Knoten werden lediglich umbenannt
+    # Hinweis: Die Wurzel wird in _dirty nie gefuehrt (vgl. is_orthog)
+    dirty = {old2new[node] for node in x._dirty if node not in (c, t)}
+    if (c in x._dirty or t in x._dirty) and not x.dtree.is_root(old2new[t]):
+        dirty.add(old2new[t])
+    x._dirty = dirty
+
+
+def _swap(x, t: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktionen HTucker.tensordot und HTucker.to_dimtree
+    Vertauscht das linke und rechte Kind des Knotens 't' von 'x'. Die Aenderungen werden direkt auf 'x' durchgefuehrt.
+    """
+    new_nodes, old2new = _swap_nodes(x.dtree.nodes, t)
+    B = dict(x.B)
+    B[t] = torch.transpose(x.B[t], 0, 1)
+    x.B = {old2new[node]: tens for node, tens in B.items()}
+    x.U = {old2new[node]: mat for node, mat in x.U.items()}
+    x.dtree = type(x.dtree)._new(new_nodes)
+    # Die Transposition laesst die Orthonormalitaet von B[t] unveraendert, es werden lediglich die Knoten umbenannt
+    x._dirty = {old2new[node] for node in x._dirty}
+
+
+def _execute_plan(x, plan: list):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktionen HTucker.tensordot und HTucker.to_dimtree
+    Fuehrt die in 'plan' enthaltenen Rotationen und Vertauschungen nacheinander auf 'x' aus. Die Knoten sind in 'plan'
+    als frozensets ihrer Dimensionen hinterlegt, da sich die Reihenfolge der Dimensionen in den Knotenbezeichnungen
+    waehrend der Umstrukturierung aendern kann.
+    """
+    for op in plan:
+        if op[0] == "lift":
+            _lift(x, _get_node(x.dtree.nodes, op[1]), _get_node(x.dtree.nodes, op[2]))
+        else:
+            _swap(x, _get_node(x.dtree.nodes, op[1]))
+
+
+def _freeze(nodes: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Gibt eine hashbare Darstellung der Knotenhierarchie 'nodes' zurueck.
+    """
+    return tuple(sorted((k, tuple(v)) for k, v in nodes.items()))
+
+
+def _thaw(nodes: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Gibt die Knotenhierarchie zur hashbaren Darstellung 'nodes' zurueck.
+    """
+    return {k: list(v) for k, v in nodes}
+
+
+@lru_cache(maxsize=256)
+def _get_transform_plan(source: tuple, target: tuple, target_sub: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Gibt den Plan zurueck, der den Subtree von 'source', der die Dimensionen von 'target_sub' repraesentiert, in die
+    Struktur des Subtrees mit Wurzel 'target_sub' aus 'target' ueberfuehrt. Die Knotenhierarchien sind in ihrer
+    hashbaren Darstellung (vgl. _freeze) zu uebergeben. Die Plaene werden pro Paar aus Quell- und Zielstruktur
+    zwischengespeichert.
+    """
+    plan = []
+    _plan_transform(_thaw(source), _thaw(target), target_sub, plan)
+    return tuple(plan)
+
+
+@lru_cache(maxsize=256)
+def _get_gather_plan(source: tuple, sub: frozenset, dims: frozenset):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Gibt den Plan zurueck, durch den die Dimensionen aus 'dims' im Subtree mit Wurzel 'sub' der Knotenhierarchie
+    'source' (vgl. _freeze) von genau einem Knoten repraesentiert werden. Die Plaene werden zwischengespeichert.
+    """
+    plan = []
+    _plan_gather(_thaw(source), sub, dims, plan)
+    return tuple(plan)
+
+
+def _lift_nodes(nodes: dict, t: tuple, g: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion von _lift
+    Berechnet die Knotenhierarchie nach der Rotation am Knoten 't', durch die der Enkelknoten 'g' direktes Kind von 't'
+    wird. Zurueckgegeben werden die neue Knotenhierarchie, das Mapping alte -> neue Knotenbezeichnungen und die
+    Bezeichnung des neu entstandenen Knotens.
+    """
+    parents = _get_parents(nodes)
+    c = parents[g]
+    i_c = nodes[t].index(c)
+    s = nodes[t][1 - i_c]
+    s_ = nodes[c][1 - nodes[c].index(g)]
+    new_children = [s_, s] if i_c == 0 else [s, s_]
+    c_new = new_children[0] + new_children[1]
+    new_nodes = {k: v for k, v in nodes.items() if k != c}
+    new_nodes[c_new] = new_children
+    new_nodes[t] = [g, c_new] if i_c == 0 else [c_new, g]
+    old2new = _get_dimensions_for_each_node(new_nodes)
+    new_nodes = {old2new[k]: [old2new[child] for child in v] for k, v in new_nodes.items()}
+    return new_nodes, old2new, old2new[c_new]
+
+
+def _swap_nodes(nodes: dict, t: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion von _swap
+    Berechnet die Knotenhierarchie nach dem Vertauschen der Kinder des Knotens 't'.
+    """
+    new_nodes = dict(nodes)
+    new_nodes[t] = nodes[t][::-1]
+    old2new = _get_dimensions_for_each_node(new_nodes)
+    new_nodes = {old2new[k]: [old2new[child] for child in v] for k, v in new_nodes.items()}
+    return new_nodes, old2new
+
+
+def _get_parents(nodes: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Gibt das Mapping Kind -> Elternknoten der Knotenhierarchie 'nodes' zurueck.
+    """
+    return {child: k for k, v in nodes.items() for child in v}
+
+
+def _get_node(nodes: dict, dims: frozenset):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Gibt die Bezeichnung jenes Knotens aus 'nodes' zurueck, der genau die Dimensionen aus 'dims' repraesentiert.
+    """
+    for node in nodes:
+        if len(node) == len(dims) and frozenset(node) == dims:
+            return node
+    raise ValueError("Argument 'dims': Es existiert kein Knoten, der genau die Dimensionen {}"
+                     " repraesentiert.".format(sorted(dims)))
+
+
+def _get_covering_nodes(nodes: dict, sub: tuple, dims: frozenset):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Gibt die minimale Anzahl an Knoten des Subtrees mit Wurzel 'sub' zurueck, die genau die Dimensionen aus 'dims'
+    repraesentieren.
+    """
+    if set(sub) <= dims:
+        return [sub]
+    if not nodes[sub]:
+        return []
+    l, r = nodes[sub]
+    return _get_covering_nodes(nodes, l, dims) + _get_covering_nodes(nodes, r, dims)
+
+
+def _get_distance(parents: dict, node: tuple, sub: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Gibt die Anzahl an Kanten zwischen 'node' und seinem Vorfahren 'sub' zurueck.
+    """
+    dist = 0
+    while node != sub:
+        node = parents[node]
+        dist += 1
+    return dist
+
+
+def _plan_lift_to_child(nodes: dict, sub: frozenset, n: frozenset, plan: list):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Erweitert 'plan' um jene Rotationen, durch die der Knoten 'n' zum direkten Kind seines Vorfahren 'sub' wird.
+    Gibt die resultierende Knotenhierarchie zurueck.
+    """
+    parents = _get_parents(nodes)
+    sub_node, node = _get_node(nodes, sub), _get_node(nodes, n)
+    while parents[node] != sub_node:
+        t = parents[parents[node]]
+        plan.append(("lift", frozenset(t), n))
+        nodes, _, _ = _lift_nodes(nodes, t, node)
+        parents = _get_parents(nodes)
+        sub_node, node = _get_node(nodes, sub), _get_node(nodes, n)
+    return nodes
+
+
+def _plan_gather(nodes: dict, sub: frozenset, dims: frozenset, plan: list):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Erweitert 'plan' um jene Rotationen, durch die die Dimensionen aus 'dims' im Subtree mit Wurzel 'sub' von genau
+    einem Knoten repraesentiert werden. Gibt die resultierende Knotenhierarchie zurueck.
+    """
+    covers = _get_covering_nodes(nodes, _get_node(nodes, sub), dims)
+    while len(covers) > 1:
+        parents = _get_parents(nodes)
+        sub_node = _get_node(nodes, sub)
+        # Der am hoechsten gelegene Knoten wird zum Kind von sub
+        acc = frozenset(min(covers, key=lambda node: _get_distance(parents, node, sub_node)))
+        nodes = _plan_lift_to_child(nodes, sub, acc, plan)
+        # Der naechste Knoten wird zum Kind des Geschwisterknotens rest von acc
+        sub_node = _get_node(nodes, sub)
+        rest = [child for child in nodes[sub_node] if frozenset(child) != acc][0]
+        parents = _get_parents(nodes)
+        n = frozenset(min(_get_covering_nodes(nodes, rest, dims),
+                          key=lambda node: _get_distance(parents, node, rest)))
+        nodes = _plan_lift_to_child(nodes, frozenset(rest), n, plan)
+        # Rotation an sub fasst acc und n zu einem Knoten zusammen
+        rest = _get_node(nodes, frozenset(rest))
+        other = [child for child in nodes[rest] if frozenset(child) != n][0]
+        plan.append(("lift", sub, frozenset(other)))
+        nodes, _, _ = _lift_nodes(nodes, _get_node(nodes, sub), other)
+        covers = _get_covering_nodes(nodes, _get_node(nodes, sub), dims)
+    return nodes
+
+
+def _plan_transform(nodes: dict, target_nodes: dict, target_sub: tuple, plan: list):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Erweitert 'plan' um jene Rotationen und Vertauschungen, durch die der Subtree von 'nodes', der die Dimensionen von
+    'target_sub' repraesentiert, die Struktur des Subtrees mit Wurzel 'target_sub' aus 'target_nodes' annimmt.
+    Gibt die resultierende Knotenhierarchie zurueck.
+    """
+    if not target_nodes[target_sub]:
+        return nodes
+    sub = frozenset(target_sub)
+    tl, tr = target_nodes[target_sub]
+    left = frozenset(tl)
+    if left not in [frozenset(child) for child in nodes[_get_node(nodes, sub)]]:
+        # Fasse die Dimensionen des linken Kindes zu einem Knoten zusammen und mache diesen zum Kind von sub
+        nodes = _plan_gather(nodes, sub, left, plan)
+        nodes = _plan_lift_to_child(nodes, sub, left, plan)
+    sub_node = _get_node(nodes, sub)
+    if frozenset(nodes[sub_node][0]) != left:
+        plan.append(("swap", sub))
+        nodes, _ = _swap_nodes(nodes, sub_node)
+    nodes = _plan_transform(nodes, target_nodes, tl, plan)
+    nodes = _plan_transform(nodes, target_nodes, tr, plan)
+    return nodes
+
+
+def _plan_cost(nodes: dict, rank: dict, plan: list):
+    """
+    Hinweis: Dies ist eine interne Funktion
+    Schaetzt den Aufwand (Flops der Kontraktionen und Singulaerwertzerlegungen zuzueglich der Groesse der
+    4D-Zwischentensoren) des Plans 'plan' ab. Die Raenge sind in 'rank' als frozenset -> int hinterlegt. Raenge neu
+    entstehender Knoten werden dabei als exakter Rang der Rotation fortgeschrieben.
+    """
+    rank = dict(rank)
+    cost = 0
+    for op in plan:
+        if op[0] == "swap":
+            nodes, _ = _swap_nodes(nodes, _get_node(nodes, op[1]))
+            continue
+        t, g = _get_node(nodes, op[1]), _get_node(nodes, op[2])
+        parents = _get_parents(nodes)
+        c = parents[g]
+        s = nodes[t][1 - nodes[t].index(c)]
+        s_ = nodes[c][1 - nodes[c].index(g)]
+        r_g, r_c, r_t = rank[frozenset(g)], rank[frozenset(c)], rank[frozenset(t)]
+        r_s, r_s_ = rank[frozenset(s)], rank[frozenset(s_)]
+        m, n = r_s_ * r_s, r_g * r_t
+        cost += r_g * r_s_ * r_c * r_s * r_t + m * n * min(m, n) + m * n
+        rank[frozenset(s) | frozenset(s_)] = min(m, n)
+        nodes, _, _ = _lift_nodes(nodes, t, g)
+    return cost
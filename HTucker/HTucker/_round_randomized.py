@@ -0,0 +1,101 @@
+import torch
+
+# Ueberabtastung der Zufallsskizzen der randomisierten Rundung
+_OVERSAMPLING = 5
+
+
+def _round_randomized(x, opts: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion truncate_htt.
+    Rundet den hierarchischen Tuckertensor 'x' in-place randomisiert auf den Rang opts["max_rank"]. Im Gegensatz zur
+    Kuerzung ueber die reduzierten Gram'schen Matrizen ist weder eine Orthogonalisierung noch die Berechnung der
+    Gram'schen Matrizen noetig:
+    1) Pro Dimension wird eine Gauss'sche Skizze mit l = max_rank + Ueberabtastung Spalten gezogen. Die Spalten
+       entsprechen Rang-1 Tensoren, die Skizze des Komplements eines Knotens also einer Khatri-Rao Skizze.
+    2) Bottom-up wird der Frame jedes Knotens mit den Skizzen seiner Dimensionen kontrahiert (Z), top-down der Rest
+       des Tensors mit den Skizzen des Komplements (W). Beides kostet O(d r^3 l) statt O(d r^4).
+    3) Bottom-up wird aus der Skizze jedes Knotens, projiziert auf die bereits gerundeten Basen der Kinder, mittels
+       QR und SVD des R-Faktors direkt eine orthonormale Basis vom Zielrang bestimmt.
+    Das Ergebnis ist die orthogonale Projektion von 'x' auf die verschachtelten Basen und damit orthogonal.
+    Die Skizzen werden einem lokalen Zufallszahlengenerator entnommen, der mit opts["seed"] initialisiert wird, sofern
+    angegeben. Der globale Zufallszahlengenerator von torch bleibt unberuehrt.
+    ______________________________________________________________________
+    Output:
+    (dict,): Die Raenge der Knoten vor der Rundung.
+    """
+    if "max_rank" not in opts:
+        raise ValueError("Argument 'opts': Die randomisierte Rundung (opts[\"rounding\"]=\"randomized\") erfordert den"
+                         " key \"max_rank\".")
+    unsupported = [k for k in ("err_tol_abs", "err_tol_rel", "error_allocation", "max_nbytes", "max_params")
+                   if k in opts]
+    if unsupported:
+        raise ValueError("Argument 'opts': Die keys {} werden von der randomisierten Rundung"
+                         " (opts[\"rounding\"]=\"randomized\") nicht unterstuetzt.".format(unsupported))
+
+    root = x.dtree.get_root()
+    dtype = x.B[root].dtype
+    # Im mixed precision Modus werden die Skizzen in torch.float64 berechnet
+    mixed_precision = opts["mixed_precision"] if "mixed_precision" in opts else False
+    work_dtype = torch.float64 if mixed_precision else dtype
+    max_rank = opts["max_rank"]
+    n_cols = max_rank + _OVERSAMPLING
+    generator = torch.Generator()
+    if "seed" in opts:
+        generator.manual_seed(opts["seed"])
+
+    U = {leaf: x.U[leaf].to(work_dtype) for leaf in x.dtree.get_leaves()}
+    B = {node: x.B[node].to(work_dtype) for node in x.B}
+    bottom_up = [node for level in range(x.dtree.get_depth(), -1, -1) for node in x.dtree.get_nodes_of_lvl(level)]
+
+    # Z[t]: Kontraktion des Frames von t mit den Skizzen der Dimensionen von t (r_t x l)
+    Z = {}
+    for node in bottom_up:
+        if x.dtree.is_leaf(node):
+            omega = torch.randn(U[node].shape[0], n_cols, generator=generator, dtype=work_dtype).to(U[node].device)
+            Z[node] = U[node].T @ omega
+        else:
+            l, r = x.dtree.get_children(node)
+            Z[node] = torch.einsum("abk,aj,bj->kj", B[node], Z[l], Z[r])
+
+    # W[t]: Kontraktion des Tensors ohne den Frame von t mit den Skizzen des Komplements von t (r_t x l)
+    W = {root: torch.ones(1, n_cols, dtype=work_dtype, device=B[root].device)}
+    for node in bottom_up[::-1]:
+        if x.dtree.is_leaf(node):
+            continue
+        l, r = x.dtree.get_children(node)
+        W[l] = torch.einsum("abk,bj,kj->aj", B[node], Z[r], W[node])
+        W[r] = torch.einsum("abk,aj,kj->bj", B[node], Z[l], W[node])
+    del Z
+
+    # Bottom-up Berechnung der neuen Basen
+    # M[t] = Q_t^T Frame_t bildet den alten Frame von t auf die Koeffizienten bzgl. der neuen Basis ab (k_t x r_t)
+    M, rank_before = {}, {}
+    for node in bottom_up:
+        if x.dtree.is_leaf(node):
+            rank_before[node] = U[node].shape[1]
+            Q = _get_range(U[node] @ W[node], max_rank)
+            M[node] = Q.T @ U[node]
+            x.U[node] = Q.to(dtype)
+            continue
+        l, r = x.dtree.get_children(node)
+        # Projektion des Transfertensors auf die neuen Basen der Kinder
+        C = torch.einsum("ac,bd,cdk->abk", M.pop(l), M.pop(r), B[node])
+        if node == root:
+            x.B[node] = C.to(dtype)
+            continue
+        rank_l, rank_r, rank_before[node] = C.shape
+        C = x.matricise(C, t=(0, 1))
+        Q = _get_range(C @ W[node], max_rank)
+        M[node] = Q.T @ C
+        x.B[node] = x.dematricise(Q, shape=(rank_l, rank_r, Q.shape[1]), t=(0, 1)).to(dtype)
+    return rank_before
+
+
+def _get_range(Y: torch.Tensor, rank: int):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion _round_randomized.
+    Berechnet eine orthonormale Basis vom Rang <= 'rank' des dominanten Spaltenraums der Skizze 'Y'.
+    """
+    Q, R = torch.linalg.qr(Y, mode="reduced")
+    u, _, _ = torch.linalg.svd(R, full_matrices=False)
+    return Q @ u[:, :rank]
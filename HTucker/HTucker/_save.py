@@ -0,0 +1,190 @@
+import torch
+import json
+import mmap as mmap_
+import struct
+import sys
+from .dimtree import dimtree
+from ._pack import _set_arena
+
+# Dateiformat:
+#   MAGIC (8 Byte) | Version (uint32) | Headerlaenge in Byte (uint64) | Header (JSON, utf-8) | Padding | Payload
+# Der Payload beginnt an einer durch ALIGNMENT teilbaren Position. Jeder Kern (Blattmatrix bzw. Transfertensor)
+# liegt als zusammenhaengender Block im Payload und beginnt ebenfalls an einer durch ALIGNMENT teilbaren Position.
+# Dadurch koennen die Kerne beim Laden direkt als Sichten auf die gemappte Datei erzeugt werden.
+# Ist der hierarchische Tuckertensor gepackt (siehe HTTensor.pack), so besteht der Payload aus der unveraenderten Arena
+# und die Offsets der Kerne entsprechen ihren Positionen in der Arena.
+MAGIC = b"HTTENSOR"
+VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sIQ")
+
+
+def save(self, path: str):
+    """
+    Speichert den hierarchischen Tuckertensor 'self' in einer einzelnen Binaerdatei unter 'path'. Die Datei besteht aus
+    einem Header, der die Dimensionshierarchie, die shapes und dtypes aller Kerne sowie das is_orthog Flag enthaelt,
+    gefolgt von den ausgerichteten, zusammenhaengenden Daten aller Blattmatrizen und Transfertensoren.
+    ______________________________________________________________________
+    Parameter:
+    - path str: Der Dateipfad.
+    ______________________________________________________________________
+    Output:
+    None
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6))
+    x.save("x.htt")
+    y = HTTensor.load("x.htt")
+    torch.allclose(x.full(), y.full())    # is True
+    """
+    if not isinstance(path, str):
+        raise TypeError("Argument 'path': type(path)={} | path ist kein str.".format(type(path)))
+
+    header, entries, cores = _get_header(self)
+    payload_start = _align(_PREAMBLE.size + len(header))
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        f.write(bytes(payload_start - _PREAMBLE.size - len(header)))
+        if cores is None:
+            # Die Arena wird als ein einziger Block geschrieben
+            f.write(self._arena.detach().cpu().view(torch.uint8).numpy().tobytes())
+            return
+        for entry, tens in zip(entries, cores):
+            # Padding bis zum Beginn des Kerns
+            f.write(bytes(payload_start + entry["offset"] - f.tell()))
+            if entry["nbytes"] > 0:
+                f.write(tens.reshape(-1).view(torch.uint8).numpy().tobytes())
+
+
+def load(cls, path: str, mmap: bool = True):
+    """
+    Laedt einen mittels HTTensor.save gespeicherten hierarchischen Tuckertensor aus der Datei 'path'.
+    Ist 'mmap' True, so wird die Datei in den Speicher gemappt und die Blattmatrizen und Transfertensoren sind Sichten
+    auf diesen Speicherbereich. Es werden also keine Daten kopiert und erst beim Zugriff von der Festplatte gelesen.
+    Schreibzugriffe auf die Kerne wirken sich dabei nicht auf die Datei aus (copy-on-write).
+    Ist 'mmap' False, so wird die Datei vollstaendig eingelesen.
+    Wurde ein gepackter hierarchischer Tuckertensor gespeichert, so ist auch der geladene hierarchische Tuckertensor
+    gepackt. Seine Arena ist dann eine Sicht auf den Payload der Datei.
+    ______________________________________________________________________
+    Parameter:
+    - path str: Der Dateipfad.
+    - mmap bool: Bestimmt, ob die Datei gemappt oder eingelesen wird.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der geladene hierarchische Tuckertensor.
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6))
+    x.save("x.htt")
+    y = HTTensor.load("x.htt", mmap=True)
+    """
+    if not isinstance(path, str):
+        raise TypeError("Argument 'path': type(path)={} | path ist kein str.".format(type(path)))
+    if not isinstance(mmap, bool):
+        raise TypeError("Argument 'mmap': type(mmap)={} | mmap ist kein bool.".format(type(mmap)))
+
+    with open(path, "rb") as f:
+        if mmap:
+            buffer = mmap_.mmap(f.fileno(), 0, access=mmap_.ACCESS_COPY)
+        else:
+            buffer = bytearray(f.read())
+
+    return _from_buffer(cls, buffer, "path", path)
+
+
+def _get_header(x):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktionen HTTensor.save und HTTensor.share_memory.
+    Berechnet den Header des hierarchischen Tuckertensors 'x'.
+    ______________________________________________________________________
+    Output:
+    (bytes, list, list | None): Der kodierte Header, die Eintraege der Kerne im Header sowie die zusammenhaengenden
+                                CPU Kopien der Kerne in derselben Reihenfolge. Ist 'x' gepackt, so ist der letzte
+                                Eintrag None, da der Payload dann der Arena entspricht.
+    """
+    packed = x.is_packed()
+    cores = [("U", node, mat) for node, mat in x.U.items()] + [("B", node, tens) for node, tens in x.B.items()]
+
+    # Berechne die Offsets der Kerne relativ zum Beginn des Payloads
+    entries = []
+    offset = 0
+    for kind, node, tens in cores:
+        nbytes = tens.numel() * tens.element_size()
+        if packed:
+            offset = x._arena_offsets[node] * tens.element_size()
+        entries.append({"kind": kind, "node": [int(item) for item in node], "shape": list(tens.shape),
+                        "dtype": str(tens.dtype).split(".")[-1], "offset": offset, "nbytes": nbytes})
+        offset = _align(offset + nbytes)
+
+    nodes = [[[int(item) for item in node], [[int(item) for item in child] for child in children]]
+             for node, children in x.dtree.nodes.items()]
+    header = json.dumps({"nodes": nodes,
+                         "is_orthog": x.is_orthog,
+                         "byteorder": sys.byteorder,
+                         "arena_numel": x._arena.numel() if packed else None,
+                         "cores": entries}).encode("utf-8")
+    if packed:
+        return header, entries, None
+    # Die Kerne werden zusammenhaengend und auf der CPU geschrieben
+    return header, entries, [tens.detach().cpu().contiguous() for _, _, tens in cores]
+
+
+def _from_buffer(cls, buffer, arg: str, source):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktionen HTTensor.load und HTTensor.attach.
+    Erzeugt den in 'buffer' abgelegten hierarchischen Tuckertensor. Die Kerne sind dabei Sichten auf 'buffer'.
+    Die Parameter 'arg' und 'source' dienen lediglich den Fehlermeldungen.
+    """
+    if len(buffer) < _PREAMBLE.size:
+        raise ValueError("Argument '{}': {} enthaelt keinen gueltigen HTTensor.".format(arg, source))
+    magic, version, header_len = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Argument '{}': {} enthaelt keinen gueltigen HTTensor.".format(arg, source))
+    if version != VERSION:
+        raise ValueError("Argument '{}': {} hat die Formatversion {}, unterstuetzt wird"
+                         " Version {}.".format(arg, source, version, VERSION))
+    header = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_len]).decode("utf-8"))
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError("Argument '{}': {} wurde mit Byteorder {} geschrieben, dieses System verwendet"
+                         " {}.".format(arg, source, header["byteorder"], sys.byteorder))
+    payload_start = _align(_PREAMBLE.size + header_len)
+
+    # Erzeuge die Kerne als Sichten auf den Puffer
+    U, B = {}, {}
+    arena = None
+    if header["arena_numel"] is not None:
+        # Die Kerne sind Sichten auf die Arena, die ihrerseits eine Sicht auf den Payload ist
+        dtype = getattr(torch, header["cores"][0]["dtype"])
+        arena = torch.frombuffer(buffer, dtype=dtype, count=header["arena_numel"], offset=payload_start)
+        offsets = {tuple(entry["node"]): entry["offset"] // dtype.itemsize for entry in header["cores"]}
+    for entry in header["cores"]:
+        dtype = getattr(torch, entry["dtype"])
+        shape = tuple(entry["shape"])
+        if arena is not None:
+            offset = offsets[tuple(entry["node"])]
+            tens = arena[offset:offset + entry["nbytes"] // dtype.itemsize].view(shape)
+        elif entry["nbytes"] > 0:
+            tens = torch.frombuffer(buffer, dtype=dtype, count=entry["nbytes"] // dtype.itemsize,
+                                    offset=payload_start + entry["offset"]).reshape(shape)
+        else:
+            tens = torch.empty(shape, dtype=dtype)
+        if entry["kind"] == "U":
+            U[tuple(entry["node"])] = tens
+        else:
+            B[tuple(entry["node"])] = tens
+
+    dtree = dimtree({tuple(node): [tuple(child) for child in children] for node, children in header["nodes"]})
+    x = cls(U=U, B=B, dtree=dtree, is_orthog=header["is_orthog"])
+    if arena is not None:
+        _set_arena(x, arena, offsets, {**U, **B})
+    return x
+
+
+def _align(offset: int):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Rundet 'offset' auf das naechste Vielfache von ALIGNMENT auf.
+    """
+    return -(-offset // ALIGNMENT) * ALIGNMENT
@@ -35,6 +35,5 @@ def scalar_mul(self, c: float):
 
     # Multipliziere den Transfertensor der Wurzel mit dem Skalar
     x.B[x.dtree.get_root()] = x.B[x.dtree.get_root()] * c
-    # Setze is_orthog Flag auf False
-    x.is_orthog = False
+    # Der Transfertensor der Wurzel muss nicht orthonormal sein. Die Orthogonalitaetsflags bleiben also erhalten
     return x
@@ -0,0 +1,119 @@
+import torch
+import sys
+from multiprocessing import shared_memory
+from ._save import _PREAMBLE, MAGIC, VERSION, _align, _get_header, _from_buffer
+from ._pack import _set_arena
+
+# Alle von diesem Prozess erzeugten oder eingebundenen Segmente
+# Da die Kerne Sichten auf die Segmente sind, werden diese erst durch HTTensor.release_shared_memory geschlossen
+_segments = {}
+# Die Namen der von diesem Prozess erzeugten Segmente
+_owned = set()
+
+
+def share_memory(self):
+    """
+    Legt den hierarchischen Tuckertensor 'self' in einem Shared Memory Segment ab und gibt dessen Namen zurueck.
+    Das Segment enthaelt dasselbe Layout wie eine mittels HTTensor.save geschriebene Datei, also den Header mit der
+    Dimensionshierarchie gefolgt von der Arena aller Kerne (siehe HTTensor.pack). Die Kerne von 'self' werden danach
+    selbst durch Sichten auf das Segment ersetzt, sodass auch der erzeugende Prozess keine eigene Kopie mehr haelt.
+    Andere Prozesse koennen den hierarchischen Tuckertensor ueber HTTensor.attach ohne Kopie einbinden.
+    Hinweis: - Die Kerne liegen danach auf der CPU.
+             - Schreibzugriffe auf die Kerne sind in allen eingebundenen Prozessen sichtbar.
+             - Das Segment muss vom erzeugenden Prozess mittels HTTensor.release_shared_memory freigegeben werden.
+    ______________________________________________________________________
+    Output:
+    (str,): Der Name des Shared Memory Segments.
+    ______________________________________________________________________
+    Beispiel:
+    # Erzeugender Prozess
+    x = HTTensor.randn((3,4,5,6))
+    name = x.share_memory()
+    # Lesender Prozess
+    y = HTTensor.attach(name)
+    torch.allclose(x.full(), y.full())    # is True
+    # Erzeugender Prozess, sobald kein Prozess mehr neu einbinden muss
+    HTTensor.release_shared_memory(name)
+    """
+    x = self.pack()
+    header, _, _ = _get_header(x)
+    payload_start = _align(_PREAMBLE.size + len(header))
+    arena_nbytes = x._arena.numel() * x._arena.element_size()
+
+    shm = shared_memory.SharedMemory(create=True, size=payload_start + arena_nbytes)
+    _PREAMBLE.pack_into(shm.buf, 0, MAGIC, VERSION, len(header))
+    shm.buf[_PREAMBLE.size:_PREAMBLE.size + len(header)] = header
+    torch.frombuffer(shm.buf, dtype=x._arena.dtype, count=x._arena.numel(),
+                     offset=payload_start).copy_(x._arena.detach())
+
+    # Ersetze die Kerne von self durch Sichten auf das Segment
+    z = _from_buffer(type(x), shm.buf, "self", shm.name)
+    _set_arena(x, z._arena, z._arena_offsets, {**z.U, **z.B})
+    _segments[shm.name] = shm
+    _owned.add(shm.name)
+    return shm.name
+
+
+def attach(cls, name: str):
+    """
+    Bindet den mittels HTTensor.share_memory im Shared Memory Segment 'name' abgelegten hierarchischen Tuckertensor
+    ohne Kopie ein. Die Kerne des zurueckgegebenen hierarchischen Tuckertensors sind Sichten auf das Segment.
+    ______________________________________________________________________
+    Parameter:
+    - name str: Der Name des Shared Memory Segments.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der eingebundene hierarchische Tuckertensor.
+    ______________________________________________________________________
+    Beispiel:
+    y = HTTensor.attach(name)
+    y[0, 1, 2, 3]
+    """
+    if not isinstance(name, str):
+        raise TypeError("Argument 'name': type(name)={} | name ist kein str.".format(type(name)))
+    if name not in _segments:
+        if sys.version_info >= (3, 13):
+            # Der einbindende Prozess ist nicht Eigentuemer des Segments und registriert dieses daher nicht beim
+            # resource tracker
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # Hinweis: Der resource tracker wird von Kindprozessen geteilt. Ein unregister wuerde daher auch die
+            #          Registrierung des erzeugenden Prozesses entfernen und bleibt aus.
+            shm = shared_memory.SharedMemory(name=name)
+        _segments[name] = shm
+    return _from_buffer(cls, _segments[name].buf, "name", name)
+
+
+def release_shared_memory(name: str):
+    """
+    Gibt das Shared Memory Segment 'name' in diesem Prozess frei. Hat dieser Prozess das Segment mittels
+    HTTensor.share_memory erzeugt, so wird es zudem entfernt (unlink), sodass es danach nicht mehr eingebunden werden
+    kann. Der Speicher selbst wird vom Betriebssystem freigegeben, sobald kein Prozess das Segment mehr eingebunden hat.
+    Hinweis: Das Segment wird nur geschlossen, wenn keine Kerne mehr darauf verweisen. Ansonsten bleibt es bis zu deren
+             Freigabe eingebunden, die Kerne bleiben also gueltig.
+    ______________________________________________________________________
+    Parameter:
+    - name str: Der Name des Shared Memory Segments.
+    ______________________________________________________________________
+    Output:
+    None
+    ______________________________________________________________________
+    Beispiel:
+    name = x.share_memory()
+    ...
+    HTTensor.release_shared_memory(name)
+    """
+    if not isinstance(name, str):
+        raise TypeError("Argument 'name': type(name)={} | name ist kein str.".format(type(name)))
+    if name not in _segments:
+        raise ValueError("Argument 'name': name={} | Das Segment wurde in diesem Prozess weder erzeugt noch"
+                         " eingebunden.".format(name))
+    shm = _segments.pop(name)
+    if name in _owned:
+        _owned.discard(name)
+        shm.unlink()
+    try:
+        shm.close()
+    except BufferError:
+        # Es existieren noch Sichten auf das Segment (z.B. die Kerne eines hierarchischen Tuckertensors)
+        pass
@@ -1,4 +1,3 @@
-from copy import deepcopy
 import torch
 
 
@@ -42,8 +41,9 @@ def squeeze(self, dims: list | int = None):
        x.get_shape    # = (4,1,6,5)               |           x.shape    # = torch.size([4,1,6,5])
     """
 
+    shape = self.get_shape()
     if dims is None:
-        dims = [dim for dim in range(len(self.get_shape())) if self.get_shape()[dim] == 1]
+        dims = [dim for dim in range(len(shape)) if shape[dim] == 1]
         if not dims:
             # In diesem Fall hat self gar keine Singleton Dimensionen
             return self
@@ -56,139 +56,103 @@ def squeeze(self, dims: list | int = None):
                             " noch ein einzelner int.".format(type(dims)))
     if len(dims) != len(set(dims)):
         raise ValueError("Argument 'dims': dims enthaelt Duplikate.")
-    if any(dim not in range(self.get_order()) for dim in dims):
+    if any(dim not in range(len(shape)) for dim in dims):
         raise ValueError("Argument 'dims': dims enthaelt ungueltige Dimensionen.")
-    if any(self.get_shape()[dim] != 1 for dim in dims):
+    if any(shape[dim] != 1 for dim in dims):
         raise ValueError("Argument 'dims': dims enthaelt ungueltige Dimensionen, "
                          "die keine Singleton Dimensionen sind.")
 
-    # z ist ein HTucker Tensor mit ausschliesslich Singleton Dimensionen
-    # Entsprechend repraesentiert z einen Skalar. Dieser Skalar wird zurueckgegeben.
-    if len(self.get_shape()) - len(dims) == 0:
-        return float(self.full())
-
     # Kontrolliere, dass der resultierende HTucker Tensor mindestens von Ordnung 2 ist
-    if len(self.get_shape()) - len(dims) == 1:
+    if 0 < len(shape) - len(dims) < 2:
         # Die letzte Singleton Dimension wird behalten
         dims = dims[:-1]
+    if not dims:
+        return self
 
     # Fuer bessere Lesbarkeit
     x = self
-
-    # z ist ein HTucker Tensor mit ausschliesslich Singleton Dimensionen
-    # Entsprechend repraesentiert z einen Skalar. Dieser Skalar wird zurueckgegeben.
-    if len(self.get_shape()) - len(dims) == 0:
-        return float(self.full())
-
-    # Entferne Singletons
-    singleton_node = _get_next_singleton(x.dtree, dims)
-    while singleton_node is not None:
-
-        # Vater- und Geschwisterknoten
-        par, sib = x.dtree.get_parent(singleton_node), x.dtree.get_sibling(singleton_node)
-
-        # Multipliziere die Blattmatrix von singleton_node in den Transfertensor des Elternknotens
-        if x.dtree.is_left(singleton_node):
-            transfer_tensor = torch.tensordot(x.U[singleton_node], x.B[par], dims=([1], [0]))
-        else:
-            transfer_tensor = torch.tensordot(x.U[singleton_node], x.B[par], dims=([1], [1]))
-
-        # Entferne die Singleton Dimension aus transfer_tensor
-        transfer_tensor = transfer_tensor.reshape(-1, transfer_tensor.shape[2])
-
-        # Verrechne transfer_tensor mit Geschwisterknoten
-        if x.dtree.is_leaf(sib):
-
-            # Gewisterknoten ist selbst ein Blatt
-            # transfer_tensor wird mit der Blattmatrix des Geschwisterknotens multipliziert
-            mat_times_tt = torch.tensordot(x.U[sib], transfer_tensor, dims=([1], [0]))
-
-            # Der gemeinsame Elternknoten, der in der naechsten Iteration nun ein Blattknoten sein wird,
-            # erhaelt das Berechnete Produkt (mat_times_tt) als Blattmatrix
-            x.U[par] = mat_times_tt
-
-            # Der gemeinsame Elternknoten ist in der naechsten Iteration ein Blattknoten
-            x.dtree.remove_children(par)
-            del x.B[par]
-
-            # Der betrachtete Knoten (singleton_node) und sein Geschwisterknoten werden aus dem
-            # Dimensionsbaum entfernt.
-            x.dtree.remove_node(singleton_node)
-            x.dtree.remove_node(sib)
-            del x.U[singleton_node]
-            del x.U[sib]
-
-        else:
-            # Geschwisterknoten ist ein innerer Knoten
-            # transfer_tensor wird mit dem Transfertensor des Geschwisterknotens kontrahiert
-            tt_times_tt = torch.tensordot(x.B[sib], transfer_tensor, dims=([2], [0]))
-
-            # Der gemeinsame Elterknoten erhaelt das Produkt als Transfertensor
-            x.B[par] = tt_times_tt
-
-            # Der gemeinsame Elternknoten uebernimmt nun die Kinder des Geschwisterknotens
-            x.dtree.set_children(par, x.dtree.get_children(sib))
-
-            # Der betrachtete Knoten (singleton_node) und sein Geschwisterknoten werden aus dem
-            # Dimensionsbaum entfernt.
-            x.dtree.remove_node(singleton_node)
-            x.dtree.remove_node(sib)
-            del x.U[singleton_node]
-            del x.B[sib]
-        singleton_node = _get_next_singleton(x.dtree, dims)
-
-    # Die Strukturen des Dimensionsbaums dtree, des Transfertensordicts B und des Blattmatrixdicts U
-    # wurden bereits aktualisiert. Als naechstes muessen die Dimensionen aktualisiert werden.
-    # Beispiel: Betrachte folgende Knoten (0,1), (0,) und (1,). Sei (0,) eine Singleton Dimension, die entfernt wurde.
-    #           Dann ist aktuell nur noch der gemeinsame Elternknoten (0,1) vorhanden, der aber nur noch eine Dimension
-    #           repraesentiert. Im neuen Dimensionsbaum wird dies die Dimension 0 sein. Entsprechend muss (0,1) auf (0,)
-    #           abgebildet werden. Dieses Mapping alte Dimension(en) -> neue Dimension(en) wird im Folgenden berechnet
-    old2new = {}
-    for old_node in x.dtree.get_nodes():
-        new_node = []
-        for d in old_node:
-            if d in dims:
-                continue
-            cnt_singletons_smaller_dim = len([singleton for singleton in dims if singleton < d])
-            new_node += [d - cnt_singletons_smaller_dim]
-        if new_node:
-            old2new[old_node] = tuple(new_node)
+    removed = set(dims)
+
+    # Berechne das Mapping alte Dimension -> neue Dimension der verbleibenden Dimensionen
+    # Beispiel: Werden die Dimensionen 0 und 2 eines Tensors der Ordnung 5 entfernt, so ergibt sich 1->0, 3->1, 4->2
+    dim_map = {}
+    cnt_removed = 0
+    for dim in range(len(shape)):
+        if dim in removed:
+            cnt_removed += 1
         else:
-            smallest_dim = min(old_node)
-            cnt_singletons_smaller_smallest_dim = len([singleton for singleton in dims if
-                                                       singleton < smallest_dim])
-            old2new[old_node] = (smallest_dim - cnt_singletons_smaller_smallest_dim,)
+            dim_map[dim] = dim - cnt_removed
 
-    # Anwendung des Knotenmappings auf den Dimensionsbaum
-    new_nodes = {old2new[node]: ([] if x.dtree.is_leaf(node) else
-                                 [old2new[x.dtree.get_left(node)], old2new[x.dtree.get_right(node)]])
-                 for node in x.dtree.get_nodes()}
-    x.dtree.nodes = new_nodes
-
-    # Anwendung des Knotenmappings auf die Blattmatrixdict
-    x.U = {old2new[k]: v for k, v in x.U.items()}
-
-    # Anwendung des Knotenmappings auf das Transfertensordict
-    x.B = {old2new[k]: v for k, v in x.B.items()}
+    # Kontrahiere alle Singleton Dimensionen in einem einzigen bottom-up Durchlauf durch den Dimensionsbaum
+    # Die Knotenhierarchie, das Blattmatrixdict und das Transfertensordict werden dabei direkt mit den neuen
+    # Knotenbezeichnungen aufgebaut
+    U, B, nodes = {}, {}, {}
+    root, vec = _squeeze_subtree(x, x.dtree.get_root(), removed, dim_map, U, B, nodes)
 
+    # z ist ein HTucker Tensor mit ausschliesslich Singleton Dimensionen
+    # Entsprechend repraesentiert z einen Skalar. Dieser Skalar wird zurueckgegeben.
+    if root is None:
+        return float(vec[0])
+
+    x.U = U
+    x.B = B
+    x.dtree = type(x.dtree)._new(nodes)
+    # Die Blattmatrizen und Transfertensoren, in die die Singleton Dimensionen kontrahiert wurden, sind i.A. nicht
+    # mehr orthonormal
+    x.is_orthog = False
     return x
 
 
-def _get_next_singleton(dtree, sdim):
+def _squeeze_subtree(x, node: tuple, removed: set, dim_map: dict, U: dict, B: dict, nodes: dict):
     """
-    Gibt den Knoten einer Singleton Dimension zurueck, wobei Knoten, deren Geschwister ebenfalls Singletons sind,
-    bevorzugt werden
-    :param dtree: dimtree.dimtree
-    :return: tuple:int
+    Hinweis: Dies ist eine interne Funktion der Funktion HTTensor.squeeze
+    Kontrahiert alle in 'removed' enthaltenen Singleton Dimensionen des Subtrees mit Wurzel 'node' und traegt den
+    verbleibenden Subtree mit neuen Knotenbezeichnungen in 'U', 'B' und 'nodes' ein.
+    ______________________________________________________________________
+    Output:
+    ((int,...) | None, 1D torch.Tensor | None): Besteht der Subtree ausschliesslich aus zu entfernenden Dimensionen,
+            so ist der erste Eintrag None und der zweite Eintrag der Vektor, zu dem der Subtree kontrahiert wurde.
+            Ansonsten ist der erste Eintrag die neue Bezeichnung jenes Knotens, der den Subtree nun repraesentiert,
+            und der zweite Eintrag None.
     """
-    singletons = []
-    for leaf in sorted(dtree.get_leaves()):
-        if all(item in sdim for item in leaf):
-            # leaf ist Singleton
-            singletons += [leaf]
-    for single in singletons:
-        sibling = dtree.get_sibling(single)
-        if sibling in singletons:
-            return single
-    if singletons:
-        return singletons[0]
+    children = x.dtree.nodes[node]
+    if not children:
+        # Blattknoten
+        if node[0] in removed:
+            # Die Blattmatrix einer Singleton Dimension hat genau eine Zeile
+            return None, x.U[node][0, :]
+        new_node = (dim_map[node[0]],)
+        U[new_node] = x.U[node]
+        nodes[new_node] = []
+        return new_node, None
+
+    # Innerer Knoten
+    l, r = children
+    new_l, vec_l = _squeeze_subtree(x, l, removed, dim_map, U, B, nodes)
+    new_r, vec_r = _squeeze_subtree(x, r, removed, dim_map, U, B, nodes)
+
+    if new_l is None and new_r is None:
+        # Beide Subtrees wurden vollstaendig kontrahiert
+        vec = torch.tensordot(vec_l, x.B[node], dims=([0], [0]))
+        return None, torch.tensordot(vec_r, vec, dims=([0], [0]))
+
+    if new_l is not None and new_r is not None:
+        # Keiner der beiden Subtrees wurde vollstaendig kontrahiert
+        new_node = new_l + new_r
+        B[new_node] = x.B[node]
+        nodes[new_node] = [new_l, new_r]
+        return new_node, None
+
+    # Genau einer der beiden Subtrees wurde vollstaendig kontrahiert
+    # Der Knoten geht dann im verbliebenen Kind auf, welches den Transfertensor des Knotens uebernimmt
+    if new_l is None:
+        M = torch.tensordot(vec_l, x.B[node], dims=([0], [0]))
+        kept = new_r
+    else:
+        M = torch.tensordot(vec_r, x.B[node], dims=([0], [1]))
+        kept = new_l
+    if nodes[kept]:
+        B[kept] = torch.tensordot(B[kept], M, dims=([2], [0]))
+    else:
+        U[kept] = U[kept] @ M
+    return kept, None
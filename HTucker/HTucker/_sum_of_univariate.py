@@ -0,0 +1,52 @@
+import torch
+from .dimtree import dimtree
+from ._outer import _check_vectors
+
+
+def sum_of_univariate(cls, vectors: list, base: list = None):
+    """
+    Erzeugt den hierarchischen Tuckertensor
+        x = sum_mu b_0 x ... x b_{mu-1} x f_mu x b_{mu+1} x ... x b_{d-1}
+    mit f_mu = vectors[mu] und b_mu = base[mu] exakt mit Rang 2 auf dem kanonischen Dimensionsbaum, ohne den vollen
+    Tensor zu berechnen. Ist 'base' None, so sind alle b_mu Einsvektoren und x ist die Summe univariater Funktionen
+    x[i_0,...,i_{d-1}] = f_0[i_0] + ... + f_{d-1}[i_{d-1}]. Mit allgemeinem 'base' ergeben sich Laplace-artige
+    Kroneckersummen.
+    Konstruktion: Die Blattmatrix von mu ist [b_mu, f_mu]. Die erste Spalte des Frames eines Knotens t ist das aeussere
+    Produkt der b_mu ueber t, die zweite die Summe ueber t. Entsprechend gilt fuer die Transfertensoren
+    B_t[0,0,0] = B_t[1,0,1] = B_t[0,1,1] = 1 und fuer die Wurzel B[1,0,0] = B[0,1,0] = 1.
+    ______________________________________________________________________
+    Parameter:
+    - vectors [1D torch.Tensor,...]: Die univariaten Anteile f_mu.
+    - base [1D torch.Tensor,...] | None: Die Basisvektoren b_mu mit denselben Laengen wie 'vectors'.
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der hierarchische Tuckertensor mit shape (len(f_0), ..., len(f_{d-1})).
+    ______________________________________________________________________
+    Beispiel:
+                      HTucker.HTTensor         <~~~>          torch.Tensor
+    f, g = torch.randn(3), torch.randn(4)
+    x = HTTensor.sum_of_univariate([f, g])     |           x = f[:, None] + g[None, :]
+    """
+    _check_vectors(vectors, "vectors")
+    if base is None:
+        base = [torch.ones_like(v) for v in vectors]
+    _check_vectors(base, "base")
+    if len(base) != len(vectors) or any(b.shape != v.shape for b, v in zip(base, vectors)):
+        raise ValueError("Argument 'base': Die shapes von base und vectors stimmen nicht ueberein.")
+    if base[0].dtype != vectors[0].dtype or base[0].device != vectors[0].device:
+        raise ValueError("Argument 'base': base und vectors stimmen in dtype oder device nicht ueberein.")
+
+    dtype, device = vectors[0].dtype, vectors[0].device
+    dtree = dimtree.get_canonic_dimtree(len(vectors))
+    U = {leaf: torch.stack([base[leaf[0]], vectors[leaf[0]]], dim=1) for leaf in dtree.get_leaves()}
+    B = {}
+    for node in dtree.get_nodes():
+        if dtree.is_leaf(node):
+            continue
+        if dtree.is_root(node):
+            B[node] = torch.zeros(2, 2, 1, dtype=dtype, device=device)
+            B[node][1, 0, 0] = B[node][0, 1, 0] = 1.0
+        else:
+            B[node] = torch.zeros(2, 2, 2, dtype=dtype, device=device)
+            B[node][0, 0, 0] = B[node][1, 0, 1] = B[node][0, 1, 1] = 1.0
+    return cls._new(U=U, B=B, dtree=dtree, is_orthog=False)
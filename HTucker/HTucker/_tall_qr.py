@@ -0,0 +1,107 @@
+import torch
+from concurrent.futures import ThreadPoolExecutor
+
+# Verfuegbare QR Verfahren (siehe tall_qr)
+_QR_METHODS = ("householder", "cholesky", "tsqr", "auto")
+# Die Verfahren "cholesky" und "tsqr" werden nur fuer Matrizen mit mindestens _MIN_ASPECT mal so vielen Zeilen wie
+# Spalten verwendet. Fuer alle anderen Matrizen ist Householder ohnehin guenstig.
+_MIN_ASPECT = 8
+# Im Modus "auto" wird CholeskyQR2 erst ab dieser Zeilenanzahl verwendet
+_AUTO_MIN_ROWS = 4096
+# Standardmaessige Anzahl an Zeilen pro Block der blockweisen Verfahren
+_BLOCK_ROWS = 65536
+
+
+def tall_qr(x: torch.Tensor, method: str = "householder", block_rows: int = None, num_threads: int = None):
+    """
+    Berechnet die reduzierte QR Zerlegung der Matrix 'x'. Neben der Householder QR Zerlegung (torch.linalg.qr) stehen
+    fuer hohe, schmale Matrizen (z.B. Blattmatrizen mit Modusgroesse 10^5-10^6 und Rang <= 50) zwei schnellere
+    Verfahren zur Verfuegung:
+    - "cholesky": CholeskyQR2. Die Gram-Matrix x.T@x wird blockweise akkumuliert, per Cholesky zerlegt und die
+                  Orthogonalisierung zur Stabilisierung einmal wiederholt. Ist die Gram-Matrix schlecht konditioniert,
+                  so wird automatisch auf Householder zurueckgegriffen.
+    - "tsqr":     Block TSQR. Die Zeilenbloecke werden in parallelen Threads QR zerlegt und die gestapelten R Faktoren
+                  anschliessend erneut zerlegt. Das Verfahren ist so stabil wie Householder.
+    - "auto":     CholeskyQR2 fuer hinreichend hohe, schmale Matrizen, ansonsten Householder.
+    Da beide Verfahren zeilenblockweise arbeiten, eignen sie sich auch fuer speichergemappte Blattmatrizen.
+    ______________________________________________________________________
+    Parameter:
+    - x 2D torch.Tensor
+    - method str: Eines von "householder", "cholesky", "tsqr" oder "auto".
+    - block_rows int | None: Die Anzahl der Zeilen pro Block. Standardmaessig 65536.
+    - num_threads int | None: Die Anzahl der Threads fuer die Zeilenbloecke. Standardmaessig
+                              torch.get_num_threads().
+    ______________________________________________________________________
+    Output:
+    (2D torch.Tensor, 2D torch.Tensor): Die Faktoren Q und R der reduzierten QR Zerlegung.
+    ______________________________________________________________________
+    Beispiel:
+    x = torch.randn(10**6, 20)
+    Q, R = HTTensor.tall_qr(x, method="cholesky")
+    """
+    if method not in _QR_METHODS:
+        raise ValueError("Argument 'method': method={} | method ist keines der Verfahren {}.".format(method,
+                                                                                                    _QR_METHODS))
+    if block_rows is not None and (not isinstance(block_rows, int) or block_rows <= 0):
+        raise ValueError("Argument 'block_rows': block_rows={} | block_rows ist kein positiver int.".format(block_rows))
+    if num_threads is not None and (not isinstance(num_threads, int) or num_threads <= 0):
+        raise ValueError("Argument 'num_threads': num_threads={} | num_threads ist kein positiver"
+                         " int.".format(num_threads))
+
+    rows, cols = x.shape
+    if method == "auto":
+        method = "cholesky" if rows >= _AUTO_MIN_ROWS else "householder"
+    if method == "householder" or rows < _MIN_ASPECT * cols or cols == 0:
+        return torch.linalg.qr(x, mode="reduced")
+
+    # Die Bloecke muessen mindestens so viele Zeilen wie x Spalten haben
+    block_rows = max(_BLOCK_ROWS if block_rows is None else block_rows, cols)
+    blocks = list(torch.split(x, block_rows, dim=0))
+    num_threads = torch.get_num_threads() if num_threads is None else num_threads
+
+    with ThreadPoolExecutor(max_workers=min(num_threads, len(blocks))) as pool:
+        if method == "tsqr":
+            return _tsqr(blocks, pool)
+        Q, R = _cholesky_qr(blocks, pool)
+        if Q is None:
+            # Die Gram-Matrix ist schlecht konditioniert
+            return torch.linalg.qr(x, mode="reduced")
+        Q, R2 = _cholesky_qr(list(torch.split(Q, block_rows, dim=0)), pool)
+        if Q is None:
+            return torch.linalg.qr(x, mode="reduced")
+        return Q, R2 @ R
+
+
+def _cholesky_qr(blocks: list, pool: ThreadPoolExecutor):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion tall_qr.
+    Ein Schritt CholeskyQR auf der in Zeilenbloecke 'blocks' zerlegten Matrix. Gibt (None, None) zurueck, falls die
+    Gram-Matrix numerisch nicht positiv definit oder so schlecht konditioniert ist, dass auch CholeskyQR2 keine
+    orthonormale Basis liefert (Konditionszahl der Matrix groesser als ca. eps^(-1/2)).
+    """
+    G = sum(pool.map(lambda block: block.T @ block, blocks))
+    R, info = torch.linalg.cholesky_ex(G, upper=True)
+    if info.item() != 0:
+        return None, None
+    # Die Diagonale von R liefert eine untere Schranke der Konditionszahl
+    diag = torch.abs(torch.diagonal(R))
+    if diag.min() <= torch.finfo(R.dtype).eps ** 0.5 * diag.max():
+        return None, None
+    Q = torch.cat(list(pool.map(lambda block: torch.linalg.solve_triangular(R, block, upper=True, left=False),
+                                blocks)), dim=0)
+    return Q, R
+
+
+def _tsqr(blocks: list, pool: ThreadPoolExecutor):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion tall_qr.
+    Block TSQR auf der in Zeilenbloecke 'blocks' zerlegten Matrix.
+    """
+    local = list(pool.map(lambda block: torch.linalg.qr(block, mode="reduced"), blocks))
+    # QR Zerlegung der gestapelten R Faktoren der Bloecke
+    Q_R, R = torch.linalg.qr(torch.cat([R_i for _, R_i in local], dim=0), mode="reduced")
+    offsets = [0]
+    for _, R_i in local:
+        offsets.append(offsets[-1] + R_i.shape[0])
+    Q = torch.cat(list(pool.map(lambda i: local[i][0] @ Q_R[offsets[i]:offsets[i + 1]], range(len(local)))), dim=0)
+    return Q, R
@@ -1,14 +1,15 @@
 import torch
 from .dimtree import dimtree
-from copy import deepcopy
+from ._rotate import (_get_gather_plan, _get_transform_plan, _plan_cost, _execute_plan, _get_node, _get_parents,
+                      _freeze)
 
 
-def tensordot(self, y, dims: list = None):
+def tensordot(self, y, dims: list = None, opts: dict = None):
     """
     Berechnet die Tensorkontraktion der beiden hierarchischen Tuckertensoren 'self' und 'y' entlang der in 'dims'
     definierten Dimensionen.
-    Hinweis: Die Kontraktion zweier Tensoren 'x' und 'y'. im hierarchischen Tuckerformat ist nur in folgenden Faellen
-    moeglich:
+    Hinweis: Die Kontraktion zweier Tensoren 'x' und 'y' im hierarchischen Tuckerformat ist direkt in folgenden
+    Faellen moeglich:
     1. a) In 'x' gibt es einen Knoten, der entweder genau die Dimensionen, die zu kontrahieren sind oder genau die
           Dimensionen, die nicht zu kontrahieren sind, enthaelt. Das Gleiche gilt fuer 'y'.
     ODER
@@ -17,15 +18,35 @@ def tensordot(self, y, dims: list = None):
           entspricht. Fuer diese beiden Knoten gilt entweder, dass ihre beiden Elternknoten Kinder der Wurzel sind oder
           dass der Elternknoten des Einen Geschwisterknoten des Anderen ist. Die Rollen von 'x' und 'y' sind
           austauschbar.
-    UND
-    2) Die zu kontrahierenden Abschnitte der Dimensionsbaeume sind kompatibel.
+    In allen anderen Faellen werden die Dimensionsbaeume von 'x' und 'y' zunaechst durch exakte lokale Rotationen so
+    umstrukturiert, dass Fall 1. a) vorliegt. Ebenso werden die zu kontrahierenden Abschnitte der Dimensionsbaeume
+    bei Bedarf aneinander angepasst. Aus den moeglichen Umstrukturierungen wird jeweils diejenige mit dem geringsten
+    geschaetzten Aufwand (abhaengig von den hierarchischen Raengen) gewaehlt. Die Raenge der umstrukturierten Knoten
+    koennen dabei anwachsen.
     ______________________________________________________________________
     Parameter:
     - y HTucker.HTTensor: Der mit 'self' zu kontrahierende hierarchische Tuckertensor.
     - dims [[int,...], [int,...]]: Die zu kontrahierenden Dimensionen von 'self' (dims[0]) und 'y' (dims[1]).
+    - opts dict: Ist 'opts' nicht None, wird das Ergebnis en passant entsprechend der Constraints in 'opts' gekuerzt.
+                 Dabei werden lediglich jene Blattmatrizen und Transfertensoren neu orthogonalisiert, die waehrend der
+                 Kontraktion veraendert wurden. Die unveraenderten Kerne orthogonaler Operanden werden uebernommen.
+                 Hinweis: Gekuerzt wird erst das vollstaendig zusammengesetzte Ergebnis. Die Umstrukturierungen der
+                 Operanden im allgemeinen Fall sind exakt, sodass dabei anwachsende Raenge der Zwischenergebnisse
+                 nicht gekuerzt werden.
+                 Moegliche Constraints sind:
+                                    - "max_rank": positiver integer | Legt den maximalen hierarchischen Rang
+                                                  fest
+                                    - "err_tol_abs": positiver float | Legt die einzuhaltende absolute
+                                                     Fehlertoleranz fest
+                                    - "err_tol_rel": positiver float | Left die einzuhaltende relative
+                                                     Fehlertoleranz fest
+                                    - "report": bool | Gibt zusaetzlich einen Kuerzungsbericht zurueck
+                                                     (siehe HTTensor.truncate_htt)
     ______________________________________________________________________
     Output:
-    (HTucker.HTTensor,): Der resultierende kontrahierte hierarchische Tuckertensor.
+    (HTucker.HTTensor,): Der resultierende kontrahierte hierarchische Tuckertensor. Ist opts["report"] True und das
+                         Ergebnis ein hierarchischer Tuckertensor, so wird das Tupel (Ergebnis, Kuerzungsbericht)
+                         zurueckgegeben.
     ______________________________________________________________________
     Beispiel:
                       HTucker.HTTensor         <~~~>          torch.Tensor
@@ -46,6 +67,13 @@ def tensordot(self, y, dims: list = None):
        y = HTTensor.randn((2,5,7,3,6))           |           y = torch.randn(2,5,7,3,6)
        prod = x.tensordot(y, [[0,2,3], [3,1,4]]) |           prod = torch.tensordot(x, y, [[0,2,3], [3,1,4]])
        prod.shape    # = (4,2,7)                 |           prod.shape    # = torch.size([4,2,7])
+
+    d) Mit en passant Rangkuerzung
+       x = HTTensor.randn((3,4,5,6))             |           x = torch.randn(3,4,5,6)
+       y = HTTensor.randn((2,5,7,3,6))           |           y = torch.randn(2,5,7,3,6)
+       opts = {"err_tol_rel": 1e-6}              |           prod = torch.tensordot(x, y, [[0,2,3], [3,1,4]])
+       prod = x.tensordot(y, [[0,2,3], [3,1,4]], |
+                          opts)                  |
     """
 
     # Argumentchecks
@@ -74,9 +102,36 @@ def tensordot(self, y, dims: list = None):
                          "gegeben durch {} und {} sind nicht kompatibel."
                          .format([self.get_shape()[dim] for dim in dims[0]], [y.get_shape()[dim] for dim in dims[1]]))
 
-    # Kopiere self und y
-    x = deepcopy(self)
-    y = deepcopy(y)
+    if opts is not None:
+        self._check_opts(opts)
+
+    # Kontraktion
+    z = _contract(self, y, dims)
+
+    # En passant Rangkuerzung des Ergebnisses
+    if opts is not None and isinstance(z, type(self)):
+        # Die Kerne (ausser der Wurzel) orthogonaler Operanden sind orthonormal. Werden diese waehrend der Kontraktion
+        # nicht veraendert, muessen sie fuer die Rangkuerzung nicht erneut orthogonalisiert werden
+        orthonormal = set()
+        for item in [self, y]:
+            if item.is_orthog:
+                orthonormal |= {id(mat) for mat in item.U.values()}
+                orthonormal |= {id(tens) for node, tens in item.B.items() if not item.dtree.is_root(node)}
+        report = _truncate_contracted(z, opts, orthonormal)
+        if report is not None:
+            return z, report
+    return z
+
+
+def _contract(self, y, dims: list):
+    """
+    Hinweis: Das ist eine interne Funktion der Funktion HTTensor.tensordot
+    Berechnet die Kontraktion von 'self' und 'y' entlang der bereits geprueften Dimensionen 'dims'.
+    """
+    # Flache Kopien von self und y. Die Kerne werden waehrend der Kontraktion nicht in-place veraendert, weswegen
+    # ein deepcopy nicht notwendig ist
+    x = _shallow_copy(self)
+    y_orig, y = y, _shallow_copy(y)
 
     # Aus Lesbarkeitsgruenden
     dims_x = dims[0]
@@ -119,6 +174,7 @@ def tensordot(self, y, dims: list = None):
             dims_x, dims_y = dims_y, dims_x
             roots_x, roots_y = roots_y, roots_x
             compl_roots_x, compl_roots_y = compl_roots_y, compl_roots_x
+            dtx = x.dtree
 
         node_x_child = -7
         if len(roots_x) == 2:
@@ -141,15 +197,132 @@ def tensordot(self, y, dims: list = None):
             elif dtx.get_parent(compl_parent0) == dtx.get_root() and dtx.get_parent(compl_parent1) == dtx.get_root():
                 node_x_child = compl_parent0
 
-        # Kontraktion ist nicht moeglich
-        if node_x_child == -7:
-            raise RuntimeError("Die Kontraktion kann fuer diesen Fall nicht im hierarchischen Tuckerformat "
-                               "berechnet werden.")
+        if node_x_child != -7:
+            try:
+                return _two_nodes(x, y, dims_x, dims_y, node_x_child)
+            except RuntimeError:
+                # Die Spezialbehandlung ist nicht anwendbar. Es wird auf den allgemeinen Fall ausgewichen
+                pass
 
-        return _two_nodes(x, y, dims_x, dims_y, node_x_child)
-    else:
-        raise RuntimeError("Die Kontraktion kann fuer diesen Fall nicht im hierarchischen Tuckerformat "
-                           "berechnet werden.")
+    # Allgemeiner Fall
+    # Die Dimensionsbaeume von x und y werden durch lokale Rotationen so umstrukturiert, dass Fall a) vorliegt
+    x, y = _shallow_copy(self), _shallow_copy(y_orig)
+    node_x, compl_x = _gather_cheapest(x, dims[0])
+    node_y, compl_y = _gather_cheapest(y, dims[1])
+    return _one_node(x, y, dims[0], dims[1], node_x, node_y, compl_x, compl_y)
+
+
+def _truncate_contracted(z, opts: dict, orthonormal: set):
+    """
+    Hinweis: Das ist eine interne Funktion der Funktion HTTensor.tensordot
+    Kuerzt das Kontraktionsergebnis 'z' entsprechend der Constraints in 'opts'. Die Aenderungen werden direkt auf 'z'
+    durchgefuehrt und der Kuerzungsbericht von truncate_htt zurueckgegeben. Dazu wird 'z' zunaechst orthogonalisiert,
+    wobei Blattmatrizen und Transfertensoren, deren id in 'orthonormal' enthalten ist und deren Kinder unveraendert
+    blieben, bereits orthonormal sind und daher uebersprungen werden.
+    """
+    # Dict fuer die R Matrizen der QR-Zerlegungen
+    R = {}
+
+    # Iteriere den Dimensionsbaum bottom-up
+    for level in range(z.dtree.get_depth(), -1, -1):
+        for node in z.dtree.get_nodes_of_lvl(level):
+            if z.dtree.is_leaf(node):
+                if id(z.U[node]) not in orthonormal:
+                    z.U[node], R[node] = torch.linalg.qr(z.U[node], mode="reduced")
+                continue
+            l, r = z.dtree.get_children(node)
+            touched = id(z.B[node]) not in orthonormal
+            # Multipliziere die R Matrizen der Kinder in den Transfertensor
+            if l in R:
+                z.B[node] = torch.tensordot(R.pop(l), z.B[node], dims=([1], [0]))
+                touched = True
+            if r in R:
+                z.B[node] = torch.tensordot(R.pop(r), z.B[node], dims=([1], [1]))
+                z.B[node] = torch.movedim(z.B[node], source=0, destination=1)
+                touched = True
+            if touched and not z.dtree.is_root(node):
+                shape = z.B[node].shape
+                Q, R[node] = torch.linalg.qr(z.matricise(z.B[node], t=(0, 1)), mode="reduced")
+                z.B[node] = z.dematricise(Q, shape=(shape[0], shape[1], Q.shape[1]), t=(0, 1))
+    z.is_orthog = True
+
+    # Rangkuerzung des nun orthogonalen hierarchischen Tuckertensors
+    # Ist opts["report"] True, so wird der Kuerzungsbericht zurueckgegeben
+    return z.truncate_htt(opts)
+
+
+def _shallow_copy(x):
+    """
+    Hinweis: Das ist eine interne Funktion der Funktion HTTensor.tensordot
+    Erzeugt eine flache Kopie von 'x'. Die dicts und der Dimensionsbaum werden kopiert, waehrend die Blattmatrizen und
+    Transfertensoren geteilt werden.
+    """
+    z = type(x)._new(U=dict(x.U), B=dict(x.B), dtree=type(x.dtree)._new(dict(x.dtree.nodes)),
+                     is_orthog=x.is_orthog)
+    z._dirty = set(x._dirty)
+    # Die geteilten Kerne liegen ggf. weiterhin in der Arena von x
+    z._arena, z._arena_offsets = x._arena, x._arena_offsets
+    return z
+
+
+def _gather_cheapest(x, dims: list):
+    """
+    Hinweis: Das ist eine interne Funktion der Funktion HTTensor.tensordot
+    Strukturiert den Dimensionsbaum von 'x' durch lokale Rotationen so um, dass entweder die Dimensionen aus 'dims'
+    oder deren Komplement von genau einem Knoten repraesentiert werden. Von beiden Moeglichkeiten wird jene mit dem
+    geringeren geschaetzten Aufwand gewaehlt. Die Aenderungen werden direkt auf 'x' durchgefuehrt.
+    ______________________________________________________________________
+    Output:
+    ((int,...), bool): Der Knoten, der die Dimensionen repraesentiert, und ob es sich dabei um das Komplement handelt.
+    """
+    root = frozenset(x.dtree.get_root())
+    rank = {frozenset(node): r for node, r in x.get_rank().items()}
+    candidates = []
+    for compl, dims_ in [(False, frozenset(dims)), (True, root - frozenset(dims))]:
+        if not dims_:
+            continue
+        plan = _get_gather_plan(_freeze(x.dtree.nodes), root, dims_) if dims_ != root else ()
+        candidates += [(_plan_cost(x.dtree.nodes, rank, plan), compl, dims_, plan)]
+    _, compl, dims_, plan = min(candidates, key=lambda item: item[0])
+    _execute_plan(x, plan)
+    return _get_node(x.dtree.nodes, dims_), compl
+
+
+def _align_contracted_subtrees(x, y, dims_x: list, dims_y: list):
+    """
+    Hinweis: Das ist eine interne Funktion der Funktion HTTensor.tensordot
+    Stellt sicher, dass die rechten Subtrees der Wurzeln von 'x' und 'y', die die zu kontrahierenden Dimensionen
+    enthalten, dieselbe Struktur haben. Ist dies nicht der Fall, wird der Subtree mit dem geringeren geschaetzten
+    Aufwand durch lokale Rotationen an die Struktur des anderen angepasst. Die Aenderungen werden direkt auf 'x' bzw.
+    'y' durchgefuehrt.
+    """
+    sub_x = x.dtree.get_right(x.dtree.get_root())
+    sub_y = y.dtree.get_right(y.dtree.get_root())
+    x2y = dict(zip(dims_x, dims_y))
+    y2x = dict(zip(dims_y, dims_x))
+    # Struktur des jeweils anderen Subtrees in den Dimensionen des einen
+    target_y = _map_subtree(x.dtree.get_subtree(sub_x).nodes, x2y)
+    target_x = _map_subtree(y.dtree.get_subtree(sub_y).nodes, y2x)
+    if {frozenset(node) for node in target_y} == {frozenset(node) for node in y.dtree.get_subtree(sub_y).nodes}:
+        # Die Subtrees sind bereits kompatibel
+        return
+    candidates = []
+    for z, target in [(y, target_y), (x, target_x)]:
+        target_root = [node for node in target if node not in _get_parents(target)][0]
+        plan = _get_transform_plan(_freeze(z.dtree.nodes), _freeze(target), target_root)
+        rank = {frozenset(node): r for node, r in z.get_rank().items()}
+        candidates += [(_plan_cost(z.dtree.nodes, rank, plan), z, plan)]
+    _, z, plan = min(candidates, key=lambda item: item[0])
+    _execute_plan(z, plan)
+
+
+def _map_subtree(nodes: dict, mapping: dict):
+    """
+    Hinweis: Das ist eine interne Funktion der Funktion HTTensor.tensordot
+    Benennt die Knoten der Knotenhierarchie 'nodes' entsprechend des Dimensionsmappings 'mapping' um.
+    """
+    return {tuple(mapping[dim] for dim in k): [tuple(mapping[dim] for dim in child) for child in v]
+            for k, v in nodes.items()}
 
 
 def _two_nodes(x, y, dims_x: list, dims_y: list, node_x_child: tuple):
@@ -197,10 +370,10 @@ def _two_nodes(x, y, dims_x: list, dims_y: list, node_x_child: tuple):
                            "berechnet werden.")
 
     # Berechne nun die Kontraktionen der subtrees
-    x_left = deepcopy(x)
+    x_left = _shallow_copy(x)
     x_left._change_root(node=dtx.get_children(left)[left_lr], lr="right")
     M_left = _get_contracted_connection_tensor(x_left, y, dims_x_left, dims_y_left)
-    x_right = deepcopy(x)
+    x_right = _shallow_copy(x)
     x_right._change_root(node=dtx.get_children(right)[right_lr], lr="right")
     M_right = _get_contracted_connection_tensor(x_right, y, dims_x_right, dims_y_right)
 
@@ -230,7 +403,7 @@ def _two_nodes(x, y, dims_x: list, dims_y: list, node_x_child: tuple):
     # 1.3) Knotenmapping anwenden
     new_nodes = {old2new[k]: [old2new[vv] for vv in v] for k, v in new_nodes.items()}
     # 1.4) Baum erzeugen
-    dtree = dimtree(new_nodes)
+    dtree = dimtree._new(new_nodes)
     # 2) Blattmatrixdict und Transfertensordict vorbereiten
     U = {old2new[leaf]: x.U[leaf] for leaf in subtree_left.get_leaves()}
     U.update({old2new[leaf]: x.U[leaf] for leaf in subtree_right.get_leaves()})
@@ -238,7 +411,7 @@ def _two_nodes(x, y, dims_x: list, dims_y: list, node_x_child: tuple):
     B.update({old2new[node]: x.B[node] for node in subtree_right.get_inner_nodes()})
     B[new_root] = M.unsqueeze(dim=2)
     # 3) Erstellen des resultierenden HTTensor Objekts
-    z = type(x)(U=U, B=B, dtree=dtree, is_orthog=False)
+    z = type(x)._new(U=U, B=B, dtree=dtree, is_orthog=False)
     return z
 
 
@@ -284,11 +457,14 @@ def _one_node(x, y, dims_x, dims_y, node_x, node_y, compl_x, compl_y):
     if node_y == rooty:
         if compl_y:
             # Die in _change_root hinzugefuegte Singleton Dimension wird fuer das anschliessende Kontrahieren markiert
-            dims_y = [len(x.get_shape()) - 1]
+            dims_y = [len(y.get_shape()) - 1]
         else:
             dims_y = [dim + 1 for dim in dims_y]
             squeeze_right = True
 
+    # Passe ggf. die Struktur der zu kontrahierenden Subtrees aneinander an
+    _align_contracted_subtrees(x, y, dims_x, dims_y)
+
     # Kontrahiere nun den linken/rechten Subtree von x mit dem linken/rechten Subtree von y
     C = _get_contracted_connection_tensor(x, y, dims_x, dims_y)
 
@@ -315,7 +491,7 @@ def _one_node(x, y, dims_x, dims_y, node_x, node_y, compl_x, compl_y):
     new_root = old2new_x[dtx.get_root()] + old2new_y[dty.get_root()]
     new_nodes[new_root] = [old2new_x[dtx.get_root()], old2new_y[dty.get_root()]]
     # 4.4) Erzeuge Dimensionsbaum
-    dtree = dimtree(nodes=new_nodes)
+    dtree = dimtree._new(nodes=new_nodes)
 
     # Konstruiere Blattmatrix dict
     U = {old2new_x[leaf]: x.U[leaf] for leaf in dtx.get_leaves()}
@@ -327,7 +503,7 @@ def _one_node(x, y, dims_x, dims_y, node_x, node_y, compl_x, compl_y):
     B[dtree.get_root()] = new_root_tensor
 
     # Erzeuge den zugehoerigen hierarchischen Tuckertensor
-    z = type(x)(U=U, B=B, dtree=dtree, is_orthog=False)
+    z = type(x)._new(U=U, B=B, dtree=dtree, is_orthog=False)
 
     # Entferne evtl. vorhandene Singleton Dimensions
     if squeeze_left and squeeze_right:
@@ -0,0 +1,117 @@
+import torch
+from math import sqrt
+
+
+def to_cp(self, rank: int, n_iter: int = 100, tol: float = 1e-8, seed: int = None):
+    """
+    Approximiert den hierarchischen Tuckertensor 'self' durch einen CP-Tensor vom Rang 'rank' mittels alternierender
+    kleinster Quadrate (CP-ALS), ohne den vollen Tensor zu berechnen. Die dafuer benoetigten Kontraktionen von 'self'
+    mit den Khatri-Rao Produkten der Faktormatrizen (MTTKRP) werden entlang des Dimensionsbaums berechnet:
+    Bottom-up wird der Frame jedes Knotens mit den Faktormatrizen seiner Dimensionen kontrahiert, die Kontraktion des
+    Komplements eines Blatts ergibt sich entlang des Pfades von der Wurzel. Nach der Aktualisierung einer
+    Faktormatrix werden lediglich die Kontraktionen auf dem Pfad zur Wurzel erneuert, sodass ein Schritt
+    O(Tiefe * r^3 * rank) statt O(prod n_mu) kostet.
+    Hinweis: Die Approximation im CP-Format ist i.A. schlecht gestellt. Das Ergebnis haengt von der zufaelligen
+             Initialisierung ab und ist nicht notwendigerweise optimal.
+    ______________________________________________________________________
+    Parameter:
+    - rank int: Der CP-Rang.
+    - n_iter int: Die maximale Anzahl an ALS-Sweeps.
+    - tol float: Die Iteration endet, sobald sich der Approximationsfehler um weniger als tol * ||self|| aendert.
+    - seed int | None: Seed der zufaelligen Initialisierung.
+    ______________________________________________________________________
+    Output:
+    ([2D torch.Tensor,...], 1D torch.Tensor): Die Faktormatrizen mit normierten Spalten und die Gewichte
+                                              (vgl. HTTensor.from_cp).
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.from_cp([torch.randn(10, 3), torch.randn(11, 3), torch.randn(12, 3)])
+    factors, weights = x.to_cp(3)
+    y = HTTensor.from_cp(factors, weights)    # y approximiert x
+    """
+    if not isinstance(rank, int):
+        raise TypeError("Argument 'rank': type(rank)={} | rank ist kein int.".format(type(rank)))
+    if rank < 1:
+        raise ValueError("Argument 'rank': rank={} | rank ist kein positiver int.".format(rank))
+    if not isinstance(n_iter, int) or n_iter < 1:
+        raise ValueError("Argument 'n_iter': n_iter={} | n_iter ist kein positiver int.".format(n_iter))
+    if not isinstance(tol, float) or tol < 0.0:
+        raise ValueError("Argument 'tol': tol={} | tol ist kein nicht-negativer float.".format(tol))
+
+    # Fuer bessere Lesbarkeit
+    x = self
+    nodes = x.dtree.nodes
+    root = x.dtree.get_root()
+    leaves = x.dtree.get_leaves()
+    dtype, device = x.B[root].dtype, x.B[root].device
+    parent = {child: node for node, children in nodes.items() for child in children}
+    bottom_up = [node for level in range(x.dtree.get_depth(), -1, -1) for node in x.dtree.get_nodes_of_lvl(level)]
+
+    # Zufaellige Initialisierung mit normierten Spalten
+    generator = torch.Generator().manual_seed(seed) if seed is not None else None
+    factors, grams = {}, {}
+    for leaf in leaves:
+        A = torch.randn(x.U[leaf].shape[0], rank, generator=generator, dtype=dtype).to(device)
+        factors[leaf] = A / torch.linalg.norm(A, dim=0)
+        grams[leaf] = factors[leaf].T @ factors[leaf]
+    weights = torch.ones(rank, dtype=dtype, device=device)
+
+    # Z[t]: Kontraktion des Frames von t mit dem Khatri-Rao Produkt der Faktormatrizen ueber t (r_t x rank)
+    Z = {}
+    for node in bottom_up:
+        _update_contraction(x, Z, factors, node)
+
+    norm = float(x.norm())
+    err_old = None
+    for _ in range(n_iter):
+        for leaf in leaves:
+            # Pfad von der Wurzel zum Blatt
+            path = [leaf]
+            while path[-1] in parent:
+                path.append(parent[path[-1]])
+            path = path[::-1]
+            # Kontraktion des Komplements von leaf (r_leaf x rank)
+            W = torch.ones(1, rank, dtype=dtype, device=device)
+            for node, child in zip(path[:-1], path[1:]):
+                l, r = nodes[node]
+                if child == l:
+                    W = torch.einsum("abk,bj,kj->aj", x.B[node], Z[r], W)
+                else:
+                    W = torch.einsum("abk,aj,kj->bj", x.B[node], Z[l], W)
+            # Loesung des Kleinste-Quadrate-Problems: A = MTTKRP @ (Hadamardprodukt der uebrigen Gram-Matrizen)^+
+            V = torch.ones(rank, rank, dtype=dtype, device=device)
+            for other in leaves:
+                if other != leaf:
+                    V = V * grams[other]
+            A = (x.U[leaf] @ W) @ torch.linalg.pinv(V)
+            # Die Spaltennormen werden in die Gewichte verschoben
+            weights = torch.linalg.norm(A, dim=0)
+            factors[leaf] = A / torch.where(weights > 0, weights, torch.ones_like(weights))
+            grams[leaf] = factors[leaf].T @ factors[leaf]
+            for node in path[::-1]:
+                _update_contraction(x, Z, factors, node)
+
+        # Approximationsfehler ||x - cp||^2 = ||x||^2 - 2 <x, cp> + ||cp||^2
+        V = torch.ones(rank, rank, dtype=dtype, device=device)
+        for leaf in leaves:
+            V = V * grams[leaf]
+        inner = float(Z[root][0] @ weights)
+        err = sqrt(max(norm ** 2 - 2 * inner + float(weights @ V @ weights), 0.0))
+        if err_old is not None and abs(err_old - err) <= tol * norm:
+            break
+        err_old = err
+    return [factors[(mu,)] for mu in range(len(leaves))], weights
+
+
+def _update_contraction(x, Z: dict, factors: dict, node: tuple):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion to_cp.
+    Berechnet die Kontraktion Z[node] des Frames von 'node' mit dem Khatri-Rao Produkt der Faktormatrizen aus den
+    Kontraktionen der Kinder neu.
+    """
+    children = x.dtree.nodes[node]
+    if not children:
+        Z[node] = x.U[node].T @ factors[node]
+    else:
+        l, r = children
+        Z[node] = torch.einsum("abk,aj,bj->kj", x.B[node], Z[l], Z[r])
@@ -0,0 +1,61 @@
+from .dimtree import dimtree
+from ._rotate import _get_transform_plan, _execute_plan, _freeze
+from ._tensordot import _shallow_copy
+
+
+def to_dimtree(self, dtree, opts: dict = None):
+    """
+    Ueberfuehrt den hierarchischen Tuckertensor 'self' in die durch den Dimensionsbaum 'dtree' vorgegebene
+    Dimensionshierarchie, ohne den vollen Tensor zu berechnen. Dazu wird der Dimensionsbaum von 'self' durch eine
+    Folge exakter lokaler Rotationen umstrukturiert. Ein orthogonaler hierarchischer Tuckertensor bleibt dabei
+    orthogonal. Die Folge der Rotationen wird pro Paar aus Quell- und Zieldimensionsbaum zwischengespeichert, sodass
+    wiederholte Umwandlungen zwischen denselben Dimensionsbaeumen guenstig sind.
+    Hinweis: Die Raenge der umstrukturierten Knoten koennen anwachsen. Ist 'opts' nicht None, wird das Ergebnis daher
+             im Anschluss entsprechend der Constraints in 'opts' gekuerzt.
+    ______________________________________________________________________
+    Parameter:
+    - dtree HTucker.dimtree: Der Zieldimensionsbaum. Er muss dieselben Blattknoten wie der Dimensionsbaum von 'self'
+                             besitzen.
+    - opts dict: Enthaelt keine oder mindestens eine der folgenden Optionen:
+                                    - "max_rank": positiver integer | Legt den maximalen hierarchischen Rang
+                                                  fest
+                                    - "err_tol_abs": positiver float | Legt die einzuhaltende absolute
+                                                     Fehlertoleranz fest
+                                    - "err_tol_rel": positiver float | Left die einzuhaltende relative
+                                                     Fehlertoleranz fest
+                                    - "report": bool | Gibt zusaetzlich einen Kuerzungsbericht zurueck
+                                                     (siehe HTTensor.truncate_htt)
+    ______________________________________________________________________
+    Output:
+    (HTucker.HTTensor,): Der hierarchische Tuckertensor mit Dimensionsbaum 'dtree'. Ist opts["report"] True, so wird
+                         das Tupel (hierarchischer Tuckertensor, Kuerzungsbericht) zurueckgegeben.
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6))
+    dtree = dimtree({(0,2,1,3): [(0,2), (1,3)], (0,2): [(0,), (2,)], (1,3): [(1,), (3,)],
+                     (0,): [], (1,): [], (2,): [], (3,): []})
+    y = x.to_dimtree(dtree)
+    y.dtree.is_equal(dtree)    # = True
+    torch.allclose(x.full(), y.full())    # = True
+    """
+    if not isinstance(dtree, dimtree):
+        raise TypeError("Argument 'dtree': type(dtree)={} | dtree ist kein Dimensionsbaum.".format(type(dtree)))
+    if set(dtree.get_leaves()) != set(self.dtree.get_leaves()):
+        raise ValueError("Argument 'dtree': Die Blattknoten von dtree stimmen nicht mit den Blattknoten"
+                         " des Dimensionsbaums von self ueberein.")
+    if opts is not None:
+        self._check_opts(opts)
+
+    # Flache Kopie von self
+    x = _shallow_copy(self)
+
+    # Bestimme die Rotationen (ggf. aus dem Zwischenspeicher) und fuehre sie aus
+    plan = _get_transform_plan(_freeze(x.dtree.nodes), _freeze(dtree.nodes), dtree.get_root())
+    _execute_plan(x, plan)
+
+    # Rangkuerzung
+    if opts is not None:
+        report = x.truncate_htt(opts)
+        if report is not None:
+            return x, report
+    return x
@@ -0,0 +1,41 @@
+import torch
+from .dimtree import dimtree
+
+
+def to_tt(self, opts: dict = None):
+    """
+    Berechnet die Tensor-Train (TT) Kerne des hierarchischen Tuckertensors 'self', ohne den vollen Tensor zu berechnen.
+    Ist der Dimensionsbaum von 'self' nicht degeneriert (siehe dimtree.get_degenerate_dimtree), so wird 'self' zuvor
+    mittels to_dimtree exakt umstrukturiert. Der k-te Kern ergibt sich aus der Blattmatrix von (k,) und dem
+    Transfertensor von (k, ..., d-1).
+    ______________________________________________________________________
+    Parameter:
+    - opts dict | None: Wird an to_dimtree weitergereicht, sodass die Raenge nach der Umstrukturierung gekuerzt werden.
+    ______________________________________________________________________
+    Output:
+    ([3D torch.Tensor,...],): Die TT-Kerne G_k mit shape (r_{k-1}, n_k, r_k), wobei r_{-1} = r_{d-1} = 1. Ist
+                              opts["report"] True, so wird das Tupel (TT-Kerne, Kuerzungsbericht) zurueckgegeben.
+    ______________________________________________________________________
+    Beispiel:
+    x = HTTensor.randn((3,4,5,6))
+    cores = x.to_tt()
+    torch.allclose(HTTensor.from_tt(cores).full(), x.full())    # = True
+    """
+    d = self.get_order()
+    target = dimtree.get_degenerate_dimtree(d)
+    report = None
+    if self.dtree.is_equal(target) and opts is None:
+        x = self
+    else:
+        x = self.to_dimtree(target, opts)
+        if isinstance(x, tuple):
+            x, report = x
+
+    cores = []
+    for k in range(d - 1):
+        # Kern (r_{k-1}, n_k, r_k) aus U_(k,) (n_k x a) und B_(k,...,d-1) (a x r_k x r_{k-1})
+        cores.append(torch.einsum("na,abc->cnb", x.U[(k,)], x.B[tuple(range(k, d))]))
+    cores.append(x.U[(d - 1,)].T.unsqueeze(2))
+    if report is not None:
+        return cores, report
+    return cores
@@ -1,6 +1,8 @@
 import torch
 from .dimtree import dimtree
 from math import sqrt
+from ._get_truncation_rank import _split_storage_opts
+from ._report import _pop_report, _record, _finish_report, _merge_reports
 
 def truncate(cls, x: torch.Tensor, opts: dict=None):
         """
@@ -17,9 +19,16 @@ def truncate(cls, x: torch.Tensor, opts: dict=None):
                                                              Fehlertoleranz fest
                                             - "err_tol_rel": positiver float | Left die einzuhaltende relative
                                                              Fehlertoleranz fest
+                                            - "max_nbytes", "max_params": positiver integer | Legt ein
+                                                             Speicherbudget fest, das im Anschluss mittels
+                                                             truncate_htt durchgesetzt wird
+                                            - "report": bool | Gibt zusaetzlich einen Kuerzungsbericht zurueck
+                                                             (siehe HTTensor.truncate_htt)
+                                            Die keys "error_allocation" und "rounding" werden nicht unterstuetzt.
         ______________________________________________________________________
         Output:
-        (HTucker.HTTensor,): Das (ranggekuerzte) hierarchische Tuckerformat zu 'x'.
+        (HTucker.HTTensor,): Das (ranggekuerzte) hierarchische Tuckerformat zu 'x'. Ist opts["report"] True, so wird
+                             das Tupel (hierarchisches Tuckerformat, Kuerzungsbericht) zurueckgegeben.
         ______________________________________________________________________
         Beispiel:
         a)
@@ -51,6 +60,17 @@ def truncate(cls, x: torch.Tensor, opts: dict=None):
         # Argumentchecks: opts
         if opts is not None:
             cls._check_opts(opts)
+            unsupported = [k for k in ("error_allocation", "rounding") if k in opts]
+            if unsupported:
+                raise ValueError("Argument 'opts': Die keys {} werden von truncate nicht"
+                                 " unterstuetzt.".format(unsupported))
+        # Kuerzungsbericht, sofern angefordert
+        opts, report = _pop_report(opts)
+        requested_opts = opts
+        # Ein Speicherbudget wird erst auf dem Ergebnis durchgesetzt
+        opts, storage_opts = _split_storage_opts(opts)
+        # Gekuerzt wird nur, wenn opts einen Rang- oder Fehler-Constraint enthaelt
+        truncating = opts is not None and any(k in opts for k in ("max_rank", "err_tol_abs", "err_tol_rel"))
 
         # Anpassen der Fehlertoleranzen in opts
         # Soll global der Fehler e eingehalten werden, muss der Kuerzungsfehler pro Knoten
@@ -78,9 +98,10 @@ def truncate(cls, x: torch.Tensor, opts: dict=None):
             # Berechnung der Blattmatrix U_t
             x_as_matrix = cls.matricise(x, t)
             U[t], sv = cls.left_svd_qr(x_as_matrix)#,_ = torch.linalg.svd(x_as_matrix, full_matrices=False)# cls.left_svd_qr(...)
-            if opts:
+            if truncating:
                 # Rangkuerzung
                 U[t] = U[t][:, :cls._get_truncation_rank(sv, opts)]
+            _record(report, t, sv, U[t].shape[1])
             # Aktualisierung des rank dicts
             rank[t] = U[t].shape[1]
             # Aktualisierung des Kerntensors C
@@ -104,9 +125,10 @@ def truncate(cls, x: torch.Tensor, opts: dict=None):
                 else:
                     C_as_matrix = cls.matricise(C, t)
                     B[t], sv = cls.left_svd_qr(C_as_matrix)#, _ = torch.linalg.svd(C_as_matrix, full_matrices=False) # cls.left_svd_qr(...)
-                    if opts:
+                    if truncating:
                         # Rangkuerzung
                         B[t] = B[t][:, :cls._get_truncation_rank(sv, opts)]
+                    _record(report, t, sv, B[t].shape[1])
                     # Aktualisierung des rank dicts
                     rank[t] = B[t].shape[1]
                     # Aktualisierung des Kerntensors
@@ -122,5 +144,15 @@ def truncate(cls, x: torch.Tensor, opts: dict=None):
                 rank_right_child = rank[dtree.get_right(t)]
                 B[t] = cls.dematricise(B[t], (rank_left_child, rank_right_child, rank[t]), (0, 1))
             C = C_new
-        
-        return cls(U=U, B=B, dtree=dtree, is_orthog=True)
\ No newline at end of file
+
+        z = cls._new(U=U, B=B, dtree=dtree, is_orthog=True)
+        if report is not None:
+            report = _finish_report(report, requested_opts, torch.linalg.norm(x))
+        if storage_opts is not None:
+            if report is None:
+                z.truncate_htt(storage_opts)
+            else:
+                report = _merge_reports(report, z.truncate_htt({**storage_opts, "report": True}), requested_opts)
+        if report is not None:
+            return z, report
+        return z
\ No newline at end of file
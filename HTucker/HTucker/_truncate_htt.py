@@ -1,6 +1,9 @@
 import torch
 from copy import deepcopy
 from math import sqrt
+from ._report import _pop_report, _record, _finish_report
+from ._round_randomized import _round_randomized
+from ._truncation_stats import _count
 
 
 def truncate_htt(self, opts: dict):
@@ -16,9 +19,55 @@ def truncate_htt(self, opts: dict):
                                                      Fehlertoleranz fest
                                     - "err_tol_rel": positiver float | Left die einzuhaltende relative
                                                      Fehlertoleranz fest
+                                    - "mixed_precision": bool | Berechnet die reduzierten Gram'schen Matrizen
+                                                     samt Spektralzerlegungen in torch.float64, waehrend die
+                                                     Blattmatrizen und Transfertensoren ihren dtype (z.B.
+                                                     torch.float32) behalten
+                                    - "error_allocation": "uniform" | "global" | Bei "uniform" (Standard) wird
+                                                     die Fehlertoleranz gleichmaessig auf die Knoten aufgeteilt.
+                                                     Bei "global" werden zunaechst die Singulaerwerte aller Knoten
+                                                     berechnet und das Fehlerbudget gierig dorthin verteilt, wo es
+                                                     die meisten Raenge einspart. Die globale Fehlerschranke bleibt
+                                                     dieselbe, die Raenge fallen aber i.A. deutlich kleiner aus
+                                    - "max_nbytes": positiver integer | Legt den maximalen Speicherbedarf aller
+                                                     Kerne in Byte fest (vgl. HTTensor.nbytes)
+                                    - "max_params": positiver integer | Legt die maximale Anzahl an Eintraegen
+                                                     aller Kerne fest
+                                                     Die Raenge werden dabei ausgehend von den uebrigen Constraints
+                                                     gierig so verringert, dass der zusaetzliche Fehler pro
+                                                     eingespartem Eintrag minimal ist
+                                    - "rounding": "gramian" | "randomized" | Bei "gramian" (Standard) werden
+                                                     die Raenge ueber die reduzierten Gram'schen Matrizen bestimmt.
+                                                     Bei "randomized" wird 'self' stattdessen mittels zufaelliger
+                                                     Khatri-Rao Skizzen bottom-up direkt auf den Rang "max_rank"
+                                                     gerundet, ohne vorab zu orthogonalisieren oder Gram'sche
+                                                     Matrizen zu berechnen. Dies ist deutlich guenstiger, wenn die
+                                                     Raenge (z.B. nach plus) ein Vielfaches des Zielrangs betragen.
+                                                     Erfordert "max_rank" und unterstuetzt keine Fehlertoleranzen
+                                                     und kein Speicherbudget
+                                    - "seed": nicht-negativer integer | Seed der Zufallsskizzen bei
+                                                     "rounding"="randomized". Die Skizzen werden einem lokalen
+                                                     Zufallszahlengenerator entnommen, sodass der globale
+                                                     Zufallszahlengenerator von torch unberuehrt bleibt
+                                    - "report": bool | Gibt einen Kuerzungsbericht zurueck (siehe unten)
     ______________________________________________________________________
     Output:
-    None
+    None | dict: Ist opts["report"] True, so wird ein Kuerzungsbericht zurueckgegeben. Dieser enthaelt pro Knoten die
+                 Raenge vor ("rank_before") und nach ("rank_after") der Kuerzung sowie die Norm der verworfenen
+                 Singulaerwerte ("discarded"), ferner die a-posteriori Fehlerschranke ("error_bound"), die Norm vor
+                 der Kuerzung ("norm"), die angeforderte Toleranz ("err_tol") und ob diese eingehalten wurde
+                 ("tol_met"). Eine Rekonstruktion mittels full() ist damit nicht noetig.
+                 Bei randomisierter Rundung bleibt "discarded" leer und "error_bound" ist der exakte Fehler
+                 sqrt(||x||^2 - ||x_trunc||^2), da x_trunc eine orthogonale Projektion von x ist.
+    Knoten, deren Rang unter 'opts' nicht sinken kann, werden uebersprungen: Liegt bei gegebener Fehlertoleranz der
+    kleinste Eigenwert der reduzierten Gram'schen Matrix nachweislich (Cholesky Zerlegung) oberhalb der quadrierten
+    Toleranz, so entfaellt die Spektralzerlegung. Aendert sich der Rang eines Knotens nicht, so entfaellt die
+    Aktualisierung seiner Basis und des Transfertensors seines Elternknotens. Kann kein Rang sinken, so kehrt
+    truncate_htt ohne Aenderung an 'self' zurueck. Abgesehen von dem Fall, dass alle Raenge bereits 1 sind, wird dies
+    erst nach Orthogonalisierung und Berechnung der reduzierten Gram'schen Matrizen festgestellt. Eine erneute Kuerzung
+    eines bereits gekuerzten Tensors mit denselben Constraints ist daher nicht kostenlos, es entfallen lediglich die
+    Aktualisierungen der Knoten. Anschliessend sind nur die Elternknoten gekuerzter Knoten nicht mehr
+    orthonormal. Die Zaehler dazu liefert HTTensor.get_truncation_stats.
     ______________________________________________________________________
     Beispiel:
     x = torch.randn(10,10,10,10)
@@ -27,43 +76,180 @@ def truncate_htt(self, opts: dict):
     opts = {"max_rank": 25, "err_tol_abs": 10.0}
     xh.truncate_htt(opts)
     xh.get_rank()    # = {(0, 1, 2, 3): 1, (0,): 10, (1,): 10, (2,): 10, (3,): 10, (0, 1): 25, (2, 3): 25}
+    report = xh.truncate_htt({"err_tol_rel": 1e-2, "report": True})
+    report["tol_met"]    # is True
+    y = xh.plus(xh).plus(xh)
+    y.truncate_htt({"max_rank": 25, "rounding": "randomized", "seed": 0})
     """
+    # Kuerzungsbericht, sofern angefordert
+    opts, report = _pop_report(opts)
+    requested_opts = opts
+    _count("calls")
+
+    if "rounding" in opts and opts["rounding"] == "randomized":
+        # Die Norm vor der Rundung wird nur fuer den Kuerzungsbericht benoetigt
+        norm = self.norm() if report is not None else None
+        rank_before = _round_randomized(self, opts)
+        # Das Ergebnis ist eine orthogonale Projektion auf verschachtelte orthonormale Basen
+        self.is_orthog = True
+        if report is None:
+            return None
+        rank_after = self.get_rank()
+        report["rank_before"] = rank_before
+        report["rank_after"] = {node: rank_after[node] for node in rank_before}
+        report = _finish_report(report, requested_opts, norm)
+        norm_after = torch.linalg.norm(self.B[self.dtree.get_root()])
+        report["error_bound"] = float(torch.sqrt(torch.clamp(norm ** 2 - norm_after ** 2, min=0)))
+        return report
 
     # Anpassen der Fehlertoleranzen in opts
     # Soll global der Fehler e eingehalten werden, muss der Kuerzungsfehler pro Knoten
     # kleiner gleich e / sqrt((Tensorordnung * 2 - 2)) bleiben
-    opts = {k: (v/sqrt(self.get_order()*2-3) if k in ["err_tol_abs", "err_tol_rel"]
-                else v) for k, v in opts.items()}
+    # Bei globaler Fehlerallokation wird das Budget stattdessen erst nach Berechnung aller Singulaerwerte verteilt
+    global_allocation = opts["error_allocation"] == "global" if "error_allocation" in opts else False
+    if not global_allocation:
+        opts = {k: (v/sqrt(self.get_order()*2-3) if k in ["err_tol_abs", "err_tol_rel"]
+                    else v) for k, v in opts.items()}
 
     # Fuer bessere Lesbarkeit
     x = self
+    nodes = [node for level in range(x.dtree.get_depth(), 0, -1) for node in x.dtree.get_nodes_of_lvl(level)]
+    _count("nodes", len(nodes))
+
+    # Sind bereits alle Raenge 1, so kann kein Rang mehr sinken
+    if report is None and all(rank == 1 for rank in x.get_rank().values()):
+        _count("skipped_calls")
+        _count("skipped_eigh", len(nodes))
+        _count("skipped_updates", len(nodes))
+        return None
 
     # Orthogonalisiere self, falls notwendig
     if not x.is_orthog:
         x.orthogonalize()
+    # Fuer den orthogonalen Tensor stimmt die Norm mit der Norm des Transfertensors der Wurzel ueberein
+    norm = torch.linalg.norm(x.B[x.dtree.get_root()])
+    # Hinweis: Die Orthogonalisierung kann Raenge oberhalb der Dimensionsgroessen verringern
+    ranks_before = x.get_rank()
 
     # Berechne die reduzierten Gram'schen Matrizen
-    G = x._get_gramians()
+    # Im mixed precision Modus geschieht dies in torch.float64, sodass die Kuerzungsraenge auch bei in
+    # torch.float32 gespeicherten Kernen stabil bestimmt werden
+    mixed_precision = opts["mixed_precision"] if "mixed_precision" in opts else False
+    G = x._get_gramians(torch.float64 if mixed_precision else None)
+
+    # Bei globaler Fehlerallokation oder Speicherbudget: Berechne die linken Singulaervektoren aller Knoten vorab und
+    # bestimme die Raenge auf Grundlage saemtlicher Singulaerwerte
+    # Hinweis: Da alle Gram'schen Matrizen zu Beginn berechnet werden, gilt die Schranke
+    #          ||x - x_trunc||^2 <= sum_t sum_{i > rank_t} sv_t[i]^2 unabhaengig von der Reihenfolge der Kuerzungen
+    storage_budget = "max_nbytes" in opts or "max_params" in opts
+    upfront = global_allocation or storage_budget
+    if upfront:
+        svd = {node: x.left_svd_gramian(G[node]) for node in x.dtree.get_nodes() if not x.dtree.is_root(node)}
+        svs = {node: sv for node, (_, sv) in svd.items()}
+        if global_allocation:
+            ranks = x._get_truncation_ranks_global(svs, opts)
+        elif any(k in opts for k in ["max_rank", "err_tol_abs", "err_tol_rel"]):
+            ranks = {node: int(x._get_truncation_rank(sv, opts)) for node, sv in svs.items()}
+        else:
+            ranks = {node: len(sv) for node, sv in svs.items()}
+        if storage_budget:
+            # Speicherbudget in Eintraegen, berechnet wie in HTTensor.nbytes
+            itemsize = x.B[x.dtree.get_root()].element_size()
+            max_params = min(opts["max_params"] if "max_params" in opts else float("inf"),
+                             opts["max_nbytes"] // itemsize if "max_nbytes" in opts else float("inf"))
+            sizes = {leaf: x.U[leaf].shape[0] for leaf in x.dtree.get_leaves()}
+            ranks = x._fit_ranks_to_budget(svs, ranks, x.dtree, sizes, max_params)
+
+    # Bestimme die Knoten, deren Rang nicht sinken kann (siehe oben)
+    # Ohne Fehlertoleranz liefert _get_truncation_rank stets den Rang 1, sodass dann nur Knoten vom Rang 1 bestehen
+    if upfront:
+        kept = {node for node in nodes if ranks[node] == ranks_before[node]}
+    else:
+        kept = {node for node in nodes if _rank_is_fixed(G[node], norm, opts)}
+        _count("skipped_eigh", len(kept))
+    if len(kept) == len(nodes):
+        # Keiner der Raenge aendert sich
+        _count("skipped_calls")
+        _count("skipped_updates", len(nodes))
+        if report is None:
+            return None
+        for node in nodes:
+            sv = svd[node][1] if upfront else torch.zeros(0)
+            _record(report, node, sv, ranks_before[node], ranks_before[node])
+        return _finish_report(report, requested_opts, norm)
 
     # Iteriere durch den Dimensionsbaum bottom up
-    for level in range(x.dtree.get_depth(), 0, -1):
-        for node in x.dtree.get_nodes_of_lvl(level):
-            # Berechne linke Singulaervektoren
-            Q, sv = x.left_svd_gramian(G[node])
-            rank = x._get_truncation_rank(sv, opts)
-            Q = Q[:, :rank]
-            if x.dtree.is_leaf(node):
-                # Kuerze Blattmatrix durch Multiplikation mit Q
-                x.U[node] = x.U[node] @ Q
-            else:
-                x.B[node] = torch.tensordot(x.B[node], Q, dims=([2], [0]))
-            # Update Transfertensor des Elternknotens
-            par = x.dtree.get_parent(node)
-            if x.dtree.is_left(node):
-                x.B[par] = torch.tensordot(Q.T, x.B[par], dims=([1], [0]))
-            else:
-                x.B[par] = torch.tensordot(Q.T, x.B[par], dims=([1], [1]))
-                x.B[par] = torch.movedim(x.B[par], source=0, destination=1)
+    # Hinweis: Die reduzierten Gram'schen Matrizen beziehen sich auf die Frames der Knoten. Diese bleiben durch das
+    #          Ueberspringen eines Knotens (bzw. durch eine quadratische orthogonale Basis Q) unveraendert.
+    truncated = set()
+    for node in nodes:
+        rank_before = ranks_before[node]
+        if node in kept:
+            # Der Rang sinkt nicht, sodass keine Aktualisierung noetig ist
+            _count("skipped_updates")
+            # Ohne Spektralzerlegung werden keine Singulaerwerte verworfen
+            sv = svd.pop(node)[1] if upfront else torch.zeros(0)
+            _record(report, node, sv, rank_before, rank_before)
+            continue
+        # Berechne linke Singulaervektoren
+        if upfront:
+            Q, sv = svd.pop(node)
+            rank = ranks[node]
+        else:
+            # Bei kleinem "max_rank" wird das Spektrum nur partiell berechnet
+            Q, sv, rank, rank_before = x._truncated_left_svd_gramian(G[node], opts)
+        _record(report, node, sv, rank, rank_before)
+        if rank == ranks_before[node]:
+            # Q ist quadratisch und orthogonal, die Aktualisierung waere eine reine Drehung der Basis
+            _count("skipped_updates")
+            continue
+        truncated.add(node)
+        # Die Basis wird im dtype der Kerne weiterverrechnet
+        Q = Q[:, :rank].to(x.B[x.dtree.get_parent(node)].dtype)
+        if x.dtree.is_leaf(node):
+            # Kuerze Blattmatrix durch Multiplikation mit Q
+            x.U[node] = x.U[node] @ Q
+        else:
+            x.B[node] = torch.tensordot(x.B[node], Q, dims=([2], [0]))
+        # Update Transfertensor des Elternknotens
+        par = x.dtree.get_parent(node)
+        if x.dtree.is_left(node):
+            x.B[par] = torch.tensordot(Q.T, x.B[par], dims=([1], [0]))
+        else:
+            x.B[par] = torch.tensordot(Q.T, x.B[par], dims=([1], [1]))
+            x.B[par] = torch.movedim(x.B[par], source=0, destination=1)
 
-    # Setze is_orthog Flag auf False
-    x.is_orthog = False
+    # Die Spalten der gekuerzten Basen bleiben orthonormal, lediglich die Transfertensoren der Elternknoten
+    # gekuerzter Knoten sind es nicht mehr
+    x._dirty.update(x.dtree.get_parent(node) for node in truncated
+                    if not x.dtree.is_root(x.dtree.get_parent(node)))
+    if report is not None:
+        return _finish_report(report, requested_opts, norm)
+
+
+def _rank_is_fixed(G: torch.Tensor, norm: torch.Tensor, opts: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion truncate_htt.
+    Prueft, ob der Rang des Knotens mit der reduzierten Gram'schen Matrix 'G' unter 'opts' nicht sinken kann. Dies ist
+    der Fall, wenn der Rang "max_rank" nicht uebersteigt und der kleinste Singulaerwert (die Wurzel des kleinsten
+    Eigenwerts von G) die kleinste der Fehlertoleranzen uebersteigt, da dann bereits das Verwerfen des kleinsten
+    Singulaerwerts diese Toleranz verletzt. Letzteres wird ohne Spektralzerlegung mittels Cholesky Zerlegung von
+    G - tol^2 I geprueft.
+    """
+    rank = G.shape[0]
+    if rank == 1:
+        return True
+    if "max_rank" in opts and rank > opts["max_rank"]:
+        return False
+    tols = []
+    if "err_tol_abs" in opts:
+        tols.append(opts["err_tol_abs"])
+    if "err_tol_rel" in opts:
+        tols.append(opts["err_tol_rel"] * float(norm))
+    if not tols:
+        return False
+    # Der Rang bleibt erhalten, sobald der kleinste Singulaerwert eine der Toleranzen, also insbesondere die kleinste,
+    # uebersteigt, da beide Toleranzen eingehalten werden muessen
+    tol = min(tols)
+    identity = torch.eye(rank, dtype=G.dtype, device=G.device)
+    return torch.linalg.cholesky_ex(G - tol ** 2 * identity).info.item() == 0
@@ -1,6 +1,9 @@
 import torch
 from math import sqrt
 from copy import deepcopy
+from functools import reduce
+from ._get_truncation_rank import _split_storage_opts
+from ._report import _pop_report, _record, _finish_report, _merge_reports
 
 
 def truncate_sum(cls, summands: list, opts: dict):
@@ -18,9 +21,27 @@ def truncate_sum(cls, summands: list, opts: dict):
                                                      Fehlertoleranz fest
                                     - "err_tol_rel": positiver float | Left die einzuhaltende relative
                                                      Fehlertoleranz fest
+                                    - "mixed_precision": bool | Berechnet die reduzierten Gram'schen Matrizen
+                                                     samt Spektralzerlegungen in torch.float64, waehrend die
+                                                     Blattmatrizen und Transfertensoren ihren dtype (z.B.
+                                                     torch.float32) behalten
+                                    - "error_allocation": "uniform" | "global" | Bei "global" wird die exakte
+                                                     Summe berechnet und anschliessend mit globaler
+                                                     Fehlerallokation gekuerzt (siehe HTTensor.truncate_htt)
+                                    - "max_nbytes", "max_params": positiver integer | Legt ein Speicherbudget
+                                                     fest, das im Anschluss mittels truncate_htt auf der Summe
+                                                     durchgesetzt wird
+                                    - "rounding": "gramian" | "randomized" | Bei "randomized" wird die exakte
+                                                     Summe berechnet und anschliessend randomisiert gerundet (siehe
+                                                     HTTensor.truncate_htt)
+                                    - "seed": nicht-negativer integer | Seed der Zufallsskizzen bei
+                                                     "rounding"="randomized" (siehe HTTensor.truncate_htt)
+                                    - "report": bool | Gibt zusaetzlich einen Kuerzungsbericht zurueck
+                                                     (siehe HTTensor.truncate_htt)
     ______________________________________________________________________
     Output:
-    (HTucker.HTTensor,): Die Summe gegeben als hierarchischer Tuckertensor.
+    (HTucker.HTTensor,): Die Summe gegeben als hierarchischer Tuckertensor. Ist opts["report"] True, so wird das Tupel
+                         (Summe, Kuerzungsbericht) zurueckgegeben.
     ______________________________________________________________________
     Beispiel:
     X, Y, Z = HTTensor.randn((3,4,5,6)), HTTensor.randn((3,4,5,6)), HTTensor.randn((3,4,5,6))
@@ -40,6 +61,29 @@ def truncate_sum(cls, summands: list, opts: dict):
                          " uebereinstimmen.")
     # Pruefe das Optionen dicts
     cls._check_opts(opts)
+    # Ein Speicherbudget wird erst auf der Summe durchgesetzt
+    # Kuerzungsbericht, sofern angefordert
+    opts, report = _pop_report(opts)
+    requested_opts = opts
+    randomized = "rounding" in opts and opts["rounding"] == "randomized"
+    global_allocation = "error_allocation" in opts and opts["error_allocation"] == "global"
+    if randomized or global_allocation:
+        # Die randomisierte Rundung benoetigt keine Gram'schen Matrizen und arbeitet direkt auf der exakten Summe
+        # Die globale Fehlerallokation benoetigt die Singulaerwerte aller Knoten vorab und kuerzt daher ebenfalls die
+        # exakte Summe
+        z = reduce(lambda a, b: a.plus(b), summands)
+        if report is None:
+            z.truncate_htt(opts)
+            return z
+        return z, z.truncate_htt({**opts, "report": True})
+    opts, storage_opts = _split_storage_opts(opts)
+    if opts is None:
+        # Ohne weitere Constraints wird die Summe exakt berechnet
+        z = reduce(lambda a, b: a.plus(b), summands)
+        if report is None:
+            z.truncate_htt(storage_opts)
+            return z
+        return z, z.truncate_htt({**storage_opts, "report": True})
 
     # Blattmatrixdict, Transfertensordict und Dimtree des resultierenden HTucker Tensors
     U, B, dtree = {}, {}, deepcopy(summands[0].dtree)
@@ -52,7 +96,9 @@ def truncate_sum(cls, summands: list, opts: dict):
                     else v) for k, v in opts.items()}
 
     # Berechne die reduzierten Gram'schen Matrizen der impliziten Summe
-    G = cls._get_gramians_sum(summands)
+    # Im mixed precision Modus geschieht dies in torch.float64
+    mixed_precision = opts["mixed_precision"] if "mixed_precision" in opts else False
+    G = cls._get_gramians_sum(summands, torch.float64 if mixed_precision else None)
 
     # Berechne gekuerzte Blattmatrizen der impliziten Summe
     # Update dabei on the fly den Transfertensor des Elternknotens
@@ -63,12 +109,14 @@ def truncate_sum(cls, summands: list, opts: dict):
         # QR Zerlegung
         Q, R = torch.linalg.qr(U_cat, mode="reduced")
         # Update reduzierte Gram'sche Matrix
-        G_upd = R @ G[leaf] @ R.T
+        G_upd = R.to(G[leaf].dtype) @ G[leaf] @ R.T.to(G[leaf].dtype)
         # Berechne davon linke Singulaervektoren
-        S, sv = cls.left_svd_gramian(G_upd)
-        # Berechne basierend auf opts wie viele Spalten behalten werden
-        rank = cls._get_truncation_rank(sv, opts)
-        S = S[:, :rank]
+        # Bei kleinem "max_rank" wird das Spektrum nur partiell berechnet
+        S, sv, rank, rank_before = cls._truncated_left_svd_gramian(G_upd, opts)
+        _record(report, leaf, sv, rank, rank_before)
+        # Die Norm der Singulaerwerte eines Blatts entspricht der Norm der Summe
+        norm = torch.linalg.norm(sv)
+        S = S[:, :rank].to(Q.dtype)
         # Berechne schliesslich finale Blattmatrix
         U[leaf] = Q @ S
 
@@ -108,12 +156,12 @@ def truncate_sum(cls, summands: list, opts: dict):
             Q = cls.dematricise(Q, shape=(B_cat.shape[0], B_cat.shape[1], Q.shape[1]), t=(0,1))
 
             # Aktualisiere reduzierte Gram'sche Matrix
-            G_upd = R @ G[node] @ R.T
+            G_upd = R.to(G[node].dtype) @ G[node] @ R.T.to(G[node].dtype)
             # Berechne davon linke Singulaervektoren
-            S, sv = cls.left_svd_gramian(G_upd)
-            # Berechne basierend auf opts wie viele Spalten behalten werden
-            rank = cls._get_truncation_rank(sv, opts)
-            S = S[:, :rank]
+            # Bei kleinem "max_rank" wird das Spektrum nur partiell berechnet
+            S, sv, rank, rank_before = cls._truncated_left_svd_gramian(G_upd, opts)
+            _record(report, node, sv, rank, rank_before)
+            S = S[:, :rank].to(Q.dtype)
             # Berechne schliesslich finalen Transfertensor
             B[node] = torch.tensordot(Q, S, dims=([2], [0]))
 
@@ -146,8 +194,16 @@ def truncate_sum(cls, summands: list, opts: dict):
     B[dtree.get_root()] = B_root.reshape(B_root.shape[0], B_root.shape[1], 1)
 
     # Erstelle HTucker Tensor der Summe
-    z = cls(U=U, B=B, dtree=dtree, is_orthog=False)
-
+    z = cls._new(U=U, B=B, dtree=dtree, is_orthog=False)
+    if report is not None:
+        report = _finish_report(report, requested_opts, norm)
+    if storage_opts is not None:
+        if report is None:
+            z.truncate_htt(storage_opts)
+        else:
+            report = _merge_reports(report, z.truncate_htt({**storage_opts, "report": True}), requested_opts)
+    if report is not None:
+        return z, report
     return z
 
 
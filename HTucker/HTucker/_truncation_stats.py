@@ -0,0 +1,48 @@
+# Globale Zaehler der Rangkuerzung mittels truncate_htt
+#   - "calls":           Anzahl der Aufrufe
+#   - "skipped_calls":   Anzahl der Aufrufe, die ohne jede Aenderung vorzeitig beendet wurden. Dies geschieht ohne
+#                        Orthogonalisierung nur, falls alle Raenge 1 sind, ansonsten erst nach Orthogonalisierung und
+#                        Berechnung der Gram'schen Matrizen
+#   - "nodes":           Anzahl der betrachteten Knoten
+#   - "skipped_eigh":    Anzahl der Knoten, deren Spektralzerlegung uebersprungen wurde, da ihr Rang unter den
+#                        gegebenen Constraints nicht sinken kann
+#   - "skipped_updates": Anzahl der Knoten, deren Basis samt Transfertensor des Elternknotens nicht aktualisiert wurde,
+#                        da sich ihr Rang nicht aendert (enthaelt "skipped_eigh")
+_STAT_KEYS = ("calls", "skipped_calls", "nodes", "skipped_eigh", "skipped_updates")
+_truncation_stats = dict.fromkeys(_STAT_KEYS, 0)
+
+
+def get_truncation_stats():
+    """
+    Gibt die globalen Zaehler der Rangkuerzung (siehe HTTensor.truncate_htt) zurueck. Diese zeigen, wie viele Knoten
+    bzw. Aufrufe uebersprungen wurden, weil sich die Raenge nicht aendern.
+    ______________________________________________________________________
+    Output:
+    (dict,): Die Zaehler "calls", "skipped_calls", "nodes", "skipped_eigh" und "skipped_updates".
+    ______________________________________________________________________
+    Beispiel:
+    HTTensor.reset_truncation_stats()
+    x = HTTensor.randn((30,30,30,30), rank={(0,): 3, (1,): 3, (2,): 3, (3,): 3, (0, 1): 3, (2, 3): 3})
+    x.truncate_htt({"err_tol_rel": 1e-12})
+    HTTensor.get_truncation_stats()["skipped_calls"]    # = 1, da keiner der Raenge unter die Toleranz faellt
+    """
+    return dict(_truncation_stats)
+
+
+def reset_truncation_stats():
+    """
+    Setzt die globalen Zaehler der Rangkuerzung (siehe HTTensor.get_truncation_stats) auf 0 zurueck.
+    ______________________________________________________________________
+    Output:
+    None
+    """
+    for key in _STAT_KEYS:
+        _truncation_stats[key] = 0
+
+
+def _count(key: str, n: int = 1):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Erhoeht den Zaehler 'key' um 'n'.
+    """
+    _truncation_stats[key] += n
@@ -0,0 +1,41 @@
+# Globale Validierungsstufe der Konstruktoren von HTTensor und dimtree
+#   - "full":  Vollstaendige Pruefung aller Argumente (Standard)
+#   - "light": Lediglich strukturelle Pruefungen, deren Aufwand linear in der Anzahl der Knoten ist
+#   - "off":   Keine Pruefungen
+VALIDATION_LEVELS = ("full", "light", "off")
+_validation_level = "full"
+
+
+def set_validation_level(level: str):
+    """
+    Setzt die globale Validierungsstufe der Konstruktoren von HTTensor und dimtree.
+    Hinweis: Interne Operationen erzeugen ihre Ergebnisse stets ohne Validierung, da diese per Konstruktion gueltig
+             sind. Die Validierungsstufe betrifft also nur von aussen aufgerufene Konstruktoren sowie das Laden.
+    ______________________________________________________________________
+    Parameter:
+    - level str: "full" (vollstaendige Pruefung), "light" (strukturelle Pruefung) oder "off" (keine Pruefung).
+    ______________________________________________________________________
+    Output:
+    None
+    ______________________________________________________________________
+    Beispiel:
+    HTTensor.set_validation_level("off")
+    x = HTTensor(U, B, dtree)    # U, B und dtree werden nicht geprueft
+    HTTensor.set_validation_level("full")
+    """
+    global _validation_level
+    if not isinstance(level, str):
+        raise TypeError("Argument 'level': type(level)={} | level ist kein str.".format(type(level)))
+    if level not in VALIDATION_LEVELS:
+        raise ValueError("Argument 'level': level={} | Erlaubt sind: {}.".format(level, VALIDATION_LEVELS))
+    _validation_level = level
+
+
+def get_validation_level():
+    """
+    Gibt die globale Validierungsstufe der Konstruktoren von HTTensor und dimtree zurueck.
+    ______________________________________________________________________
+    Output:
+    (str,): "full", "light" oder "off".
+    """
+    return _validation_level
@@ -0,0 +1,433 @@
+import torch
+from math import sqrt
+from .dimtree import dimtree
+
+
+class HTTensorBatch:
+    """
+    Implementiert einen Stapel (Batch) hierarchischer Tuckertensoren mit gemeinsamem Dimensionsbaum und gemeinsamer
+    shape. Die Blattmatrizen und Transfertensoren aller Elemente werden entlang einer fuehrenden Batchdimension
+    gestapelt. Unterschiedliche hierarchische Raenge werden dabei durch Auffuellen mit Nullen auf den maximalen Rang
+    des Batches ausgeglichen. Die tatsaechlichen Raenge der Elemente werden in 'rank' gefuehrt.
+    Auf diese Weise werden Operationen wie Orthogonalisierung, Berechnung der reduzierten Gram'schen Matrizen,
+    Rangkuerzung, Auswertung von Eintraegen und Skalarprodukte fuer alle Elemente mit wenigen gebatchten torch
+    Operationen anstelle vieler kleiner Aufrufe durchgefuehrt.
+    Hinweis: Die mit Nullen aufgefuellten Spalten und Eintraege aendern die dargestellten Tensoren nicht. Jedes Element
+             ist also auch in der aufgefuellten Form ein gueltiger hierarchischer Tuckertensor.
+    """
+
+    def __init__(self, U, B, dtree, rank=None, is_orthog=False):
+        """
+        Konstruktor
+        Erzeugt einen Batch hierarchischer Tuckertensoren aus dem Blattmatrixdict U (Eintraege der shape
+        (N, n_t, r_t)), dem Transfertensordict B (Eintraege der shape (N, r_l, r_r, r_t)) und dem gemeinsamen
+        Dimensionsbaum dtree.
+        :param U: dict: tuple:integer -> torch.Tensor
+        :param B: dict: tuple:integer -> torch.Tensor
+        :param dtree: dt.dimtree
+        :param rank: dict: tuple:integer -> 1D torch.Tensor | None: Die Raenge der Elemente pro Knoten. Ist rank None,
+                     so entsprechen die Raenge den (aufgefuellten) Groessen der Kerne.
+        :param is_orthog: bool
+        """
+        if not isinstance(U, dict):
+            raise TypeError("Argument 'U': type(U)={} | U ist kein dict.".format(type(U)))
+        if not isinstance(B, dict):
+            raise TypeError("Argument 'B': type(B)={} | B ist kein dict.".format(type(B)))
+        if not isinstance(dtree, dimtree):
+            raise TypeError("Argument 'dtree': type(dtree)={} |"
+                            " dtree ist nicht vom Typ ht.dimtree.".format(type(dtree)))
+        if set(U.keys()) != set(dtree.get_leaves()) or set(B.keys()) != set(dtree.get_inner_nodes()):
+            raise ValueError("Argument 'U', 'B', 'dtree': U, B und dtree sind nicht kompatibel.")
+        if any(mat.dim() != 3 for mat in U.values()):
+            raise ValueError("Argument 'U': U enthaelt Eintraege, die keine 3D-torch.Tensoren sind.")
+        if any(tens.dim() != 4 for tens in B.values()):
+            raise ValueError("Argument 'B': B enthaelt Eintraege, die keine 4D-torch.Tensoren sind.")
+        if len({core.shape[0] for core in list(U.values()) + list(B.values())}) != 1:
+            raise ValueError("Argument 'U', 'B': Die Kerne besitzen unterschiedliche Batchgroessen.")
+        for node in dtree.get_inner_nodes():
+            for i, child in enumerate(dtree.get_children(node)):
+                child_rank = U[child].shape[2] if child in U else B[child].shape[3]
+                if child_rank != B[node].shape[i + 1]:
+                    raise ValueError("Argument 'U', 'B': Die shape des Transfertensors des Knotens {} lautet {} und"
+                                     " ist damit nicht kompatibel zum Rang {} des Kindes"
+                                     " {}.".format(node, B[node].shape, child_rank, child))
+        self.U = U
+        self.B = B
+        self.dtree = dtree
+        self.is_orthog = is_orthog
+        if rank is None:
+            n = len(self)
+            rank = {leaf: torch.full((n,), mat.shape[2], dtype=torch.long) for leaf, mat in U.items()}
+            rank.update({node: torch.full((n,), tens.shape[3], dtype=torch.long) for node, tens in B.items()})
+        self.rank = rank
+
+    def __len__(self):
+        return next(iter(self.B.values())).shape[0]
+
+    def __getitem__(self, i):
+        return self.get(i)
+
+    @classmethod
+    def stack(cls, tensors: list):
+        """
+        Erzeugt einen Batch aus den hierarchischen Tuckertensoren in 'tensors'. Deren Kerne werden auf den jeweils
+        maximalen hierarchischen Rang mit Nullen aufgefuellt und gestapelt.
+        ______________________________________________________________________
+        Parameter:
+        - tensors [HTucker.HTTensor,...]: Die zu stapelnden hierarchischen Tuckertensoren. Alle muessen denselben
+                                          Dimensionsbaum und dieselbe shape besitzen.
+        ______________________________________________________________________
+        Output:
+        (HTucker.HTTensorBatch,): Der Batch.
+        ______________________________________________________________________
+        Beispiel:
+        tensors = [HTTensor.randn((3,4,5,6)) for _ in range(100)]
+        batch = HTTensorBatch.stack(tensors)
+        len(batch)    # = 100
+        """
+        from . import HTTensor
+        if not isinstance(tensors, list):
+            raise TypeError("Argument 'tensors': type(tensors)={} | tensors ist keine list.".format(type(tensors)))
+        if len(tensors) < 1:
+            raise ValueError("Argument 'tensors': tensors ist leer.")
+        if not all(isinstance(item, HTTensor) for item in tensors):
+            raise TypeError("Argument 'tensors': tensors enthaelt Elemente, die keine HTucker Tensoren sind.")
+        if not all(tensors[0].dtree.is_equal(item.dtree) for item in tensors):
+            raise ValueError("Argument 'tensors': Nicht alle Dimensionsbaeume stimmen ueberein.")
+        if not all(tensors[0].get_shape() == item.get_shape() for item in tensors):
+            raise ValueError("Argument 'tensors': Nicht alle shapes stimmen ueberein.")
+
+        dtree = dimtree._new({node: list(children) for node, children in tensors[0].dtree.nodes.items()})
+        U, B, rank = {}, {}, {}
+        for leaf in dtree.get_leaves():
+            mats = [item.U[leaf] for item in tensors]
+            rank[leaf] = torch.tensor([mat.shape[1] for mat in mats], dtype=torch.long)
+            U[leaf] = torch.zeros(len(mats), mats[0].shape[0], int(rank[leaf].max()),
+                                  dtype=mats[0].dtype, device=mats[0].device)
+            for i, mat in enumerate(mats):
+                U[leaf][i, :, :mat.shape[1]] = mat
+        for node in dtree.get_inner_nodes():
+            tens = [item.B[node] for item in tensors]
+            rank[node] = torch.tensor([t.shape[2] for t in tens], dtype=torch.long)
+            B[node] = torch.zeros(len(tens), *(max(t.shape[k] for t in tens) for k in range(3)),
+                                  dtype=tens[0].dtype, device=tens[0].device)
+            for i, t in enumerate(tens):
+                B[node][i, :t.shape[0], :t.shape[1], :t.shape[2]] = t
+        return cls(U=U, B=B, dtree=dtree, rank=rank, is_orthog=all(item.is_orthog for item in tensors))
+
+    def get(self, i: int):
+        """
+        Gibt das i-te Element des Batches als hierarchischen Tuckertensor zurueck. Die aufgefuellten Spalten werden
+        dabei entfernt.
+        ______________________________________________________________________
+        Parameter:
+        - i int: Der Index des Elements.
+        ______________________________________________________________________
+        Output:
+        (HTucker.HTTensor,): Das i-te Element.
+        """
+        from . import HTTensor
+        if not isinstance(i, int):
+            raise TypeError("Argument 'i': type(i)={} | i ist kein int.".format(type(i)))
+        if i not in range(-len(self), len(self)):
+            raise ValueError("Argument 'i': i={} ist kein gueltiger Index fuer einen Batch der Groesse"
+                             " {}.".format(i, len(self)))
+        rank = {node: int(r[i]) for node, r in self.rank.items()}
+        U = {leaf: self.U[leaf][i, :, :rank[leaf]] for leaf in self.U}
+        B = {}
+        for node in self.B:
+            l, r = self.dtree.get_children(node)
+            B[node] = self.B[node][i, :rank[l], :rank[r], :rank[node]]
+        dtree = dimtree._new({node: list(children) for node, children in self.dtree.nodes.items()})
+        return HTTensor._new(U=U, B=B, dtree=dtree, is_orthog=self.is_orthog)
+
+    def unstack(self):
+        """
+        Zerlegt den Batch in seine Elemente.
+        ______________________________________________________________________
+        Output:
+        ([HTucker.HTTensor,...],): Die Elemente des Batches.
+        """
+        return [self.get(i) for i in range(len(self))]
+
+    def get_shape(self):
+        """
+        Gibt die gemeinsame shape der Elemente des Batches zurueck.
+        ______________________________________________________________________
+        Output:
+        (tuple,): Die shape.
+        """
+        return tuple(self.U[dim].shape[1] for dim in sorted(self.U.keys()))
+
+    def get_rank(self):
+        """
+        Gibt die hierarchischen Raenge aller Elemente des Batches zurueck.
+        ______________________________________________________________________
+        Output:
+        (dict,): Das dict enthaelt fuer jeden Knoten einen 1D torch.Tensor mit den Raengen der Elemente.
+        """
+        return dict(self.rank)
+
+    def orthogonalize(self):
+        """
+        Orthogonalisiert alle Elemente des Batches mittels gebatchter QR Zerlegungen.
+        ______________________________________________________________________
+        Output:
+        (HTucker.HTTensorBatch,): 'self' mit orthogonalisierten Elementen.
+        ______________________________________________________________________
+        Beispiel:
+        batch = HTTensorBatch.stack([HTTensor.randn((3,4,5,6)) for _ in range(100)])
+        batch.orthogonalize()
+        """
+        x = self
+        R = {}
+        for node in _get_nodes_bottom_up(x.dtree):
+            if x.dtree.is_leaf(node):
+                x.U[node], R[node], x.rank[node] = _batched_qr(x.U[node], x.rank[node], x.U[node].shape[1])
+                continue
+            l, r = x.dtree.get_children(node)
+            # Multipliziere R[l] und R[r] in den Transfertensor
+            B = torch.einsum("nia,njb,nabk->nijk", R.pop(l), R.pop(r), x.B[node])
+            if x.dtree.is_root(node):
+                x.B[node] = B
+                continue
+            # QR Zerlegung der Matrizierung des Transfertensors
+            n, kl, kr, k = B.shape
+            Q, R[node], x.rank[node] = _batched_qr(B.reshape(n, kl * kr, k), x.rank[node],
+                                                  x.rank[l] * x.rank[r])
+            x.B[node] = Q.reshape(n, kl, kr, Q.shape[2])
+        x.is_orthog = True
+        return x
+
+    def _get_gramians(self, dtype: torch.dtype = None):
+        """
+        Hinweis: Dies ist eine interne Funktion
+        Berechnet die reduzierten Gram'schen Matrizen aller Elemente des Batches. Dabei wird der Batch en passant
+        orthogonalisiert, sofern er noch nicht orthogonal ist.
+        ______________________________________________________________________
+        Parameter:
+        - dtype torch.dtype: Der dtype, in dem die reduzierten Gram'schen Matrizen berechnet werden. Ist dtype None, so
+                             wird der dtype der Transfertensoren verwendet.
+        ______________________________________________________________________
+        Output:
+        (dict,): Das dict enthaelt fuer jeden Knoten die gestapelten reduzierten Gram'schen Matrizen der Elemente.
+        """
+        x = self
+        if not x.is_orthog:
+            x.orthogonalize()
+        root = x.dtree.get_root()
+        if dtype is None:
+            dtype = x.B[root].dtype
+        G = {root: torch.ones(len(x), 1, 1, dtype=dtype, device=x.B[root].device)}
+        for node in _get_nodes_bottom_up(x.dtree)[::-1]:
+            if x.dtree.is_leaf(node):
+                continue
+            l, r = x.dtree.get_children(node)
+            B = x.B[node].to(dtype)
+            BG = torch.einsum("nabk,nlk->nabl", B, G[node])
+            G[l] = torch.einsum("nabk,ncbk->nac", B, BG)
+            G[r] = torch.einsum("nabk,nadk->nbd", B, BG)
+        return G
+
+    def truncate_htt(self, opts: dict):
+        """
+        Fuehrt eine Rangkuerzung aller Elemente des Batches durch. Die einzuhaltenden Constraints finden sich im
+        Parameter 'opts' und gelten fuer jedes Element einzeln (siehe HTTensor.truncate_htt).
+        ______________________________________________________________________
+        Parameter:
+        - opts dict: Das Optionen-dict (siehe HTTensor.truncate_htt). Die keys "error_allocation", "max_nbytes",
+                     "max_params" und "rounding" werden nicht unterstuetzt. Enthaelt opts keinen der keys
+                     "max_rank", "err_tol_abs" und "err_tol_rel", so bleibt der Batch unveraendert.
+        ______________________________________________________________________
+        Output:
+        None
+        ______________________________________________________________________
+        Beispiel:
+        batch = HTTensorBatch.stack([HTTensor.randn((3,4,5,6)) for _ in range(100)])
+        batch.truncate_htt({"err_tol_rel": 1e-3})
+        """
+        from . import HTTensor
+        HTTensor._check_opts(opts)
+        unsupported = [k for k in ("error_allocation", "max_nbytes", "max_params", "report", "rounding") if k in opts]
+        if unsupported:
+            raise ValueError("Argument 'opts': Die keys {} werden von HTTensorBatch.truncate_htt nicht"
+                             " unterstuetzt.".format(unsupported))
+        # Ohne Rang- oder Fehler-Constraint wird nicht gekuerzt
+        if not any(k in opts for k in ("max_rank", "err_tol_abs", "err_tol_rel")):
+            return
+        x = self
+        # Anpassen der Fehlertoleranzen in opts (siehe HTTensor.truncate_htt)
+        opts = {k: (v / sqrt(len(x.get_shape()) * 2 - 3) if k in ["err_tol_abs", "err_tol_rel"]
+                    else v) for k, v in opts.items()}
+        if not x.is_orthog:
+            x.orthogonalize()
+        mixed_precision = opts["mixed_precision"] if "mixed_precision" in opts else False
+        G = x._get_gramians(torch.float64 if mixed_precision else None)
+
+        for node in _get_nodes_bottom_up(x.dtree):
+            if x.dtree.is_root(node):
+                continue
+            par = x.dtree.get_parent(node)
+            # Gebatchte Spektralzerlegung der reduzierten Gram'schen Matrizen
+            eig_val, Q = torch.linalg.eigh(G[node])
+            sv = torch.sqrt(torch.abs(eig_val))
+            desc_idc = torch.argsort(sv, dim=1, descending=True)
+            sv = torch.gather(sv, 1, desc_idc)
+            Q = torch.gather(Q, 2, desc_idc.unsqueeze(1).expand_as(Q))
+            # Kuerzungsraenge aller Elemente
+            rank = torch.minimum(_get_truncation_ranks(sv, opts).cpu(), x.rank[node])
+            k = int(rank.max())
+            mask = torch.arange(k, device=Q.device) < rank.to(Q.device).unsqueeze(1)
+            Q = (Q[:, :, :k] * mask.unsqueeze(1)).to(x.B[par].dtype)
+            if x.dtree.is_leaf(node):
+                x.U[node] = x.U[node] @ Q
+            else:
+                x.B[node] = torch.einsum("nabk,nkl->nabl", x.B[node], Q)
+            if x.dtree.is_left(node):
+                x.B[par] = torch.einsum("nkl,nkbc->nlbc", Q, x.B[par])
+            else:
+                x.B[par] = torch.einsum("nkl,nakc->nalc", Q, x.B[par])
+            x.rank[node] = rank
+        x.is_orthog = False
+
+    def full(self):
+        """
+        Berechnet die vollen Tensoren aller Elemente des Batches.
+        ______________________________________________________________________
+        Output:
+        (torch.Tensor,): Die gestapelten vollen Tensoren der shape (N, n_0, n_1, ...).
+        """
+        x = self
+        n = len(x)
+        U = {}
+        for node in _get_nodes_bottom_up(x.dtree):
+            if x.dtree.is_leaf(node):
+                U[node] = x.U[node]
+                continue
+            l, r = x.dtree.get_children(node)
+            Ul, Ur = U.pop(l), U.pop(r)
+            U[node] = torch.einsum("npa,nqb,nabk->npqk", Ul, Ur, x.B[node]).reshape(n, Ul.shape[1] * Ur.shape[1], -1)
+        root = x.dtree.get_root()
+        shape = x.get_shape()
+        full = U[root].reshape(n, *(shape[dim] for dim in root))
+        # Permutiere die Modi in aufsteigende Reihenfolge der Dimensionen
+        return full.permute(0, *(1 + root.index(dim) for dim in range(len(shape))))
+
+    def get_entries(self, idx: torch.Tensor):
+        """
+        Wertet alle Elemente des Batches an den Multiindizes in 'idx' aus, ohne die vollen Tensoren zu berechnen.
+        ______________________________________________________________________
+        Parameter:
+        - idx 2D torch.Tensor: Die Multiindizes zeilenweise, also mit shape (M, d).
+        ______________________________________________________________________
+        Output:
+        (torch.Tensor,): Die Eintraege mit shape (N, M).
+        ______________________________________________________________________
+        Beispiel:
+        batch = HTTensorBatch.stack([HTTensor.randn((3,4,5,6)) for _ in range(100)])
+        batch.get_entries(torch.tensor([[0, 1, 2, 3], [2, 3, 4, 5]]))    # shape (100, 2)
+        """
+        if not isinstance(idx, torch.Tensor):
+            raise TypeError("Argument 'idx': type(idx)={} | idx ist kein torch.Tensor.".format(type(idx)))
+        if idx.dim() != 2 or idx.shape[1] != len(self.get_shape()):
+            raise ValueError("Argument 'idx': idx.shape={} | idx ist kein 2D-torch.Tensor mit {}"
+                             " Spalten.".format(idx.shape, len(self.get_shape())))
+        x = self
+        V = {}
+        for node in _get_nodes_bottom_up(x.dtree):
+            if x.dtree.is_leaf(node):
+                V[node] = x.U[node][:, idx[:, node[0]], :]
+                continue
+            l, r = x.dtree.get_children(node)
+            V[node] = torch.einsum("nma,nmb,nabk->nmk", V.pop(l), V.pop(r), x.B[node])
+        return V[x.dtree.get_root()][:, :, 0]
+
+    def inner(self, y):
+        """
+        Berechnet die Skalarprodukte der einander entsprechenden Elemente der Batches 'self' und 'y'.
+        ______________________________________________________________________
+        Parameter:
+        - y HTucker.HTTensorBatch: Ein Batch gleicher Groesse mit demselben Dimensionsbaum und derselben shape.
+        ______________________________________________________________________
+        Output:
+        (1D torch.Tensor,): Die Skalarprodukte <self[i], y[i]>.
+        ______________________________________________________________________
+        Beispiel:
+        batch = HTTensorBatch.stack([HTTensor.randn((3,4,5,6)) for _ in range(100)])
+        norms = torch.sqrt(batch.inner(batch))
+        """
+        if not isinstance(y, HTTensorBatch):
+            raise TypeError("Argument 'y': type(y)={} | y ist kein HTucker.HTTensorBatch.".format(type(y)))
+        if not self.dtree.is_equal(y.dtree) or self.get_shape() != y.get_shape() or len(self) != len(y):
+            raise ValueError("Argument 'y': y ist nicht kompatibel zu self.")
+        M = {}
+        for node in _get_nodes_bottom_up(self.dtree):
+            if self.dtree.is_leaf(node):
+                M[node] = torch.einsum("npa,npb->nab", self.U[node], y.U[node])
+                continue
+            l, r = self.dtree.get_children(node)
+            M[node] = torch.einsum("nac,nbd,nabk,ncdl->nkl", M.pop(l), M.pop(r), self.B[node], y.B[node])
+        return M[self.dtree.get_root()][:, 0, 0]
+
+    def norm(self):
+        """
+        Berechnet die Frobeniusnormen aller Elemente des Batches.
+        ______________________________________________________________________
+        Output:
+        (1D torch.Tensor,): Die Normen.
+        """
+        if self.is_orthog:
+            # Die Norm eines orthogonalen hierarchischen Tuckertensors ist die Norm des Transfertensors der Wurzel
+            return torch.linalg.norm(self.B[self.dtree.get_root()].reshape(len(self), -1), dim=1)
+        return torch.sqrt(torch.clamp(self.inner(self), min=0))
+
+
+def _get_nodes_bottom_up(dtree):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Gibt die Knoten von 'dtree' levelweise von unten nach oben zurueck.
+    """
+    return [node for level in range(dtree.get_depth(), -1, -1) for node in dtree.get_nodes_of_lvl(level)]
+
+
+def _batched_qr(A: torch.Tensor, rank: torch.Tensor, max_rank):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion HTTensorBatch.orthogonalize.
+    Berechnet gebatcht die reduzierte QR Zerlegung der mit Nullspalten aufgefuellten Matrizen in 'A' (shape (N, m, k)).
+    Die Spalten von Q jenseits des neuen Rangs min(rank, max_rank) eines Elements werden zu Null gesetzt. Da die
+    entsprechenden Zeilen von R Null sind, bleibt das Produkt Q @ R dabei unveraendert.
+    ______________________________________________________________________
+    Output:
+    (3D torch.Tensor, 3D torch.Tensor, 1D torch.Tensor): Q, R und die neuen Raenge.
+    """
+    Q, R = torch.linalg.qr(A, mode="reduced")
+    new_rank = torch.minimum(rank, torch.as_tensor(max_rank))
+    mask = torch.arange(Q.shape[2], device=Q.device) < new_rank.to(Q.device).unsqueeze(1)
+    return Q * mask.unsqueeze(1), R * mask.unsqueeze(2), new_rank
+
+
+def _get_truncation_ranks(sv: torch.Tensor, opts: dict):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Gebatchte Variante von HTTensor._get_truncation_rank. Berechnet fuer jede Zeile der absteigend sortierten
+    Singulaerwerte 'sv' (shape (N, k)) den minimalen Rang, der die Constraints aus 'opts' einhaelt.
+    ______________________________________________________________________
+    Output:
+    (1D torch.Tensor,): Die Raenge.
+    """
+    atol = opts["err_tol_abs"] if "err_tol_abs" in opts else None
+    rtol = opts["err_tol_rel"] if "err_tol_rel" in opts else None
+    max_rank = opts["max_rank"] if "max_rank" in opts else None
+    # tail[:, k] entspricht dem Kuerzungsfehler bei Beibehaltung von k Singulaerwerten
+    tail = torch.sqrt(torch.cumsum(sv.flip(dims=(1,)) ** 2, dim=1)).flip(dims=(1,))
+    tail = torch.cat([tail, torch.zeros(sv.shape[0], 1, dtype=sv.dtype, device=sv.device)], dim=1)
+    ok = torch.ones_like(tail, dtype=torch.bool)
+    if atol:
+        ok &= tail <= atol
+    if rtol:
+        ok &= tail <= rtol * torch.linalg.norm(sv, dim=1, keepdim=True)
+    # Da tail monoton faellt, ist der erste zulaessige Index der minimale Rang
+    rank = torch.clamp(ok.to(torch.int8).argmax(dim=1), min=1)
+    if max_rank:
+        rank = torch.clamp(rank, max=max_rank)
+    return rank
@@ -1,4 +1,5 @@
 import numpy as np
+from . import _validation
 
 
 class dimtree:
@@ -9,11 +10,50 @@ class dimtree:
     def __init__(self, nodes):
         """
         Erzeugt einen Dimensionsbaum auf Grundlage der Knotenhierarchie in nodes
+        Der Umfang der Pruefung von nodes haengt von der globalen Validierungsstufe ab (siehe set_validation_level).
         :param nodes: dict: (tuple: int, list: tuple: int)
         """
-        dimtree._check_nodes(nodes)
+        level = _validation.get_validation_level()
+        if level == "full":
+            dimtree._check_nodes(nodes)
+        elif level == "light":
+            dimtree._check_nodes_light(nodes)
         self.nodes = nodes
 
+    @classmethod
+    def _new(cls, nodes):
+        """
+        Hinweis: Dies ist eine interne Funktion.
+        Erzeugt einen Dimensionsbaum ohne jegliche Pruefung von nodes. Dies ist fuer intern erzeugte Knotenhierarchien
+        gedacht, die per Konstruktion gueltig sind.
+        :param nodes: dict: (tuple: int, list: tuple: int)
+        """
+        dtree = cls.__new__(cls)
+        dtree.nodes = nodes
+        return dtree
+
+    @staticmethod
+    def _check_nodes_light(nodes):
+        """
+        Prueft, ob nodes strukturell einen Dimensionsbaum repraesentiert. Im Gegensatz zu _check_nodes werden die
+        Elemente der tuple nicht einzeln geprueft.
+        :param nodes: dict: (tuple: int, list: tuple: int)
+        :return:
+        """
+        if not isinstance(nodes, dict):
+            raise TypeError("Argument 'nodes' = {}: type('nodes')={} ist kein dict.".format(nodes, type(nodes)))
+        for k, v in nodes.items():
+            if not isinstance(k, tuple) or not isinstance(v, list):
+                raise TypeError("Argument 'nodes' = {}: Der Eintrag {}: {} ist kein Paar aus tuple und"
+                                " list.".format(nodes, k, v))
+            if v and (len(v) != 2 or k != v[0] + v[1]):
+                raise ValueError("Argument 'nodes' = {} : Der Key {} ist ungleich der Kontaktenation"
+                                 " der tuple des Values {}.".format(nodes, k, v))
+            if not v and len(k) != 1:
+                raise ValueError(
+                    "Argument 'nodes' = {}: Der Key {} ist ein tuple mit nicht genau einem Element, obwohl"
+                    " der Key ein Blattknoten ist.".format(nodes, k))
+
     @staticmethod
     def _check_nodes(nodes):
         """
@@ -122,7 +162,41 @@ class dimtree:
                 nodes[dim] = []
 
         # Konstruktoraufruf
-        return dimtree(nodes=nodes)
+        # Der kanonische Dimensionsbaum ist per Konstruktion gueltig
+        return dimtree._new(nodes=nodes)
+
+    @staticmethod
+    def get_degenerate_dimtree(nr_dims: int):
+        """
+        Erzeugt den degenerierten (linearen) Dimensionsbaum fuer die Anzahl 'nr_dims' uebergebener Dimensionen. Jeder
+        innere Knoten (k, ..., d-1) hat das Blatt (k,) als linkes und (k+1, ..., d-1) als rechtes Kind. Auf diesem
+        Dimensionsbaum entspricht das hierarchische Tuckerformat dem Tensor-Train Format.
+        ______________________________________________________________________
+        Parameter:
+        - nr_dims int: Die Anzahl an Dimensionen, die der Dimensionsbaum strukturiert.
+        ______________________________________________________________________
+        Output:
+        (dimtree,): Der degenerierte Dimensionsbaum.
+        ______________________________________________________________________
+        Beispiel:
+        Degenerierter Dimensionsbaum fuer 4 Dimensionen
+                    (0, 1, 2, 3)
+               (0,)          (1, 2, 3)
+                        (1,)          (2, 3)
+                                   (2,)    (3,)
+        """
+        if not np.issubdtype(type(nr_dims), np.integer):
+            raise TypeError("Argument 'nr_dims' = {}: {} ist kein integer.".format(nr_dims, type(nr_dims)))
+        if nr_dims <= 0:
+            raise ValueError("Argument 'nr_dims' = {}: nr_dims ist kein positiver integer.".format(nr_dims))
+        nodes = {(nr_dims - 1,): []}
+        for k in range(nr_dims - 1):
+            nodes[tuple(range(k, nr_dims))] = [(k,), tuple(range(k + 1, nr_dims))]
+            nodes[(k,)] = []
+
+        # Konstruktoraufruf
+        # Der degenerierte Dimensionsbaum ist per Konstruktion gueltig
+        return dimtree._new(nodes=nodes)
 
     def get_nr_nodes(self):
         """
@@ -651,7 +725,7 @@ class dimtree:
         for nd in nodes:
             children[nd] = self.get_children(nd)
 
-        return type(self)(children)
+        return type(self)._new(children)
 
     def remove_subtree(self, node):
         """
@@ -0,0 +1,146 @@
+import torch
+from functools import reduce
+from ._tensordot import _shallow_copy
+
+
+class HTExpression:
+    """
+    Implementiert einen nicht ausgewerteten Ausdruck, der eine Linearkombination sum_i c_i * x_i hierarchischer
+    Tuckertensoren x_i mit uebereinstimmendem Dimensionsbaum darstellt. Ausdruecke entstehen im Lazy-Modus (siehe
+    HTTensor.set_lazy_mode) durch die Operatoren "+", "-" und "*" und werden erst beim Kuerzen mittels "%" bzw. durch
+    evaluate ausgewertet.
+    Die Auswertung faltet die Koeffizienten c_i in die Transfertensoren der Wurzeln flacher Kopien der x_i und berechnet
+    die gekuerzte Summe mit einem einzigen Aufruf von HTTensor.truncate_sum. Es entstehen also weder tiefe Kopien noch
+    Zwischenergebnisse mit aufsummierten Raengen.
+    """
+
+    def __init__(self, terms: list):
+        """
+        Konstruktor
+        Erzeugt einen Ausdruck aus der Liste 'terms' von Paaren (Koeffizient, hierarchischer Tuckertensor).
+        :param terms: [(float, HTucker.HTTensor),...]
+        """
+        if not isinstance(terms, list):
+            raise TypeError("Argument 'terms': type(terms)={} | terms ist keine list.".format(type(terms)))
+        self.terms = terms
+
+    @staticmethod
+    def _from_operand(y):
+        """
+        Hinweis: Dies ist eine interne Funktion.
+        Wandelt den Operanden 'y' (HTucker.HTTensor oder HTucker.HTExpression) in einen Ausdruck um.
+        """
+        from . import HTTensor
+        if isinstance(y, HTExpression):
+            return y
+        if isinstance(y, HTTensor):
+            return HTExpression([(1.0, y)])
+        raise TypeError("Argument 'y': type(y)={} | y ist weder ein HTucker Tensor noch ein"
+                        " HTucker.HTExpression.".format(type(y)))
+
+    def __add__(self, y):
+        return HTExpression(self.terms + HTExpression._from_operand(y).terms)
+
+    def __radd__(self, y):
+        return HTExpression(HTExpression._from_operand(y).terms + self.terms)
+
+    def __sub__(self, y):
+        return self + HTExpression._from_operand(y) * -1.0
+
+    def __rsub__(self, y):
+        return HTExpression._from_operand(y) + self * -1.0
+
+    def __mul__(self, y):
+        c = _to_scalar(y)
+        return HTExpression([(c * coeff, x) for coeff, x in self.terms])
+
+    def __neg__(self):
+        return self * -1.0
+
+    def __mod__(self, opts):
+        return self.evaluate(opts)
+
+    def __imod__(self, opts):
+        return self.evaluate(opts)
+
+    def evaluate(self, opts: dict = None):
+        """
+        Wertet den Ausdruck aus. Ist 'opts' gegeben, so wird die Linearkombination en passant entsprechend der
+        Constraints in 'opts' gekuerzt (siehe HTTensor.truncate_sum). Ansonsten wird sie exakt berechnet.
+        Mehrfach auftretende hierarchische Tuckertensoren werden vorab zu einem Summanden zusammengefasst.
+        ______________________________________________________________________
+        Parameter:
+        - opts dict | None: Das Optionen-dict (siehe HTTensor.truncate_sum).
+        ______________________________________________________________________
+        Output:
+        (HTucker.HTTensor,): Das Ergebnis des Ausdrucks. Ist opts["report"] True, so wird das Tupel (Ergebnis,
+                             Kuerzungsbericht) zurueckgegeben.
+        ______________________________________________________________________
+        Beispiel:
+        HTTensor.set_lazy_mode(True)
+        expr = (a + b) - c * 2.0
+        z = expr.evaluate({"err_tol_rel": 1e-6})    # entspricht expr % {"err_tol_rel": 1e-6}
+        """
+        from . import HTTensor
+        if len(self.terms) == 0:
+            raise ValueError("Der Ausdruck enthaelt keine Summanden.")
+        # Fasse mehrfach auftretende Tensoren zusammen
+        coeffs, tensors = {}, {}
+        for coeff, x in self.terms:
+            coeffs[id(x)] = coeffs.get(id(x), 0.0) + coeff
+            tensors[id(x)] = x
+        summands = [_fold(coeffs[key], tensors[key]) for key in tensors]
+        if len(summands) > 1 and not all(summands[0].dtree.is_equal(item.dtree) for item in summands):
+            raise ValueError("Die Summanden des Ausdrucks sind nicht kompatibel, da nicht alle Dimensionsbaeume"
+                             " uebereinstimmen.")
+        if opts is None:
+            return reduce(lambda a, b: a.plus(b), summands)
+        HTTensor._check_opts(opts)
+        if len(summands) == 1:
+            # truncate_htt arbeitet in-place und gibt lediglich den Kuerzungsbericht zurueck, sofern angefordert
+            report = summands[0].truncate_htt(opts)
+            return summands[0] if report is None else (summands[0], report)
+        return HTTensor.truncate_sum(summands, opts)
+
+    def full(self):
+        """
+        Wertet den Ausdruck exakt aus und berechnet den zugehoerigen vollen Tensor.
+        ______________________________________________________________________
+        Output:
+        (torch.Tensor,): Der volle Tensor.
+        """
+        return self.evaluate().full()
+
+
+def _fold(c: float, x):
+    """
+    Hinweis: Dies ist eine interne Funktion der Funktion HTExpression.evaluate.
+    Erzeugt eine flache Kopie von 'x', deren Transfertensor der Wurzel mit 'c' multipliziert ist.
+    """
+    z = _shallow_copy(x)
+    if c != 1.0:
+        root = z.dtree.get_root()
+        # Der Transfertensor der Wurzel muss nicht orthonormal sein
+        z.B[root] = z.B[root] * c
+    return z
+
+
+def _to_scalar(y):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Wandelt den Operanden 'y' der Multiplikation (int, float oder torch.Tensor mit einem Element) in einen float um.
+    """
+    if isinstance(y, int):
+        return float(y)
+    elif isinstance(y, torch.Tensor):
+        squeezed = y.squeeze()
+        if len(squeezed.shape) == 0:
+            return float(squeezed)
+        else:
+            raise ValueError("Argument 'y': type(y)={} | y mit shape {} repraesentiert"
+                             " keinen Skalar.".format(type(y), y.shape))
+    elif isinstance(y, float):
+        return y
+    else:
+        raise TypeError("Argument 'y': type(y)={} | y muss vom Type float, int"
+                        " oder torch.Tensor sein.".format(type(y)))
@@ -0,0 +1,307 @@
+import torch
+from math import sqrt
+from functools import reduce
+from .dimtree import dimtree
+
+
+class HTTensorFamily:
+    """
+    Implementiert eine Familie hierarchischer Tuckertensoren (z.B. Snapshots entlang einer Trajektorie) mit
+    gemeinsamem Dimensionsbaum, deren Blattmatrizen sich in gemeinsamen orthonormalen Blattbasen U[t] darstellen
+    lassen. Jedes Mitglied wird dabei nur durch seine Koeffizientenform gespeichert, also durch einen hierarchischen
+    Tuckertensor, dessen Blattmatrizen C[t] = U[t].T @ U_x[t] die Koordinaten bzgl. der gemeinsamen Basen sind. Die
+    Transfertensoren bleiben unveraendert.
+    Da die gemeinsamen Basen orthonormal sind, stimmen Skalarprodukte, Normen und Linearkombinationen der Mitglieder
+    mit denen ihrer Koeffizientenformen ueberein. Diese Operationen arbeiten damit nur auf den kleinen Kernen, insbe-
+    sondere orthogonalisiert eine Rangkuerzung von Linearkombinationen nur die Koeffizientenmatrizen (k_t x r) anstelle
+    der aneinandergehaengten Blattmatrizen (n_t x r).
+    """
+
+    def __init__(self, U, members, dtree):
+        """
+        Konstruktor
+        Erzeugt eine Familie aus den gemeinsamen orthonormalen Blattbasen U (Eintraege der shape (n_t, k_t)), den
+        Koeffizientenformen der Mitglieder 'members' (Blattmatrizen der shape (k_t, r_t)) und dem gemeinsamen
+        Dimensionsbaum dtree.
+        :param U: dict: tuple:integer -> torch.Tensor
+        :param members: [HTucker.HTTensor,...]
+        :param dtree: dt.dimtree
+        """
+        from . import HTTensor
+        if not isinstance(U, dict):
+            raise TypeError("Argument 'U': type(U)={} | U ist kein dict.".format(type(U)))
+        if not isinstance(members, list):
+            raise TypeError("Argument 'members': type(members)={} | members ist keine list.".format(type(members)))
+        if not isinstance(dtree, dimtree):
+            raise TypeError("Argument 'dtree': type(dtree)={} |"
+                            " dtree ist nicht vom Typ ht.dimtree.".format(type(dtree)))
+        if set(U.keys()) != set(dtree.get_leaves()):
+            raise ValueError("Argument 'U', 'dtree': U und dtree sind nicht kompatibel.")
+        if any(not isinstance(mat, torch.Tensor) or mat.dim() != 2 for mat in U.values()):
+            raise ValueError("Argument 'U': U enthaelt Eintraege, die keine 2D-torch.Tensoren sind.")
+        if not all(isinstance(item, HTTensor) for item in members):
+            raise TypeError("Argument 'members': members enthaelt Elemente, die keine HTucker Tensoren sind.")
+        for item in members:
+            self._check_member(item, U, dtree, "members")
+        self.U = U
+        self.members = members
+        self.dtree = dtree
+
+    def __len__(self):
+        return len(self.members)
+
+    def __getitem__(self, i):
+        return self.get(i)
+
+    @staticmethod
+    def _check_member(x, U, dtree, arg):
+        """
+        Hinweis: Dies ist eine interne Funktion.
+        Prueft, ob 'x' eine Koeffizientenform bzgl. der Blattbasen 'U' mit dem Dimensionsbaum 'dtree' ist.
+        """
+        if not dtree.is_equal(x.dtree):
+            raise ValueError("Argument '{}': Der Dimensionsbaum stimmt nicht mit dem der Familie ueberein.".format(arg))
+        for leaf, mat in U.items():
+            if x.U[leaf].shape[0] != mat.shape[1]:
+                raise ValueError("Argument '{}': Die Blattmatrix des Blatts {} hat shape {}, waehrend die gemeinsame"
+                                 " Basis {} Spalten besitzt.".format(arg, leaf, x.U[leaf].shape, mat.shape[1]))
+
+    @classmethod
+    def from_tensors(cls, tensors: list, opts: dict = None):
+        """
+        Erzeugt eine Familie aus den hierarchischen Tuckertensoren in 'tensors'. Fuer jedes Blatt t wird dazu eine
+        gemeinsame orthonormale Basis der Spaltenraeume der t-Matrizierungen aller Tensoren berechnet. Grundlage ist
+        die Singulaerwertzerlegung der aneinandergehaengten Matrizen U_x[t] @ L_x[t], wobei L_x[t] @ L_x[t].T die
+        reduzierte Gram'sche Matrix von x ist. Deren Singulaerwerte beschreiben damit exakt den Fehler, den die
+        Projektion aller Mitglieder auf die gekuerzte Basis verursacht.
+        ______________________________________________________________________
+        Parameter:
+        - tensors [HTucker.HTTensor,...]: Die hierarchischen Tuckertensoren. Alle muessen denselben Dimensionsbaum
+                                          und dieselbe shape besitzen.
+        - opts dict | None: Das Optionen-dict (siehe HTTensor.truncate_htt). Die Fehlertoleranzen beziehen sich auf
+                            die Familie als Ganzes, also auf sqrt(sum_i ||x_i - P x_i||^2) bzw. auf
+                            sqrt(sum_i ||x_i||^2). Ist opts None, so werden die Spaltenraeume exakt (bis auf
+                            Maschinengenauigkeit) aufgespannt.
+        ______________________________________________________________________
+        Output:
+        (HTucker.HTTensorFamily,): Die Familie.
+        ______________________________________________________________________
+        Beispiel:
+        x = HTTensor.randn((30,40,50))
+        tensors = [x * float(c) for c in range(1, 11)]
+        family = HTTensorFamily.from_tensors(tensors)
+        family.U[(0,)].shape    # = (30, x.get_rank()[(0,)])
+        """
+        from . import HTTensor
+        if not isinstance(tensors, list):
+            raise TypeError("Argument 'tensors': type(tensors)={} | tensors ist keine list.".format(type(tensors)))
+        if len(tensors) < 1:
+            raise ValueError("Argument 'tensors': tensors ist leer.")
+        if not all(isinstance(item, HTTensor) for item in tensors):
+            raise TypeError("Argument 'tensors': tensors enthaelt Elemente, die keine HTucker Tensoren sind.")
+        if not all(tensors[0].dtree.is_equal(item.dtree) for item in tensors):
+            raise ValueError("Argument 'tensors': Nicht alle Dimensionsbaeume stimmen ueberein.")
+        if not all(tensors[0].get_shape() == item.get_shape() for item in tensors):
+            raise ValueError("Argument 'tensors': Nicht alle shapes stimmen ueberein.")
+        if opts is not None:
+            HTTensor._check_opts(opts)
+            # Der Projektionsfehler verteilt sich auf die d Blaetter
+            opts = {k: (v / sqrt(len(tensors[0].get_shape())) if k in ["err_tol_abs", "err_tol_rel"]
+                        else v) for k, v in opts.items()}
+
+        dtree = dimtree._new({node: list(children) for node, children in tensors[0].dtree.nodes.items()})
+        leaves = dtree.get_leaves()
+        factors = {leaf: [] for leaf in leaves}
+        for item in tensors:
+            # Orthogonalisiere eine Kopie, um 'tensors' nicht zu veraendern
+            y = item.clone().orthogonalize()
+            G = y._get_gramians()
+            for leaf in leaves:
+                eig_val, Q = torch.linalg.eigh(G[leaf])
+                factors[leaf].append(y.U[leaf] @ (Q * torch.sqrt(torch.abs(eig_val)).to(Q.dtype)))
+
+        U = {}
+        for leaf in leaves:
+            basis, sv, _ = torch.linalg.svd(torch.cat(factors[leaf], dim=1), full_matrices=False)
+            if opts is None:
+                k = max(int((sv > sv[0] * max(basis.shape) * torch.finfo(sv.dtype).eps).sum()), 1)
+            else:
+                k = int(HTTensor._get_truncation_rank(sv, opts))
+            U[leaf] = basis[:, :k]
+        family = cls(U=U, members=[], dtree=dtree)
+        for item in tensors:
+            family.members.append(family._to_coefficients(item))
+        return family
+
+    def _to_coefficients(self, x):
+        """
+        Hinweis: Dies ist eine interne Funktion.
+        Berechnet die Koeffizientenform der Projektion von 'x' auf die gemeinsamen Blattbasen.
+        """
+        from . import HTTensor
+        return HTTensor._new(U={leaf: self.U[leaf].T @ x.U[leaf] for leaf in self.U},
+                             B=dict(x.B),
+                             dtree=dimtree._new({node: list(children) for node, children in x.dtree.nodes.items()}))
+
+    def _expand(self, c):
+        """
+        Hinweis: Dies ist eine interne Funktion.
+        Berechnet aus der Koeffizientenform 'c' den hierarchischen Tuckertensor im vollen Raum.
+        """
+        from . import HTTensor
+        return HTTensor._new(U={leaf: self.U[leaf] @ c.U[leaf] for leaf in self.U},
+                             B=dict(c.B),
+                             dtree=dimtree._new({node: list(children) for node, children in c.dtree.nodes.items()}),
+                             is_orthog=c.is_orthog)
+
+    def get(self, i: int):
+        """
+        Gibt das i-te Mitglied der Familie als hierarchischen Tuckertensor im vollen Raum zurueck.
+        ______________________________________________________________________
+        Parameter:
+        - i int: Der Index des Mitglieds.
+        ______________________________________________________________________
+        Output:
+        (HTucker.HTTensor,): Das i-te Mitglied.
+        """
+        if not isinstance(i, int):
+            raise TypeError("Argument 'i': type(i)={} | i ist kein int.".format(type(i)))
+        if i not in range(-len(self), len(self)):
+            raise ValueError("Argument 'i': i={} ist kein gueltiger Index fuer eine Familie der Groesse"
+                             " {}.".format(i, len(self)))
+        return self._expand(self.members[i])
+
+    def project(self, x):
+        """
+        Projiziert den hierarchischen Tuckertensor 'x' auf die gemeinsamen Blattbasen der Familie.
+        ______________________________________________________________________
+        Parameter:
+        - x HTucker.HTTensor: Der zu projizierende hierarchische Tuckertensor.
+        ______________________________________________________________________
+        Output:
+        (HTucker.HTTensor,): Die Projektion im vollen Raum.
+        """
+        self._check_tensor(x)
+        return self._expand(self._to_coefficients(x))
+
+    def append(self, x):
+        """
+        Fuegt die Projektion des hierarchischen Tuckertensors 'x' auf die gemeinsamen Blattbasen als neues Mitglied
+        zur Familie hinzu. Liegt 'x' nicht im Spaltenraum der Basen, so geht der dazu orthogonale Anteil verloren.
+        ______________________________________________________________________
+        Parameter:
+        - x HTucker.HTTensor: Der hinzuzufuegende hierarchische Tuckertensor.
+        ______________________________________________________________________
+        Output:
+        (int,): Der Index des neuen Mitglieds.
+        """
+        self._check_tensor(x)
+        self.members.append(self._to_coefficients(x))
+        return len(self) - 1
+
+    def _check_tensor(self, x):
+        """
+        Hinweis: Dies ist eine interne Funktion.
+        Prueft, ob der hierarchische Tuckertensor 'x' im vollen Raum zur Familie passt.
+        """
+        from . import HTTensor
+        if not isinstance(x, HTTensor):
+            raise TypeError("Argument 'x': type(x)={} | x ist kein HTucker Tensor.".format(type(x)))
+        if not self.dtree.is_equal(x.dtree):
+            raise ValueError("Argument 'x': Der Dimensionsbaum stimmt nicht mit dem der Familie ueberein.")
+        if any(x.U[leaf].shape[0] != mat.shape[0] for leaf, mat in self.U.items()):
+            raise ValueError("Argument 'x': x.shape={} | Die shape stimmt nicht mit der der Familie"
+                             " ueberein.".format(x.get_shape()))
+
+    def inner(self, i: int, j: int):
+        """
+        Berechnet das Skalarprodukt der Mitglieder i und j. Da die gemeinsamen Basen orthonormal sind, wird dieses
+        allein auf den Koeffizientenformen berechnet.
+        ______________________________________________________________________
+        Parameter:
+        - i int: Der Index des ersten Mitglieds.
+        - j int: Der Index des zweiten Mitglieds.
+        ______________________________________________________________________
+        Output:
+        (torch.Tensor,): Das Skalarprodukt als 0D torch.Tensor.
+        """
+        return _inner(self.members[i], self.members[j])
+
+    def norm(self, i: int):
+        """
+        Berechnet die Frobeniusnorm des Mitglieds i.
+        ______________________________________________________________________
+        Parameter:
+        - i int: Der Index des Mitglieds.
+        ______________________________________________________________________
+        Output:
+        (torch.Tensor,): Die Norm als 0D torch.Tensor.
+        """
+        return torch.sqrt(torch.clamp(self.inner(i, i), min=0))
+
+    def gram(self):
+        """
+        Berechnet die Gram'sche Matrix aller Mitglieder der Familie, also die Matrix der paarweisen Skalarprodukte.
+        ______________________________________________________________________
+        Output:
+        (2D torch.Tensor,): Die Gram'sche Matrix der shape (len(self), len(self)).
+        """
+        ref = next(iter(self.U.values()))
+        G = torch.zeros(len(self), len(self), dtype=ref.dtype, device=ref.device)
+        for i in range(len(self)):
+            for j in range(i, len(self)):
+                G[i, j] = G[j, i] = self.inner(i, j)
+        return G
+
+    def linear_combination(self, coeffs: list, opts: dict = None):
+        """
+        Berechnet die Linearkombination sum_i coeffs[i] * self[i]. Ist 'opts' gegeben, so wird die Summe en passant
+        entsprechend der Constraints in 'opts' gekuerzt (siehe HTTensor.truncate_sum). Beides geschieht auf den
+        Koeffizientenformen, die Blattbasen werden erst abschliessend angewandt.
+        ______________________________________________________________________
+        Parameter:
+        - coeffs [float,...]: Die Koeffizienten, einer pro Mitglied.
+        - opts dict | None: Das Optionen-dict (siehe HTTensor.truncate_sum).
+        ______________________________________________________________________
+        Output:
+        (HTucker.HTTensor,): Die Linearkombination im vollen Raum. Ist opts["report"] True, so wird das Tupel
+                             (Linearkombination, Kuerzungsbericht) zurueckgegeben.
+        ______________________________________________________________________
+        Beispiel:
+        family = HTTensorFamily.from_tensors([HTTensor.randn((30,40,50)) for _ in range(10)])
+        mean = family.linear_combination([0.1] * 10, {"err_tol_rel": 1e-6})
+        """
+        from . import HTTensor
+        if not isinstance(coeffs, list):
+            raise TypeError("Argument 'coeffs': type(coeffs)={} | coeffs ist keine list.".format(type(coeffs)))
+        if len(coeffs) != len(self):
+            raise ValueError("Argument 'coeffs': len(coeffs)={} | Die Familie besitzt {}"
+                             " Mitglieder.".format(len(coeffs), len(self)))
+        summands = [c.scalar_mul(float(coeff)) for c, coeff in zip(self.members, coeffs)]
+        if opts is None:
+            return self._expand(reduce(lambda a, b: a.plus(b), summands))
+        if len(summands) == 1:
+            report = summands[0].truncate_htt(opts)
+            return self._expand(summands[0]) if report is None else (self._expand(summands[0]), report)
+        result = HTTensor.truncate_sum(summands, opts)
+        if isinstance(result, tuple):
+            # Kuerzungsbericht angefordert. Da die Basen orthonormal sind, gilt dieser auch im vollen Raum
+            return self._expand(result[0]), result[1]
+        return self._expand(result)
+
+
+def _inner(x, y):
+    """
+    Hinweis: Dies ist eine interne Funktion.
+    Berechnet das Skalarprodukt der hierarchischen Tuckertensoren 'x' und 'y' mit uebereinstimmendem Dimensionsbaum
+    bottom-up ueber die Matrizen M[t] = U_x[t].T @ U_y[t] der Skalarprodukte der Basen.
+    """
+    M = {}
+    for level in range(x.dtree.get_depth(), -1, -1):
+        for node in x.dtree.get_nodes_of_lvl(level):
+            if x.dtree.is_leaf(node):
+                M[node] = x.U[node].T @ y.U[node]
+                continue
+            l, r = x.dtree.get_children(node)
+            M[node] = torch.einsum("ac,bd,abk,cdl->kl", M.pop(l), M.pop(r), x.B[node], y.B[node])
+    return M[x.dtree.get_root()][0, 0]
@@ -0,0 +1,18 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+from HTucker import HTTensor
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("dims", [[[1, 2, 3], [0, 3, 1]], [[1, 3, 5], [0, 1, 4]]])
+def test_tensordot_general_path(seed, dims):
+    # Regressionstest: Die Umstrukturierung der Dimensionsbaeume darf keine veralteten Wurzelknoten in _dirty
+    # zuruecklassen (KeyError in _lift)
+    torch.manual_seed(seed)
+    x = HTTensor.randn((2, 3, 4, 5, 2, 3), dtype=torch.float64)
+    y = HTTensor.randn((3, 5, 2, 4, 3), dtype=torch.float64)
+    expected = torch.tensordot(x.full(), y.full(), dims)
+    z = x.tensordot(y, dims)
+    result = z.full() if isinstance(z, HTTensor) else z
+    assert torch.allclose(result, expected, rtol=1e-8, atol=1e-8 * float(torch.linalg.norm(expected)))